@@ -0,0 +1,121 @@
+"""Compare brute-force, spatial-hash and batched-kernel rock/shot collision cost.
+
+The playfield grows with the entity count so density stays at that of a busy
+1280x720 screen; with the broad phase the per-rock cost should stay flat.
+The batched column includes gathering sprite state into arrays and needs
+numpy.
+
+Run from the repository root:
+
+    python benchmarks/bench_collision.py
+"""
+import math
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from classes.asteroid import Asteroid
+from classes.shot import Shot
+from util.constants import (
+    ASTEROID_KINDS,
+    ASTEROID_MIN_RADIUS,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SHOT_RADIUS,
+)
+from util.collision import circle_pairs
+from util.entity_store import numpy_available
+from util.spatial_hash import SpatialHash
+
+if numpy_available():
+    import numpy as np
+
+ENTITY_COUNTS = [(50, 10), (250, 50), (1000, 200), (2500, 500), (5000, 1000)]
+BASE_ASTEROID_COUNT = ENTITY_COUNTS[0][0]
+BRUTE_FORCE_LIMIT = 1000
+FRAMES = 20
+
+
+def populate(asteroid_count, shot_count, rng):
+    scale = math.sqrt(asteroid_count / BASE_ASTEROID_COUNT)
+    width = SCREEN_WIDTH * scale
+    height = SCREEN_HEIGHT * scale
+    asteroids = pygame.sprite.Group()
+    shots = pygame.sprite.Group()
+    Asteroid.containers = (asteroids,)
+    Shot.containers = (shots,)
+    for _ in range(asteroid_count):
+        kind = rng.randint(1, ASTEROID_KINDS)
+        Asteroid(
+            rng.uniform(0, width),
+            rng.uniform(0, height),
+            ASTEROID_MIN_RADIUS * kind,
+        )
+    for _ in range(shot_count):
+        Shot(rng.uniform(0, width), rng.uniform(0, height), SHOT_RADIUS)
+    return asteroids, shots
+
+
+def brute_force(asteroids, shots):
+    hits = 0
+    for rock in asteroids:
+        for shot in shots:
+            if rock.collides_with(shot):
+                hits += 1
+    return hits
+
+
+def spatial_hash(asteroids, shots, shot_hash):
+    hits = 0
+    shot_hash.rebuild(shots)
+    for rock in asteroids:
+        for shot in shot_hash.query(rock.position, rock.radius):
+            if rock.collides_with(shot):
+                hits += 1
+    return hits
+
+
+def batched(asteroids, shots):
+    rocks = asteroids.sprites()
+    shot_list = shots.sprites()
+    rock_state = np.array([(*rock.position, rock.radius) for rock in rocks])
+    shot_state = np.array([(*shot.position, shot.radius) for shot in shot_list])
+    rows, _ = circle_pairs(rock_state[:, 0:2], rock_state[:, 2], shot_state[:, 0:2], shot_state[:, 2])
+    return len(rows)
+
+
+def time_per_frame(func, *args):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        func(*args)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    rng = random.Random(1234)
+    shot_hash = SpatialHash()
+    print(f"{'asteroids':>10} {'shots':>6} {'brute ms':>10} {'hash ms':>9} {'hash us/rock':>13} {'batched ms':>11}")
+    for asteroid_count, shot_count in ENTITY_COUNTS:
+        asteroids, shots = populate(asteroid_count, shot_count, rng)
+        if asteroid_count <= BRUTE_FORCE_LIMIT:
+            assert brute_force(asteroids, shots) == spatial_hash(asteroids, shots, shot_hash)
+            brute_ms = f"{time_per_frame(brute_force, asteroids, shots):10.3f}"
+        else:
+            brute_ms = f"{'-':>10}"
+        hash_ms = time_per_frame(spatial_hash, asteroids, shots, shot_hash)
+        per_rock_us = hash_ms * 1000 / asteroid_count
+        if numpy_available():
+            assert batched(asteroids, shots) == spatial_hash(asteroids, shots, shot_hash)
+            batched_ms = f"{time_per_frame(batched, asteroids, shots):11.3f}"
+        else:
+            batched_ms = f"{'-':>11}"
+        print(f"{asteroid_count:>10} {shot_count:>6} {brute_ms} {hash_ms:9.3f} {per_rock_us:13.2f} {batched_ms}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compare per-sprite movement with the array-backed EntityStore.
+
+Run from the repository root (requires numpy):
+
+    python benchmarks/bench_entity_store.py
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from classes.asteroid import Asteroid
+from util.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+from util.entity_store import EntityStore, KIND_ASTEROID, KIND_SHOT, numpy_available
+
+ENTITY_COUNTS = [1000, 10000, 50000]
+SHOT_COUNT = 50
+FRAMES = 20
+DT = 1 / 60
+
+
+def time_per_frame(func):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        func()
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def populate_sprites(count, rng):
+    group = pygame.sprite.Group()
+    Asteroid.containers = (group,)
+    for _ in range(count):
+        rock = Asteroid(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), 20)
+        rock.velocity = pygame.Vector2(rng.uniform(-100, 100), rng.uniform(-100, 100))
+    return group
+
+
+def populate_store(count, rng):
+    store = EntityStore()
+    for kind, n in ((KIND_ASTEROID, count), (KIND_SHOT, SHOT_COUNT)):
+        for _ in range(n):
+            slot = store.allocate(kind)
+            store.position[slot] = (rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+            store.velocity[slot] = (rng.uniform(-100, 100), rng.uniform(-100, 100))
+            store.radius[slot] = 20 if kind == KIND_ASTEROID else 5
+    return store
+
+
+def main():
+    if not numpy_available():
+        print("numpy is not installed; nothing to benchmark")
+        return
+    rng = random.Random(1234)
+    print(f"{'entities':>9} {'sprites ms':>11} {'store ms':>9} {'collide ms':>11}")
+    for count in ENTITY_COUNTS:
+        group = populate_sprites(count, rng)
+
+        def update_sprites():
+            for rock in group:
+                rock.update(DT)
+
+        store = populate_store(count, rng)
+        sprite_ms = time_per_frame(update_sprites)
+        store_ms = time_per_frame(lambda: store.integrate(DT))
+        collide_ms = time_per_frame(lambda: store.overlaps(KIND_ASTEROID, KIND_SHOT, dt=DT))
+        print(f"{count:>9} {sprite_ms:11.3f} {store_ms:9.3f} {collide_ms:11.3f}")
+
+
+if __name__ == "__main__":
+    main()
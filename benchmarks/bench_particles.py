@@ -0,0 +1,101 @@
+"""Compare the array-backed ParticleSystem with one sprite per particle.
+
+Each frame moves, ages and draws every particle onto a 1280x720 surface.
+The sprite column stops at SPRITE_LIMIT particles. Requires numpy.
+
+Run from the repository root:
+
+    python benchmarks/bench_particles.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from util.constants import PARTICLE_SIZE, SCREEN_HEIGHT, SCREEN_WIDTH, SIMULATION_DT
+from util.particles import ParticleSystem
+
+PARTICLE_COUNTS = [1000, 10000, 20000, 50000]
+SPRITE_LIMIT = 20000
+FRAMES = 30
+
+
+class ParticleSprite(pygame.sprite.Sprite):
+    def __init__(self, x, y, velocity, lifetime, *groups):
+        super().__init__(*groups)
+        self.position = pygame.Vector2(x, y)
+        self.velocity = velocity
+        self.age = 0.0
+        self.lifetime = lifetime
+
+    def update(self, dt):
+        self.position += self.velocity * dt
+        self.age += dt
+
+    def draw(self, screen):
+        fade = 1.0 - self.age / self.lifetime
+        shade = int(255 * max(fade, 0.0))
+        rect = (int(self.position.x), int(self.position.y), PARTICLE_SIZE, PARTICLE_SIZE)
+        pygame.draw.rect(screen, (shade, shade, shade), rect)
+
+
+def fill_system(count):
+    particles = ParticleSystem(capacity=count, seed=1)
+    # bursts spread over the screen, long-lived so the count holds during timing
+    bursts = 100
+    for index in range(bursts):
+        x = (index % 10 + 0.5) * SCREEN_WIDTH / 10
+        y = (index // 10 + 0.5) * SCREEN_HEIGHT / 10
+        particles.emit(x, y, count // bursts, speed=60, lifetime=1000.0)
+    return particles
+
+
+def fill_sprites(count):
+    group = pygame.sprite.Group()
+    source = fill_system(count)
+    for index in range(count):
+        x, y = source.position[index].tolist()
+        velocity = pygame.Vector2(source.velocity[index].tolist())
+        ParticleSprite(x, y, velocity, float(source.lifetime[index]), group)
+    return group
+
+
+def time_system(screen, particles):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        screen.fill("black")
+        particles.update(SIMULATION_DT)
+        particles.draw(screen)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def time_sprites(screen, group):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        screen.fill("black")
+        group.update(SIMULATION_DT)
+        for sprite in group:
+            sprite.draw(screen)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"{'particles':>10} {'sprites ms':>11} {'arrays ms':>10} {'speed-up':>9}")
+    for count in PARTICLE_COUNTS:
+        particles = fill_system(count)
+        assert len(particles) == count
+        system_ms = time_system(screen, particles)
+        if count <= SPRITE_LIMIT:
+            sprite_ms = time_sprites(screen, fill_sprites(count))
+            print(f"{count:>10} {sprite_ms:11.3f} {system_ms:10.3f} {sprite_ms / system_ms:8.1f}x")
+        else:
+            print(f"{count:>10} {'-':>11} {system_ms:10.3f} {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Measure what exact polygon hit tests add on top of the bounding-circle check.
+
+Rocks are tested against shots and a ship with the circle test alone, then
+with the circle test followed by the polygon test for pairs that pass it. The
+polygon test only runs on bounding-circle hits, so its cost scales with the
+number of near misses rather than with the number of pairs.
+
+Run from the repository root:
+
+    python benchmarks/bench_polygon.py
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from classes.asteroid import Asteroid
+from classes.player import Player
+from classes.shot import Shot
+from util.constants import (
+    ASTEROID_KINDS,
+    ASTEROID_MIN_RADIUS,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SHOT_RADIUS,
+    SIMULATION_DT,
+)
+
+ENTITY_COUNTS = [(20, 5), (100, 50), (500, 200)]
+FRAMES = 20
+
+
+def populate(asteroid_count, shot_count, rng):
+    asteroids = pygame.sprite.Group()
+    shots = pygame.sprite.Group()
+    Asteroid.containers = (asteroids,)
+    Shot.containers = (shots,)
+    for _ in range(asteroid_count):
+        kind = rng.randint(1, ASTEROID_KINDS)
+        Asteroid(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), ASTEROID_MIN_RADIUS * kind)
+    for _ in range(shot_count):
+        shot = Shot(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), SHOT_RADIUS)
+        shot.velocity = pygame.Vector2(0, 500).rotate(rng.uniform(0, 360))
+        shot.age = 1.0
+    ships = []
+    for _ in range(shot_count):
+        ship = Player(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT))
+        ship.rotation = rng.uniform(0, 360)
+        ships.append(ship)
+    return asteroids.sprites(), shots.sprites(), ships
+
+
+def bounding_hits(rocks, shots, ships):
+    pairs = []
+    for rock in rocks:
+        for other in shots:
+            if rock.collides_with(other):
+                pairs.append((rock, other))
+        for ship in ships:
+            offset = ship.position - rock.position
+            reach = rock.radius + ship.bounding_radius
+            if offset.length_squared() < reach * reach:
+                pairs.append((rock, ship))
+    return pairs
+
+
+def exact_hits(rocks, shots, ships):
+    hits = 0
+    for rock, other in bounding_hits(rocks, shots, ships):
+        if isinstance(other, Shot):
+            hits += rock.exact_swept_hit(other, SIMULATION_DT)
+        else:
+            offset = other.position - rock.position
+            hits += rock.exact_hit(other, offset.x, offset.y)
+    return hits
+
+
+def time_per_frame(func, *args):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        func(*args)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    rng = random.Random(1234)
+    print(f"{'asteroids':>10} {'shots':>6} {'circle ms':>10} {'exact ms':>9} {'candidates':>11} {'confirmed':>10}")
+    for asteroid_count, shot_count in ENTITY_COUNTS:
+        rocks, shots, ships = populate(asteroid_count, shot_count, rng)
+        circle_ms = time_per_frame(bounding_hits, rocks, shots, ships)
+        exact_ms = time_per_frame(exact_hits, rocks, shots, ships)
+        candidates = len(bounding_hits(rocks, shots, ships))
+        confirmed = exact_hits(rocks, shots, ships)
+        print(
+            f"{asteroid_count:>10} {shot_count:>6} {circle_ms:10.3f} {exact_ms:9.3f}"
+            f" {candidates:>11} {confirmed:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
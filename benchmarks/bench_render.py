@@ -0,0 +1,104 @@
+"""Compare per-entity pygame.draw calls with the batched SpriteAtlas path,
+and full-screen fill and flip with dirty-rect updates.
+
+With the dummy video driver a flip costs almost nothing, so the dirty-rect
+numbers only show the saved fill; on a real display the saved upload is
+larger.
+
+Run from the repository root:
+
+    python benchmarks/bench_render.py
+"""
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from classes.asteroid import Asteroid
+from classes.player import Player
+from classes.shot import Shot
+from classes.simulation import Simulation
+from renderer import Renderer
+from sprite_atlas import SpriteAtlas
+from util.constants import (
+    ASTEROID_KINDS,
+    ASTEROID_MIN_RADIUS,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SHOT_RADIUS,
+    SIMULATION_DT,
+)
+
+ENTITY_COUNTS = [(20, 5), (100, 20), (500, 100), (2000, 400)]
+FRAMES = 50
+
+
+def populate(asteroid_count, shot_count, rng):
+    drawable = pygame.sprite.Group()
+    Asteroid.containers = (drawable,)
+    Shot.containers = (drawable,)
+    Player.containers = (drawable,)
+    for _ in range(asteroid_count):
+        kind = rng.randint(1, ASTEROID_KINDS)
+        Asteroid(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), ASTEROID_MIN_RADIUS * kind)
+    for _ in range(shot_count):
+        Shot(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), SHOT_RADIUS)
+    Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2).rotation = 37.0
+    return drawable
+
+
+def draw_each(screen, drawable, atlas):
+    for entity in drawable:
+        entity.draw(screen)
+
+
+def draw_batched(screen, drawable, atlas):
+    atlas.draw(screen, drawable)
+
+
+def time_per_frame(func, screen, drawable, atlas):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        screen.fill("black")
+        func(screen, drawable, atlas)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def time_renderer(screen, dirty_rects):
+    random.seed(1)
+    simulation = Simulation(use_entity_store=False)
+    renderer = Renderer(screen, simulation, dirty_rects=dirty_rects)
+    elapsed = 0.0
+    for _ in range(FRAMES * 4):
+        simulation.step(SIMULATION_DT)
+        start = time.perf_counter()
+        renderer.render()
+        elapsed += time.perf_counter() - start
+    return elapsed / (FRAMES * 4) * 1000
+
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    atlas = SpriteAtlas()
+    rng = random.Random(1234)
+    print(f"{'asteroids':>10} {'shots':>6} {'draw ms':>9} {'blits ms':>9} {'speed-up':>9}")
+    for asteroid_count, shot_count in ENTITY_COUNTS:
+        drawable = populate(asteroid_count, shot_count, rng)
+        draw_ms = time_per_frame(draw_each, screen, drawable, atlas)
+        batched_ms = time_per_frame(draw_batched, screen, drawable, atlas)
+        print(f"{asteroid_count:>10} {shot_count:>6} {draw_ms:9.3f} {batched_ms:9.3f} {draw_ms / batched_ms:8.1f}x")
+    pygame.font.init()
+    full_ms = time_renderer(screen, dirty_rects=False)
+    dirty_ms = time_renderer(screen, dirty_rects=True)
+    print()
+    print(f"{'full flip ms':>13} {'dirty ms':>9} {'speed-up':>9}")
+    print(f"{full_ms:13.3f} {dirty_ms:9.3f} {full_ms / dirty_ms:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
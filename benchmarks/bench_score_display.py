@@ -0,0 +1,83 @@
+"""Compare the cached ScoreDisplay against rebuilding the font every frame.
+
+Run from the repository root:
+
+    python benchmarks/bench_score_display.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from score_display import ScoreDisplay
+from util.constants import (
+    COMBO_COLOR,
+    COMBO_POSITION,
+    HIGH_SCORE_COLOR,
+    HIGH_SCORE_POSITION,
+    LIVES_COLOR,
+    LIVES_POSITION,
+    SCORE_COLOR,
+    SCORE_FONT_SIZE,
+    SCORE_POSITION,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+)
+
+FRAMES = 600
+SCORE_CHANGE_EVERY = 30  # frames between score changes, roughly a busy game
+
+
+def legacy_render(screen, content):
+    # per-frame font construction and rasterization, as before the cache
+    font = pygame.font.Font(None, SCORE_FONT_SIZE)
+    screen.blit(font.render(f"SCORE: {content['SCORE']:,}", True, SCORE_COLOR), SCORE_POSITION)
+    if content['COMBO'] >= 2:
+        screen.blit(font.render(f"COMBO: {content['COMBO']}", True, COMBO_COLOR), COMBO_POSITION)
+    screen.blit(font.render(f"HIGH SCORE: {content['HIGH_SCORE']:,}", True, HIGH_SCORE_COLOR), HIGH_SCORE_POSITION)
+    screen.blit(font.render(f"LIVES: {content['LIVES']}", True, LIVES_COLOR), LIVES_POSITION)
+
+
+def run_legacy(screen):
+    content = {'SCORE': 0, 'COMBO': 3, 'HIGH_SCORE': 123456, 'LIVES': 3}
+    for frame in range(FRAMES):
+        if frame % SCORE_CHANGE_EVERY == 0:
+            content['SCORE'] += 150
+        legacy_render(screen, content)
+
+
+def run_cached(screen):
+    display = ScoreDisplay()
+    display.update_combo(3)
+    display.update_high_score(123456)
+    display.update_lives(3)
+    score = 0
+    for frame in range(FRAMES):
+        if frame % SCORE_CHANGE_EVERY == 0:
+            score += 150
+        display.update_score(score)
+        display.render_surface(screen)
+
+
+def time_per_frame(func, screen):
+    start = time.perf_counter()
+    func(screen)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+
+def main():
+    pygame.font.init()
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    legacy_ms = time_per_frame(run_legacy, screen)
+    cached_ms = time_per_frame(run_cached, screen)
+    print(f"{'implementation':>15} {'ms/frame':>9}")
+    print(f"{'per-frame font':>15} {legacy_ms:9.4f}")
+    print(f"{'cached':>15} {cached_ms:9.4f}")
+    print(f"speed-up: {legacy_ms / cached_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""Headless benchmark suite with stored baselines.
+
+Every case reports the best-of-`REPEATS` cost of one operation in
+microseconds. Results are compared against `benchmarks/baselines.json`; a case
+that is slower than its baseline by more than the threshold fails the run.
+Whole-game cases (`simulation/*`) mix many systems and swing more between runs,
+so they are allowed at least `STEP_THRESHOLD` instead.
+
+Each run also times a fixed pure-Python calibration loop, and baselines are
+stored with the calibration of the run that recorded them. Comparisons scale
+the baselines by how much faster or slower the calibration ran this time, so
+a machine that is busy or throttled as a whole does not fail every case.
+
+Baselines are machine specific, so they are not checked in: record them once
+per machine with `--update` (CI keeps its own file and passes it with
+`--baselines`). A comparison run without a baseline file exits with status 2
+rather than quietly recording one and passing.
+
+Run from the repository root:
+
+    python benchmarks/suite.py --update         # record new baselines
+    python benchmarks/suite.py                  # compare against baselines
+    python benchmarks/suite.py --only collision --threshold 0.5
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from bench_collision import populate, spatial_hash
+from bench_particles import fill_system
+from bench_render import populate as populate_drawable
+from classes.asteroid import Asteroid
+from classes.score_manager import ScoreManager
+from classes.simulation import Simulation, init_headless
+from score_display import ScoreDisplay
+from sprite_atlas import SpriteAtlas
+from util.constants import (
+    ASTEROID_MAX_RADIUS,
+    ASTEROID_MIN_RADIUS,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SIMULATION_DT,
+)
+from util.entity_store import numpy_available
+from util.input_provider import AimingBot
+from util.logger import configure_logging, flush_logs, log_event
+from util.spatial_hash import SpatialHash
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_THRESHOLD = 0.25  # fail when more than 25% slower than the baseline
+STEP_THRESHOLD = 0.5  # the least slack a whole-game case gets
+REPEATS = 7
+RETRIES = 2  # extra measurements of a case before it counts as regressed
+
+CASES = {}
+CASE_THRESHOLDS = {}  # name -> the least threshold the case is compared with
+
+
+def case(name, threshold=None):
+    def register(func):
+        CASES[name] = func
+        if threshold is not None:
+            CASE_THRESHOLDS[name] = threshold
+        return func
+    return register
+
+
+def best_time_us(func, operations):
+    """Run `func` `REPEATS` times and return the fastest cost per operation.
+
+    One untimed call first warms caches, pools and lazily built surfaces.
+    """
+    func()
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best / operations * 1e6
+
+
+def calibrate(calls=20000):
+    """Cost of a fixed pure-Python loop, the unit the baselines are scaled by."""
+    def run():
+        total = 0
+        table = {}
+        for i in range(calls):
+            total += i * i
+            table[i & 255] = total
+        return table
+    return round(best_time_us(run, calls), 5)
+
+
+def update_case(asteroid_count, frames=50):
+    def run():
+        rng = random.Random(1)
+        asteroids = pygame.sprite.Group()
+        Asteroid.containers = (asteroids,)
+        for _ in range(asteroid_count):
+            rock = Asteroid(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), ASTEROID_MIN_RADIUS)
+            rock.velocity = pygame.Vector2(rng.uniform(-100, 100), rng.uniform(-100, 100))
+
+        def frames_of_updates():
+            for _ in range(frames):
+                asteroids.update(SIMULATION_DT)
+        return best_time_us(frames_of_updates, frames)
+    return run
+
+
+def collision_case(asteroid_count, shot_count, frames=20):
+    def run():
+        asteroids, shots = populate(asteroid_count, shot_count, random.Random(1234))
+        shot_hash = SpatialHash()
+
+        def frames_of_collisions():
+            for _ in range(frames):
+                spatial_hash(asteroids, shots, shot_hash)
+        return best_time_us(frames_of_collisions, frames)
+    return run
+
+
+for _count in (100, 1000):
+    case(f"update/asteroids={_count}")(update_case(_count))
+
+for _asteroids, _shots in ((50, 10), (250, 50), (1000, 200)):
+    case(f"collision/asteroids={_asteroids},shots={_shots}")(collision_case(_asteroids, _shots))
+
+
+@case("simulation/step", threshold=STEP_THRESHOLD)
+def simulation_step(frames=600):
+    def run():
+        random.seed(1)
+        Simulation(use_entity_store=False).run(frames, SIMULATION_DT)
+    return best_time_us(run, frames)
+
+
+@case("simulation/aimer_step", threshold=STEP_THRESHOLD)
+def simulation_aimer_step(frames=600):
+    # a bot that keeps firing at the nearest rock drives splits and shot traffic
+    def run():
+        random.seed(1)
+        simulation = Simulation(use_entity_store=False, particles=False)
+        simulation.player.set_input(AimingBot(simulation))
+        simulation.run(frames, SIMULATION_DT)
+    return best_time_us(run, frames)
+
+
+@case("score_display/render_surface")
+def score_display_render(frames=600):
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    display = ScoreDisplay()
+    display.update_combo(3)
+    display.update_high_score(123456)
+    display.update_lives(3)
+
+    def run():
+        for frame in range(frames):
+            display.update_score(frame // 30 * 150)
+            display.render_surface(screen)
+    return best_time_us(run, frames)
+
+
+@case("render/sprite_atlas")
+def render_sprite_atlas(frames=50):
+    screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    drawable = populate_drawable(100, 20, random.Random(1234))
+    atlas = SpriteAtlas()
+
+    def run():
+        for _ in range(frames):
+            atlas.draw(screen, drawable)
+    return best_time_us(run, frames)
+
+
+if numpy_available():
+    @case("particles/update_draw")
+    def particles_update_draw(frames=50, count=10000):
+        screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        particles = fill_system(count)
+
+        def run():
+            for _ in range(frames):
+                particles.update(SIMULATION_DT)
+                particles.draw(screen)
+        return best_time_us(run, frames)
+
+
+@case("logger/log_event")
+def logger_log_event(calls=10000):
+    def run():
+        for _ in range(calls):
+            log_event("asteroid_shot", score=150, multiplier=2)
+        flush_logs()
+    return best_time_us(run, calls)
+
+
+@case("score_manager/add_score")
+def score_manager_add_score(calls=10000):
+    manager = ScoreManager()
+    radii = (ASTEROID_MIN_RADIUS, ASTEROID_MAX_RADIUS)
+
+    def run():
+        for i in range(calls):
+            manager.add_score(radii[i & 1])
+        manager.reset()
+    return best_time_us(run, calls)
+
+
+def run_cases(names):
+    results = {}
+    for name in names:
+        results[name] = round(CASES[name](), 3)
+        print(f"{name:<42} {results[name]:12.3f} us")
+    return results
+
+
+def compare(results, baselines, threshold, scale=1.0):
+    """Return `(name, baseline, current, ratio)` for every case over the threshold.
+
+    A case registered with its own threshold is held to the larger of the two.
+    `scale` is this run's calibration over the baselines' calibration; the
+    reported baseline is already multiplied by it.
+    """
+    regressions = []
+    for name, current in results.items():
+        baseline = baselines.get(name)
+        if baseline is None:
+            continue
+        baseline *= scale
+        ratio = current / baseline
+        if ratio > 1 + max(threshold, CASE_THRESHOLDS.get(name, threshold)):
+            regressions.append((name, baseline, current, ratio))
+    return regressions
+
+
+def load_baselines(path):
+    """Return `(results_us, calibration_us)`; `({}, None)` if there are none yet."""
+    if not os.path.exists(path):
+        return {}, None
+    with open(path) as f:
+        data = json.load(f)
+    return data["results_us"], data.get("calibration_us")
+
+
+def save_baselines(path, results, calibration):
+    merged, old_calibration = load_baselines(path)
+    if old_calibration:
+        # bring cases kept from the old file onto this run's calibration
+        scale = calibration / old_calibration
+        merged = {name: round(value * scale, 3) for name, value in merged.items()}
+    merged.update(results)
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "python": platform.python_version(),
+                "pygame": pygame.version.ver,
+                "machine": platform.machine(),
+                "calibration_us": calibration,
+                "results_us": dict(sorted(merged.items())),
+            },
+            f,
+            indent=2,
+        )
+        f.write("\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--baselines", default=BASELINE_FILE, help="baseline JSON file")
+    parser.add_argument("--update", action="store_true", help="record the results as the new baselines")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--only", help="run only cases whose name contains this text")
+    parser.add_argument("--output", help="also write this run's results as JSON")
+    return parser.parse_args(argv)
+
+
+def confirm_regressions(results, baselines, threshold, scale):
+    """Re-measure failing cases so a single noisy run does not fail the suite."""
+    for _ in range(RETRIES):
+        regressions = compare(results, baselines, threshold, scale)
+        if not regressions:
+            break
+        for name, *_ in regressions:
+            results[name] = min(results[name], round(CASES[name](), 3))
+    return compare(results, baselines, threshold, scale)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = [name for name in CASES if args.only is None or args.only in name]
+    baselines, baseline_calibration = load_baselines(args.baselines)
+    if not baselines and not args.update:
+        print(
+            f"no baselines in {args.baselines}; record them on this machine with --update",
+            file=sys.stderr,
+        )
+        return 2
+    update = args.update
+    init_headless()
+    pygame.font.init()
+    with tempfile.TemporaryDirectory() as log_dir:
+        # keep benchmark runs out of the game's own logs
+        configure_logging(
+            state_path=os.path.join(log_dir, "game_state.jsonl"),
+            event_path=os.path.join(log_dir, "game_events.jsonl"),
+        )
+        calibration = calibrate()
+        print(f"{'calibration':<42} {calibration:12.5f} us")
+        results = run_cases(names)
+        # baselines recorded before calibration existed are compared as they are
+        scale = calibration / baseline_calibration if baseline_calibration else 1.0
+        regressions = [] if update else confirm_regressions(results, baselines, args.threshold, scale)
+        flush_logs()
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if update:
+        save_baselines(args.baselines, results, calibration)
+        print(f"baselines written to {args.baselines}")
+        return 0
+    missing = [name for name in results if name not in baselines]
+    if missing:
+        print(f"no baseline for: {', '.join(missing)}")
+    for name, baseline, current, ratio in regressions:
+        print(f"REGRESSION {name}: {baseline:.3f} -> {current:.3f} us ({ratio:.2f}x)")
+    if regressions:
+        return 1
+    print(f"all cases within {args.threshold:.0%} of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
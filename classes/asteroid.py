@@ -1,31 +1,113 @@
 import random
 import pygame
 from classes.circleshape import CircleShape
-from util.constants import ASTEROID_MIN_RADIUS, LINE_WIDTH
-from util.logger import log_event
+from util.collision import relative_motion
+from util.constants import (
+	ASTEROID_LUMPY,
+	ASTEROID_MIN_RADIUS,
+	ASTEROID_OUTLINE_VARIANTS,
+	LINE_WIDTH,
+	PARTICLES_PER_SPLIT,
+)
+from util.polygon import (
+	capsule_overlaps_polygon,
+	circle_overlaps_polygon,
+	outline_variants,
+	polygons_overlap,
+	translate,
+)
 
 
 class Asteroid(CircleShape):
-	def __init__(self, x, y, radius):
-		super().__init__(x, y, radius)
+	# lumpy rocks draw and collide as polygons inside their bounding circle
+	lumpy = ASTEROID_LUMPY
+	# a ParticleSystem for split bursts, usually passed in by the pool
+	particles = None
 
-	# draw the asteroid using pygame.draw.circle
+	def __init__(self, x, y, radius, containers=None, particles=None):
+		if particles is not None:
+			self.particles = particles
+		super().__init__(x, y, radius, containers)
+		self._pick_outline()
+
+	def reset(self, x, y, radius):
+		super().reset(x, y, radius)
+		self._pick_outline()
+
+	def _pick_outline(self):
+		# chosen once per spawn or split; the outline stays relative to the
+		# centre, so moving the rock never touches its vertices
+		if self.lumpy:
+			self.variant = random.randrange(ASTEROID_OUTLINE_VARIANTS)
+			self.outline = outline_variants(self.radius)[self.variant]
+		else:
+			self.variant = None
+			self.outline = None
+
+	# draw the asteroid using pygame.draw.circle, or its outline if lumpy
 	def draw(self, screen):
-		pygame.draw.circle(screen, "white", self.position, self.radius, LINE_WIDTH)
+		if self.outline is None:
+			pygame.draw.circle(screen, self.color, self.position, self.radius, LINE_WIDTH)
+			return
+		position = self.position
+		vertices = translate(self.outline, position.x, position.y)
+		pygame.draw.polygon(screen, self.color, vertices, LINE_WIDTH)
+
+	def blit_sprite(self, atlas):
+		if self.outline is None:
+			return super().blit_sprite(atlas)
+		surface = atlas.outline(self.radius, self.variant, self.color)
+		half = surface.get_width() / 2
+		position = self.position
+		return surface, (position.x - half, position.y - half)
+
+	def exact_hit(self, other, dx, dy):
+		outline = self.outline
+		if outline is None:
+			return super().exact_hit(other, dx, dy)
+		hitbox = other.hitbox_outline()
+		if hitbox is None:
+			return circle_overlaps_polygon(dx, dy, other.radius, outline)
+		return polygons_overlap(outline, translate(hitbox, dx, dy))
+
+	def exact_swept_hit(self, shot, dt, torus=None):
+		outline = self.outline
+		if outline is None:
+			return True
+		end_x, end_y, motion_x, motion_y = relative_motion(self, shot, dt, torus)
+		return capsule_overlaps_polygon(
+			end_x - motion_x, end_y - motion_y, end_x, end_y, shot.radius, outline
+		)
 
 	def update(self, dt):
 		self.position += self.velocity * dt
 
 	def split(self):
+		"""Break into two smaller rocks, or vanish if already the smallest; returns whether it broke."""
 		self.kill()
+		if self.particles is not None:
+			position = self.position
+			self.particles.emit(
+				position.x,
+				position.y,
+				PARTICLES_PER_SPLIT * round(self.radius / ASTEROID_MIN_RADIUS),
+				self.velocity,
+				color=self.color,
+			)
 		if self.radius <= ASTEROID_MIN_RADIUS:
-			return
-		log_event('asteroid_split')
+			return False
 		split_angle = random.uniform(20, 50)
-		first_velocity = self.velocity.rotate(split_angle)
-		second_velocity = self.velocity.rotate(-split_angle)
 		new_radius = self.radius - ASTEROID_MIN_RADIUS
-		child1 = Asteroid(self.position.x, self.position.y, new_radius)
-		child2 = Asteroid(self.position.x, self.position.y, new_radius)
-		child1.velocity = first_velocity * 1.2
+		child1 = self.spawn_like(self.position.x, self.position.y, new_radius)
+		child2 = self.spawn_like(self.position.x, self.position.y, new_radius)
+		# build the new velocities inside the children's own vectors
+		first_velocity = child1.velocity
+		first_velocity.update(self.velocity)
+		first_velocity.rotate_ip(split_angle)
+		first_velocity *= 1.2
+		child1.velocity = first_velocity
+		second_velocity = child2.velocity
+		second_velocity.update(self.velocity)
+		second_velocity.rotate_ip(-split_angle)
 		child2.velocity = second_velocity
+		return True
@@ -1,10 +1,29 @@
 import pygame
 import random
 from classes.asteroid import Asteroid
-from util.constants import *
+from util.config import DEFAULT_CONFIG
+from util.constants import (
+    ASTEROID_MAX_RADIUS,
+    ASTEROID_MIN_RADIUS,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+)
+from util.spawn_profile import SpawnProfile
 
 
+# Spawns rocks at the screen edges on the schedule of a SpawnProfile, by
+# default the single wave described by the run's AsteroidConfig.
+# Each step adds dt / interval to an accumulator and every whole unit in it
+# is a spawn, so the rate holds at any dt and a change of interval never
+# releases a burst. While the live asteroid count is at the budget, due
+# spawns are dropped rather than saved up for later.
+#
+# On a wrapping screen there is no off-screen margin to start from, so rocks
+# spawn centred on the seam (x or y = 0) and the renderer's ghost copies show
+# them entering, instead of being teleported onto the field by the wrap.
 class AsteroidField(pygame.sprite.Sprite):
+    asteroid_type = Asteroid
+
     edges = [
         [
             pygame.Vector2(1, 0),
@@ -28,24 +47,75 @@ class AsteroidField(pygame.sprite.Sprite):
         ],
     ]
 
-    def __init__(self):
-        pygame.sprite.Sprite.__init__(self, self.containers)
-        self.spawn_timer = 0.0
+    seam_edges = [
+        [pygame.Vector2(1, 0), lambda y: pygame.Vector2(0, y * SCREEN_HEIGHT)],
+        [pygame.Vector2(-1, 0), lambda y: pygame.Vector2(0, y * SCREEN_HEIGHT)],
+        [pygame.Vector2(0, 1), lambda x: pygame.Vector2(x * SCREEN_WIDTH, 0)],
+        [pygame.Vector2(0, -1), lambda x: pygame.Vector2(x * SCREEN_WIDTH, 0)],
+    ]
+
+    def __init__(
+        self,
+        asteroids=None,
+        max_asteroids=None,
+        profile=None,
+        config=DEFAULT_CONFIG.asteroids,
+        asteroid_pool=None,
+        containers=None,
+        wrap=False,
+    ):
+        if containers is None:
+            containers = getattr(self, "containers", ())
+        pygame.sprite.Sprite.__init__(self, containers)
+        # the simulation's ShapePool of rocks; without one, `asteroid_type.create`
+        self.asteroid_pool = asteroid_pool
+        if wrap:
+            self.edges = self.seam_edges
+        if profile is None:
+            profile = SpawnProfile.from_config(config)
+        self.spawn_phase = 0.0
+        self.elapsed = 0.0
+        self.profile = profile
+        self._wave = 0
+        self.asteroids = asteroids
+        # on a wrapping screen nothing drifts away, so the cap can be tighter
+        budgets = [limit for limit in (profile.budget, max_asteroids) if limit is not None]
+        self.max_asteroids = min(budgets) if budgets else None
+        self.spawned = 0
+        self.throttled = 0
 
     def spawn(self, radius, position, velocity):
-        asteroid = Asteroid(position.x, position.y, radius)
+        pool = self.asteroid_pool
+        if pool is not None:
+            asteroid = pool.acquire(position.x, position.y, radius)
+        else:
+            asteroid = self.asteroid_type.create(position.x, position.y, radius)
         asteroid.velocity = velocity
 
     def update(self, dt):
-        self.spawn_timer += dt
-        if self.spawn_timer > ASTEROID_SPAWN_RATE_SECONDS:
-            self.spawn_timer = 0
+        self.elapsed += dt
+        waves = self.profile.waves
+        self._wave = self.profile.wave_index(self.elapsed, self._wave)
+        wave = waves[self._wave]
+        following = waves[self._wave + 1] if self._wave + 1 < len(waves) else None
+        interval, speed_min, speed_max = wave.blend(following, self.elapsed)
+        self.spawn_phase += dt / interval
+        while self.spawn_phase >= 1.0:
+            self.spawn_phase -= 1.0
+            if (
+                self.max_asteroids is not None
+                and self.asteroids is not None
+                and len(self.asteroids) >= self.max_asteroids
+            ):
+                self.throttled += 1
+                continue
 
             # spawn a new asteroid at a random edge
             edge = random.choice(self.edges)
-            speed = random.randint(40, 100)
+            speed = random.randint(speed_min, speed_max)
             velocity = edge[0] * speed
-            velocity = velocity.rotate(random.randint(-30, 30))
+            velocity = velocity.rotate(random.randint(-wave.spread, wave.spread))
             position = edge[1](random.uniform(0, 1))
-            kind = random.randint(1, ASTEROID_KINDS)
-            self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
\ No newline at end of file
+            kind = random.randint(*wave.kinds)
+            self.spawn(ASTEROID_MIN_RADIUS * kind, position, velocity)
+            self.spawned += 1
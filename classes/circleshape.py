@@ -1,25 +1,111 @@
 import pygame
+from util.polygon import circle_overlaps_polygon
 
 # Base class for game objects
 class CircleShape(pygame.sprite.Sprite):
-    def __init__(self, x, y, radius):
-        # we will be using this later
-        if hasattr(self, "containers"):
-            super().__init__(self.containers)
-        else:
-            super().__init__()
+    # seconds an entity may live before the culler removes it; None = forever
+    lifetime = None
+    # optional ShapePool recycling instances of exactly this class
+    pool = None
+    # the pool an instance was acquired from; only those go back on kill()
+    _pool = None
+    # outline colour, also the key of the pre-rendered sprite in a SpriteAtlas
+    color = "white"
+
+    def __init__(self, x, y, radius, containers=None):
+        # groups usually come from the ShapePool building this instance;
+        # standalone code can still install a class-level `containers`
+        if containers is None:
+            containers = getattr(self, "containers", ())
+        self.containers = containers
+        super().__init__(containers)
 
         self.position = pygame.Vector2(x, y)
         self.velocity = pygame.Vector2(0, 0)
         self.radius = radius
+        self.age = 0.0
+
+    @classmethod
+    def create(cls, x, y, radius):
+        pool = cls.pool
+        if pool is None or pool.shape_type is not cls:
+            return cls(x, y, radius)
+        return pool.acquire(x, y, radius)
+
+    def spawn_like(self, x, y, radius):
+        # a new shape of this kind from the pool this one came from, so it
+        # lands in the same groups and simulation
+        pool = self._pool
+        if pool is not None:
+            return pool.acquire(x, y, radius)
+        return type(self).create(x, y, radius)
+
+    def reset(self, x, y, radius):
+        # re-initialise a pooled instance in place, reusing its vectors
+        self.add(self.containers)
+        self.position.update(x, y)
+        self.velocity.update(0, 0)
+        self.radius = radius
+        self.age = 0.0
+
+    def kill(self):
+        was_alive = self.alive()
+        super().kill()
+        pool = self._pool
+        if was_alive and pool is not None:
+            pool.release(self)
+
+    def snapshot(self):
+        position = self.position
+        velocity = self.velocity
+        return {
+            "type": self.__class__.__name__,
+            "pos": [round(position.x, 2), round(position.y, 2)],
+            "vel": [round(velocity.x, 2), round(velocity.y, 2)],
+            "rad": self.radius,
+        }
 
     def draw(self, screen):
         # must override
         pass
 
+    def blit_sprite(self, atlas):
+        # (surface, destination) for a batched Surface.blits call, or None
+        # when there is nothing to draw this frame
+        radius = self.radius
+        position = self.position
+        return atlas.circle(radius, self.color), (position.x - radius, position.y - radius)
+
     def update(self, dt):
         # must override
         pass
 
+    @property
+    def bounding_radius(self):
+        # radius of a circle enclosing the hitbox, for broad-phase rejection
+        return self.radius
+
+    def hitbox_outline(self):
+        # polygon around the origin for exact tests; None when the circle is exact
+        return None
+
+    def exact_hit(self, other, dx, dy):
+        # called once the bounding circles overlap, with `other` centred
+        # at (dx, dy) from this shape
+        hitbox = other.hitbox_outline()
+        if hitbox is None:
+            return True
+        return circle_overlaps_polygon(-dx, -dy, self.radius, hitbox)
+
+    def exact_swept_hit(self, shot, dt, torus=None):
+        # called once the swept bounding circles have met
+        return True
+
     def collides_with(self, other):
-        return self.position.distance_to(other.position) < self.radius
\ No newline at end of file
+        # squared distance against the squared radius sum: symmetric, no sqrt
+        position = self.position
+        other_position = other.position
+        dx = other_position.x - position.x
+        dy = other_position.y - position.y
+        reach = self.radius + other.radius
+        return dx * dx + dy * dy < reach * reach
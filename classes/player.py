@@ -1,37 +1,93 @@
+import math
 import pygame
 from classes.circleshape import CircleShape
-from util.constants import LINE_WIDTH, PLAYER_RADIUS, PLAYER_RESPAWN_INVULN_SECONDS, PLAYER_SHOOT_COOLDOWN_SECONDS, PLAYER_SHOOT_SPEED, PLAYER_SPEED, PLAYER_TURN_SPEED, SHOT_RADIUS
+from util.config import DEFAULT_CONFIG
+from util.constants import LINE_WIDTH, PLAYER_RADIUS
+from util.input_provider import KeyboardInput
 from classes.shot import Shot
 
 
+# the rear corners of the ship sit this many radii from its centre
+SHIP_REACH = math.hypot(1, 1 / 1.5)
+
+
+def ship_triangle(position, rotation, radius):
+	forward = pygame.Vector2(0, 1).rotate(rotation)
+	right = pygame.Vector2(0, 1).rotate(rotation + 90) * radius / 1.5
+	a = position + forward * radius
+	b = position - forward * radius - right
+	c = position - forward * radius + right
+	return [a, b, c]
+
+
 class Player(CircleShape):
-	def __init__(self, x, y):
-		super().__init__(x, y, PLAYER_RADIUS)
+	shot_type = Shot
+	# the input provider (see util/input_provider.py); set_input replaces it per instance
+	read_keys = KeyboardInput()
+
+	def __init__(self, x, y, config=DEFAULT_CONFIG.player, shot_pool=None, containers=None):
+		super().__init__(x, y, PLAYER_RADIUS, containers)
+		# the simulation's ShapePool of shots; without one, `shot_type.create`
+		self.shot_pool = shot_pool
+		# copied out of the PlayerConfig once; update() runs every step
+		self.turn_speed = config.turn_speed
+		self.speed = config.speed
+		self.shoot_speed = config.shoot_speed
+		self.shoot_cooldown_seconds = config.shoot_cooldown_seconds
+		self.respawn_invuln_seconds = config.respawn_invuln_seconds
+		self.shot_radius = config.shot_radius
 		self.rotation = 0
 		self.shot_cooldown = 0
 		self.invulnerable_timer = 0
+		self._hitbox = None
+		self._hitbox_rotation = None
 
 	# in the Player class
 	def triangle(self):
-		forward = pygame.Vector2(0, 1).rotate(self.rotation)
-		right = pygame.Vector2(0, 1).rotate(self.rotation + 90) * self.radius / 1.5
-		a = self.position + forward * self.radius
-		b = self.position - forward * self.radius - right
-		c = self.position - forward * self.radius + right
-		return [a, b, c]
-	
-	def draw(self, screen):
+		return ship_triangle(self.position, self.rotation, self.radius)
+
+	@property
+	def bounding_radius(self):
+		return self.radius * SHIP_REACH
+
+	def hitbox_outline(self):
+		# the drawn triangle around the origin, rebuilt only when the ship turns
+		if self._hitbox_rotation != self.rotation:
+			origin = pygame.Vector2(0, 0)
+			self._hitbox = tuple(
+				(vertex.x, vertex.y) for vertex in ship_triangle(origin, self.rotation, self.radius)
+			)
+			self._hitbox_rotation = self.rotation
+		return self._hitbox
+
+	def is_visible(self):
+		# blinks while invulnerable after a respawn
 		if self.invulnerable_timer > 0:
-			blink_on = int(self.invulnerable_timer * 10) % 2 == 0
-			if not blink_on:
-				return
-		pygame.draw.polygon(screen, "white", self.triangle(), LINE_WIDTH)
+			return int(self.invulnerable_timer * 10) % 2 == 0
+		return True
+
+	def draw(self, screen):
+		if not self.is_visible():
+			return
+		pygame.draw.polygon(screen, self.color, self.triangle(), LINE_WIDTH)
+
+	def blit_sprite(self, atlas):
+		if not self.is_visible():
+			return None
+		surface = atlas.ship(self.rotation, self.radius, self.color)
+		half_width = surface.get_width() / 2
+		half_height = surface.get_height() / 2
+		return surface, (self.position.x - half_width, self.position.y - half_height)
+
+	def set_input(self, provider):
+		"""Read keys from `provider`, a callable returning a key state, instead of the keyboard."""
+		self.read_keys = provider
 
 	def rotate(self, dt):
-		self.rotation += PLAYER_TURN_SPEED * dt
+		self.rotation += self.turn_speed * dt
 
 	def update(self, dt):
-		keys = pygame.key.get_pressed()
+		keys = self.read_keys()
 		self.shot_cooldown -= dt
 		self.invulnerable_timer = max(0, self.invulnerable_timer - dt)
 
@@ -49,16 +105,28 @@ class Player(CircleShape):
 	def move(self, dt):
 		unit_vector = pygame.Vector2(0, 1)
 		rotated_vector = unit_vector.rotate(self.rotation)
-		rotated_with_speed_vector = rotated_vector * PLAYER_SPEED * dt
+		rotated_with_speed_vector = rotated_vector * self.speed * dt
 		self.position += rotated_with_speed_vector
 	
 	def shoot(self):
 		if self.shot_cooldown > 0:
 			return
 		else:
-			self.shot_cooldown = PLAYER_SHOOT_COOLDOWN_SECONDS
-			shot = Shot(self.position.x, self.position.y, SHOT_RADIUS)
-			shot.velocity = pygame.Vector2(0, 1).rotate(self.rotation) * PLAYER_SHOOT_SPEED
+			self.shot_cooldown = self.shoot_cooldown_seconds
+			pool = self.shot_pool
+			if pool is not None:
+				shot = pool.acquire(self.position.x, self.position.y, self.shot_radius)
+			else:
+				shot = self.shot_type.create(self.position.x, self.position.y, self.shot_radius)
+			velocity = shot.velocity
+			velocity.update(0, self.shoot_speed)
+			velocity.rotate_ip(self.rotation)
+			shot.velocity = velocity
+
+	def snapshot(self):
+		state = super().snapshot()
+		state["rot"] = round(self.rotation, 2)
+		return state
 
 	def is_vulnerable(self):
 		return self.invulnerable_timer <= 0
@@ -67,4 +135,4 @@ class Player(CircleShape):
 		self.position = pygame.Vector2(position)
 		self.velocity = pygame.Vector2(0, 0)
 		self.rotation = 0
-		self.invulnerable_timer = PLAYER_RESPAWN_INVULN_SECONDS
+		self.invulnerable_timer = self.respawn_invuln_seconds
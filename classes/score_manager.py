@@ -1,29 +1,39 @@
-import json
-import os
-from util.constants import (
-	ASTEROID_MAX_RADIUS,
-	ASTEROID_MIN_RADIUS,
-	SCORE_SMALL_ASTEROID,
-	SCORE_MEDIUM_ASTEROID,
-	SCORE_LARGE_ASTEROID,
-	SCORE_MAX,
-	HIGH_SCORE_FILE
-)
+from util.config import DEFAULT_CONFIG
+from util.high_scores import HighScoreStore
 
 class ScoreManager():
-	def __init__(self):
+	def __init__(self, config=DEFAULT_CONFIG.score, store=None):
+		self._config = config
+		if store is None:
+			store = HighScoreStore(config.high_score_file, config.leaderboard_file, config.leaderboard_size)
+		self._store = store
+		# copied out of the ScoreConfig once; add_score runs on every hit
+		self._small_points = config.small_asteroid
+		self._medium_points = config.medium_asteroid
+		self._large_points = config.large_asteroid
+		self._small_radius = config.small_asteroid_radius
+		self._large_radius = config.large_asteroid_radius
+		self._max_score = config.max_score
+		self._combo_window = config.combo_window_seconds
+		self._initial_multiplier = config.combo_initial_multiplier
 		self.__current_score = 0
-		self.__combo_multiplier = 1
+		self.__combo_multiplier = self._initial_multiplier
 		self.__combo_timer= 0.0
-		self.__high_score = self._load_high_score()
+		self.__high_score = store.best()
 
 	def add_score(self, asteroid_radius):
 		self.__current_score += self._calculate_base_points(asteroid_radius) * self.get_combo_multiplier()
 		self._update_combo()
-		if self.__current_score > SCORE_MAX:
-			self.__current_score = SCORE_MAX
+		if self.__current_score > self._max_score:
+			self.__current_score = self._max_score
 		return
 	
+	def add_hits(self, hits):
+		"""Score a batch of `util.event_bus.ASTEROID_HIT` records in order."""
+		add_score = self.add_score
+		for hit in hits:
+			add_score(hit[0])
+
 	def update(self, dt):
 		self.__combo_timer -= dt
 		if self.__combo_timer < 0.0:
@@ -32,23 +42,23 @@ class ScoreManager():
 
 	
 	def reset(self):
-			self.__init__()
+			self.__init__(self._config, self._store)
 	
 	def _update_combo(self):
 		self.__combo_multiplier += 1
-		self.__combo_timer = 2.0
+		self.__combo_timer = self._combo_window
 
 	def _reset_combo(self):
-		self.__combo_multiplier = 1
+		self.__combo_multiplier = self._initial_multiplier
 		self.__combo_timer = 0.0
 
 	def _calculate_base_points(self, radius):
-		if radius == ASTEROID_MAX_RADIUS:
-			return SCORE_LARGE_ASTEROID
-		elif radius == ASTEROID_MIN_RADIUS:
-			return SCORE_SMALL_ASTEROID
+		if radius >= self._large_radius:
+			return self._large_points
+		elif radius <= self._small_radius:
+			return self._small_points
 		else:
-			return SCORE_MEDIUM_ASTEROID
+			return self._medium_points
 
 	def get_current_score(self):
 		return self.__current_score
@@ -67,23 +77,10 @@ class ScoreManager():
 			return True
 		return False
 
-	def _load_high_score(self):
-		"""Load high score from file, return 0 if file doesn't exist."""
-		if os.path.exists(HIGH_SCORE_FILE):
-			try:
-				with open(HIGH_SCORE_FILE, 'r') as f:
-					data = json.load(f)
-					return data.get('high_score', 0)
-			except (json.JSONDecodeError, IOError):
-				return 0
-		return 0
+	def record_run(self, **metadata):
+		"""Add the current score to the leaderboard in the background; returns a Future of its rank."""
+		return self._store.record(self.__current_score, **metadata)
 
 	def _save_high_score(self):
-		"""Save high score to file."""
-		try:
-			with open(HIGH_SCORE_FILE, 'w') as f:
-				json.dump({'high_score': self.__high_score}, f)
-		except IOError:
-			pass  # Silently fail if we can't save
-
-
+		"""Replace the high score file atomically, off the game thread."""
+		self._store.save_best(self.__high_score)
@@ -1,14 +1,18 @@
 import pygame
 from classes.circleshape import CircleShape
-from util.constants import LINE_WIDTH, SHOT_RADIUS
+from util.constants import LINE_WIDTH, SHOT_LIFETIME_SECONDS, SHOT_RADIUS
 
 
 class Shot(CircleShape):
-	def __init__(self, x, y, radius):
-		super().__init__(x, y, radius)
+	lifetime = SHOT_LIFETIME_SECONDS
+	color = "yellow"
+
+	def __init__(self, x, y, radius, containers=None):
+		super().__init__(x, y, radius, containers)
 
 	def draw(self, screen):
-		pygame.draw.circle(screen, "yellow", self.position, self.radius, LINE_WIDTH)
+		pygame.draw.circle(screen, self.color, self.position, self.radius, LINE_WIDTH)
 
 	def update(self, dt):
 		self.position += self.velocity * dt
+		self.age += dt
@@ -0,0 +1,374 @@
+import os
+import time
+import pygame
+
+try:
+	import numpy as np
+except ImportError:  # numpy is an optional dependency
+	np = None
+
+from classes.asteroid import Asteroid
+from classes.asteroidfield import AsteroidField
+from classes.player import Player
+from classes.score_manager import ScoreManager
+from classes.shot import Shot
+from classes.stored_shapes import StoredAsteroid, StoredShot
+from util.constants import (
+	ASTEROID_POOL_CAP,
+	COLLISION_BATCH_MAX_PAIRS,
+	COLLISION_BATCH_MIN_PAIRS,
+	ENTITY_STORE_ENABLED,
+	PARTICLES_ENABLED,
+	PARTICLES_PER_PLAYER_HIT,
+	PLAYER_HIT_PARTICLE_COLOR,
+	SCREEN_HEIGHT,
+	SCREEN_WIDTH,
+	SCREEN_WRAP,
+	SHOT_POOL_CAP,
+	SIMULATION_DT,
+	WRAP_MAX_ASTEROIDS,
+)
+from util.config import DEFAULT_CONFIG
+from util.collision import circle_hits, circle_pairs, shot_time_of_impact
+from util.culling import Culler
+from util.entity_store import EntityStore, KIND_ASTEROID, KIND_SHOT, numpy_available
+from util.event_bus import ASTEROID_HIT, EventBus
+from util.logger import (
+	log_event,
+	log_events,
+	log_state,
+	snapshot_group,
+)
+from util.particles import ParticleSystem
+from util.pool import ShapePool
+from util.profiler import NULL_PROFILER
+from util.spatial_hash import SpatialHash
+from util.torus import Torus
+
+
+def init_headless():
+	"""Initialise pygame for a simulation with no window."""
+	# keyboard state is only readable once a video driver is up
+	os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+	pygame.display.init()
+
+
+# Game logic without a display: owns the sprite groups, the player, scoring
+# and collision handling, and advances them one fixed step at a time.
+#
+# With `wrap`, the screen is a torus: positions wrap after every move,
+# collisions use minimum-image distances and the renderer draws ghost copies
+# of sprites crossing an edge.
+class Simulation:
+	def __init__(
+		self,
+		use_entity_store=ENTITY_STORE_ENABLED,
+		profiler=NULL_PROFILER,
+		wrap=SCREEN_WRAP,
+		spawn_profile=None,
+		particles=PARTICLES_ENABLED,
+		config=DEFAULT_CONFIG,
+	):
+		self.profiler = profiler
+		self.config = config
+		self.torus = Torus() if wrap else None
+		self.updatable = pygame.sprite.Group()
+		self.drawable = pygame.sprite.Group()
+		self.asteroids = pygame.sprite.Group()
+		self.shots = pygame.sprite.Group()
+
+		# explosions are cosmetic, so without numpy they are simply skipped
+		self.particles = ParticleSystem() if particles and numpy_available() else None
+
+		# Everything a spawned entity needs (its groups, the entity store,
+		# the particle system) reaches it through this simulation's pools,
+		# never through class attributes, so simulations can run side by side.
+		self.store = None
+		if use_entity_store and numpy_available():
+			self.store = EntityStore()
+			# stored entities are integrated in bulk, so keep them out of
+			# `updatable`; the store recycles their slots, so no pooling
+			self.asteroid_pool = ShapePool(
+				StoredAsteroid,
+				0,
+				(self.asteroids, self.drawable),
+				store=self.store,
+				particles=self.particles,
+			)
+			self.shot_pool = ShapePool(StoredShot, 0, (self.shots, self.drawable), store=self.store)
+		else:
+			self.asteroid_pool = ShapePool(
+				Asteroid,
+				ASTEROID_POOL_CAP,
+				(self.asteroids, self.updatable, self.drawable),
+				particles=self.particles,
+			)
+			self.shot_pool = ShapePool(Shot, SHOT_POOL_CAP, (self.shots, self.updatable, self.drawable))
+
+		self.asteroid_field = AsteroidField(
+			self.asteroids,
+			WRAP_MAX_ASTEROIDS if wrap else None,
+			spawn_profile,
+			config.asteroids,
+			self.asteroid_pool,
+			self.updatable,
+			wrap,
+		)
+		self.player = Player(
+			SCREEN_WIDTH / 2,
+			SCREEN_HEIGHT / 2,
+			config.player,
+			self.shot_pool,
+			(self.updatable, self.drawable),
+		)
+		self.lives = config.player.lives
+		self.score_manager = ScoreManager(config.score)
+		# hits are scored and logged once per step, after collisions
+		self.events = EventBus()
+		self.events.subscribe(ASTEROID_HIT, self.score_manager.add_hits)
+		self.events.subscribe(ASTEROID_HIT, self._log_hits)
+		self.shot_hash = SpatialHash(torus=self.torus)
+		self.culler = Culler()
+		self.frame = 0
+		self.elapsed = 0.0
+		self.game_over = False
+		self._observers = []
+
+	def snapshot(self):
+		"""State logged every few frames by `util.logger.log_state`."""
+		return {
+			"asteroids": snapshot_group(self.asteroids),
+			"shots": snapshot_group(self.shots),
+			"player": self.player.snapshot(),
+		}
+
+	def add_observer(self, observer):
+		"""Call `observer(simulation, dt)` after every step, including the last one."""
+		self._observers.append(observer)
+
+	def step(self, dt=SIMULATION_DT):
+		"""Advance the game by `dt` seconds. Does nothing once the game is over."""
+		if self.game_over:
+			return
+		store = self.store
+		profiler = self.profiler
+		log_state(self.snapshot)
+		profiler.mark("log_state")
+		if store is not None:
+			# shots fired and rocks spawned below are not moved until next step
+			store.begin_step()
+
+		for entity in self.updatable:
+			entity.update(dt)
+		if store is not None:
+			store.integrate(dt)
+		torus = self.torus
+		if torus is not None:
+			if store is not None:
+				store.wrap(torus)
+			else:
+				torus.wrap_all(self.asteroids)
+				torus.wrap_all(self.shots)
+			torus.wrap(self.player)
+		profiler.mark("update")
+		if self.particles is not None:
+			self.particles.update(dt, torus)
+		profiler.mark("particles")
+		if store is not None:
+			self.culler.cull_store(store, KIND_ASTEROID, self.asteroid_pool.shape_type.lifetime)
+			self.culler.cull_store(store, KIND_SHOT, self.shot_pool.shape_type.lifetime)
+		else:
+			self.culler.cull(self.asteroids)
+			self.culler.cull(self.shots)
+		profiler.mark("cull")
+
+		self._resolve_collisions(dt)
+		profiler.mark("collisions")
+		self.events.dispatch()
+		if not self.game_over:
+			self.score_manager.update(dt)
+
+		self.asteroid_pool.reclaim()
+		self.shot_pool.reclaim()
+		if store is not None:
+			store.reclaim()
+		profiler.mark("scoring")
+		self.frame += 1
+		self.elapsed += dt
+		for observer in self._observers:
+			observer(self, dt)
+
+	# Shots are tested over their whole motion during the step (swept), so
+	# a long step cannot let a shot pass through a rock between frames.
+	# Candidates come from one batched kernel call when numpy is available
+	# (from the entity store's arrays, or gathered from the sprites), and
+	# from the spatial hash otherwise. Gathering sprite state into arrays only
+	# pays off between COLLISION_BATCH_MIN_PAIRS and COLLISION_BATCH_MAX_PAIRS
+	# rocks x shots; past that the all-pairs kernel loses to the broad phase.
+	# Rocks are then handled in group order.
+	def _resolve_collisions(self, dt):
+		publish = self.events.publish
+		torus = self.torus
+		rocks = self.asteroids.sprites()
+		pairs = len(rocks) * len(self.shots)
+		if self.store is not None:
+			player_hits, shot_hits = self._store_hits(dt)
+		elif COLLISION_BATCH_MIN_PAIRS <= pairs <= COLLISION_BATCH_MAX_PAIRS and numpy_available():
+			player_hits, shot_hits = self._batched_hits(rocks, dt)
+		else:
+			player_hits, shot_hits = self._hashed_hits(rocks, dt)
+		player = self.player
+		for rock in rocks:
+			# the finders compare bounding circles; the outlines settle it
+			if rock in player_hits and rock.exact_hit(player, *self._offset(rock, player)):
+				self._player_hit()
+				return
+			for shot in shot_hits.get(rock, ()):
+				if not shot.alive():
+					continue
+				impact = shot_time_of_impact(rock, shot, dt, torus)
+				if impact is not None and rock.exact_swept_hit(shot, dt, torus):
+					radius = rock.radius
+					shot.kill()
+					publish(ASTEROID_HIT, (radius, impact, rock.split()))
+					# the rock is gone; any other shot on it flies on
+					break
+
+	def _log_hits(self, hits):
+		# runs after the score manager, so the score covers the whole batch
+		score_manager = self.score_manager
+		events = []
+		for _, impact, split in hits:
+			events.append(('asteroid_shot', {'toi': round(impact, 5)}))
+			if split:
+				events.append(('asteroid_split', {}))
+		events.append(('score_added', {
+			'score': score_manager.get_current_score(),
+			'multiplier': score_manager.get_combo_multiplier(),
+		}))
+		log_events(events)
+
+	def _offset(self, shape, other):
+		if self.torus is not None:
+			return self.torus.delta(shape.position, other.position)
+		offset = other.position - shape.position
+		return offset.x, offset.y
+
+	# Each finder returns (rocks whose bounding circle touches the vulnerable
+	# player's, {rock: [shots it may have been hit by]}).
+	def _store_hits(self, dt):
+		store = self.store
+		torus = self.torus
+		player = self.player
+		player_hits = ()
+		if player.is_vulnerable():
+			player_hits = set(store.touching(KIND_ASTEROID, player.position, player.bounding_radius, torus))
+		return player_hits, store.overlaps(KIND_ASTEROID, KIND_SHOT, torus, dt)
+
+	def _batched_hits(self, rocks, dt):
+		if not rocks:
+			return (), {}
+		torus = self.torus
+		player = self.player
+		rock_state = np.array(
+			[(*rock.position, *rock.velocity, rock.radius) for rock in rocks]
+		)
+		positions = rock_state[:, 0:2]
+		radii = rock_state[:, 4]
+		player_hits = ()
+		if player.is_vulnerable():
+			hits = circle_hits(player.position, player.bounding_radius, positions, radii, torus)
+			player_hits = {rocks[index] for index in hits.tolist()}
+		shot_hits = {}
+		shots = self.shots.sprites()
+		if shots:
+			shot_state = np.array(
+				[(*shot.position, *shot.velocity, shot.radius, shot.age) for shot in shots]
+			)
+			shot_motion = shot_state[:, 2:4] * np.minimum(shot_state[:, 5], dt)[:, None]
+			rows, columns = circle_pairs(
+				positions,
+				radii,
+				shot_state[:, 0:2],
+				shot_state[:, 4],
+				torus,
+				rock_state[:, 2:4] * dt,
+				shot_motion,
+			)
+			for row, column in zip(rows.tolist(), columns.tolist()):
+				shot_hits.setdefault(rocks[row], []).append(shots[column])
+		return player_hits, shot_hits
+
+	def _hashed_hits(self, rocks, dt):
+		torus = self.torus
+		player = self.player
+		player_hits = ()
+		if player.is_vulnerable():
+			reach = player.bounding_radius
+			position = player.position
+			player_hits = set()
+			for rock in rocks:
+				if torus is None:
+					dx = position.x - rock.position.x
+					dy = position.y - rock.position.y
+				else:
+					dx, dy = torus.delta(rock.position, position)
+				touch = rock.radius + reach
+				if dx * dx + dy * dy < touch * touch:
+					player_hits.add(rock)
+		shots = self.shots
+		shot_hash = self.shot_hash
+		shot_hash.rebuild(shots)
+		# widen each query by how far a shot can have travelled this step
+		shot_reach = max((shot.velocity.length() for shot in shots), default=0.0) * dt
+		shot_hits = {}
+		for rock in rocks:
+			reach = rock.radius + shot_reach + rock.velocity.length() * dt
+			shot_hits[rock] = shot_hash.query(rock.position, reach)
+		return player_hits, shot_hits
+
+	def entity_counts(self):
+		return {
+			"asteroids": len(self.asteroids),
+			"shots": len(self.shots),
+			"updatable": len(self.updatable),
+		}
+
+	def _player_hit(self):
+		log_event('player_hit')
+		if self.particles is not None:
+			position = self.player.position
+			self.particles.emit(
+				position.x,
+				position.y,
+				PARTICLES_PER_PLAYER_HIT,
+				color=PLAYER_HIT_PARTICLE_COLOR,
+			)
+		self.lives -= 1
+		if self.lives <= 0:
+			self.game_over = True
+			return
+		self.player.respawn((SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
+
+	def run(self, frames, dt=SIMULATION_DT):
+		"""Step up to `frames` times as fast as possible and return a summary."""
+		start = time.perf_counter()
+		step = self.step
+		profiler = self.profiler
+		for _ in range(frames):
+			if self.game_over:
+				break
+			profiler.begin_frame()
+			step(dt)
+			if profiler.enabled:
+				profiler.end_frame(**self.entity_counts())
+		wall_seconds = time.perf_counter() - start
+		return {
+			"frames": self.frame,
+			"simulated_seconds": self.elapsed,
+			"wall_seconds": wall_seconds,
+			"frames_per_second": self.frame / wall_seconds if wall_seconds > 0 else 0.0,
+			"score": self.score_manager.get_current_score(),
+			"lives": self.lives,
+			"game_over": self.game_over,
+		}
@@ -0,0 +1,70 @@
+import pygame
+from classes.asteroid import Asteroid
+from classes.circleshape import CircleShape
+from classes.shot import Shot
+from util.entity_store import KIND_ASTEROID, KIND_SHOT
+
+
+# Keeps a sprite's physical state in an EntityStore slot instead of on the
+# instance. The store is passed in like `containers` (or installed on the
+# class). A killed sprite stays readable until the store reclaims its slot at
+# end of frame.
+class StoredShape(CircleShape):
+	store = None
+	kind = None
+
+	def __init__(self, x, y, radius, containers=None, store=None, **options):
+		if store is not None:
+			self.store = store
+		self.slot = self.store.allocate(self.kind, self)
+		super().__init__(x, y, radius, containers, **options)
+
+	@property
+	def position(self):
+		return pygame.Vector2(self.store.position[self.slot].tolist())
+
+	@position.setter
+	def position(self, value):
+		self.store.position[self.slot] = value
+
+	@property
+	def velocity(self):
+		return pygame.Vector2(self.store.velocity[self.slot].tolist())
+
+	@velocity.setter
+	def velocity(self, value):
+		self.store.velocity[self.slot] = value
+
+	@property
+	def radius(self):
+		return float(self.store.radius[self.slot])
+
+	@radius.setter
+	def radius(self, value):
+		self.store.radius[self.slot] = value
+
+	@property
+	def age(self):
+		return float(self.store.age[self.slot])
+
+	@age.setter
+	def age(self, value):
+		self.store.age[self.slot] = value
+
+	def update(self, dt):
+		# movement happens in EntityStore.integrate
+		pass
+
+	def kill(self):
+		store = self.store
+		if store.owners[self.slot] is self and store.alive[self.slot]:
+			store.release(self.slot)
+		super().kill()
+
+
+class StoredAsteroid(StoredShape, Asteroid):
+	kind = KIND_ASTEROID
+
+
+class StoredShot(StoredShape, Shot):
+	kind = KIND_SHOT
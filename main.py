@@ -1,88 +1,202 @@
+import argparse
+import os
+import random
 import sys
 import pygame
-from classes.asteroid import Asteroid
-from classes.asteroidfield import AsteroidField
-from score_display import ScoreDisplay
-from util.logger import log_event, log_score_added, log_state
-from util.constants import SCREEN_WIDTH, SCREEN_HEIGHT, PLAYER_LIVES
-from classes.player import Player
-from classes.shot import Shot
-from classes.score_manager import ScoreManager
-
-def main():
+from classes.simulation import Simulation, init_headless
+from renderer import Renderer
+from util.config import DEFAULT_CONFIG, load_config
+from util.input_provider import BOTS
+from util.logger import configure_logging, configure_snapshots
+from util.replay import Recorder, new_seed
+from util.profiler import FrameProfiler, NULL_PROFILER
+from util.spawn_profile import load_spawn_profile
+from util.constants import (
+    SCREEN_WIDTH,
+    SCREEN_HEIGHT,
+    SIMULATION_DT,
+    MAX_SIMULATION_STEPS_PER_FRAME,
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="SpaceRocks")
+    parser.add_argument(
+        "--headless",
+        action="store_true",
+        help="run the simulation without a window as fast as possible",
+    )
+    parser.add_argument(
+        "--frames",
+        type=int,
+        default=60 * 60,
+        help="number of fixed steps to simulate in headless mode",
+    )
+    parser.add_argument(
+        "--dt",
+        type=float,
+        default=SIMULATION_DT,
+        help="fixed timestep in seconds",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        help="seed the random number generator for a reproducible run",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="record input, timing and RNG seed to a replay file",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="PATH",
+        help="time every frame phase, show an overlay and write stats to PATH on exit",
+    )
+    parser.add_argument(
+        "--config",
+        metavar="PATH",
+        help="load gameplay settings from a TOML or JSON file (SPACEROCKS_* variables override it)",
+    )
+    parser.add_argument(
+        "--spawn-profile",
+        metavar="PATH",
+        help="load asteroid spawn waves and the spawn budget from a JSON file",
+    )
+    parser.add_argument(
+        "--bot",
+        choices=sorted(BOTS),
+        help="let a scripted bot fly the ship instead of the keyboard",
+    )
+    return parser.parse_args(argv)
+
+
+def run_headless(
+    frames,
+    dt,
+    profiler=NULL_PROFILER,
+    spawn_profile=None,
+    config=DEFAULT_CONFIG,
+    bot=None,
+    record=None,
+    seed=None,
+):
+    init_headless()
+    # a headless run is for measuring or recording, not for inspecting logs:
+    # building snapshots would stall steps, and the files would only grow
+    configure_snapshots(enabled=False)
+    configure_logging(state_path=os.devnull, event_path=os.devnull)
+    # nothing is drawn, so skip the explosion particles
+    simulation = Simulation(
+        profiler=profiler, spawn_profile=spawn_profile, particles=False, config=config
+    )
+    if bot is not None:
+        simulation.player.set_input(BOTS[bot](simulation))
+    recorder = None
+    if record:
+        recorder = Recorder(record, seed)
+        recorder.attach(simulation)
+    try:
+        result = simulation.run(frames, dt)
+    finally:
+        if recorder is not None:
+            recorder.close()
+    print(
+        f"Simulated {result['frames']:,} frames ({result['simulated_seconds']:.1f}s) "
+        f"in {result['wall_seconds']:.2f}s "
+        f"({result['frames_per_second']:,.0f} frames/s), score {result['score']:,}"
+    )
+    return result
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    seed = args.seed
+    if seed is None and args.record:
+        seed = new_seed()
+    if seed is not None:
+        random.seed(seed)
+    profiler = FrameProfiler() if args.profile else NULL_PROFILER
+    spawn_profile = None
+    if args.spawn_profile:
+        spawn_profile = load_spawn_profile(args.spawn_profile)
+    config = load_config(args.config)
+    try:
+        if args.headless:
+            run_headless(
+                args.frames, args.dt, profiler, spawn_profile, config, args.bot, args.record, seed
+            )
+        else:
+            run_windowed(args, seed, profiler, spawn_profile, config)
+    finally:
+        if args.profile:
+            profiler.dump(args.profile)
+
+
+def run_windowed(args, seed, profiler, spawn_profile=None, config=DEFAULT_CONFIG):
     print("Starting Asteroids with pygame version: ", pygame.version.ver)
     print(f'Screen width: {SCREEN_WIDTH}, Screen height: {SCREEN_HEIGHT}')
 
     pygame.init()
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     clock = pygame.time.Clock()
-    dt = 0
-    updatable = pygame.sprite.Group()
-    drawable = pygame.sprite.Group()
-    asteroids = pygame.sprite.Group()
-    shots = pygame.sprite.Group()
-
-    Asteroid.containers = (asteroids, updatable, drawable)
-    AsteroidField.containers = updatable
-    Player.containers = (updatable, drawable)
-    Shot.containers = (shots, updatable, drawable)
-    
-    asteroid_field = AsteroidField()
-    player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
-    lives = PLAYER_LIVES
-    score_manager = ScoreManager()
-    score_display = ScoreDisplay()
-    score_display.update_high_score(score_manager.get_high_score())
-    score_display.update_lives(lives)
-    
+    simulation = Simulation(profiler=profiler, spawn_profile=spawn_profile, config=config)
+    renderer = Renderer(screen, simulation, profiler)
+    if args.bot is not None:
+        simulation.player.set_input(BOTS[args.bot](simulation))
+    recorder = None
+    if args.record:
+        recorder = Recorder(args.record, seed)
+        recorder.attach(simulation)
+    try:
+        run_interactive(simulation, renderer, clock, args.dt, seed)
+    finally:
+        if recorder is not None:
+            recorder.close()
+
+
+def run_interactive(simulation, renderer, clock, step_dt, seed=None):
+    profiler = simulation.profiler
+    accumulator = 0.0
     while True:
-        log_state()
+        profiler.begin_frame()
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 return
-        screen.fill("black")
-        for entity in updatable:
-            entity.update(dt)
-        for entity in drawable:
-            entity.draw(screen)
-        for rock in asteroids:
-            if player.is_vulnerable() and rock.collides_with(player):
-                log_event('player_hit')
-                lives -= 1
-                score_display.update_lives(lives)
-                if lives <= 0:
-                    final_score = score_manager.get_current_score()
-                    is_new_high_score = score_manager.check_and_save_high_score()
-                    if is_new_high_score:
-                        print(f'Game over! New high score: {final_score:,}')
-                    else:
-                        print(f'Game over! Final score: {final_score:,}')
-                    sys.exit()
-                player.respawn((SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2))
-                break
-            for shot in shots:
-                if rock.collides_with(shot):
-                    log_event('asteroid_shot')
-                    shot.kill()
-                    rock.split()
-                    score_manager.add_score(rock.radius)
-                    current_score = score_manager.get_current_score()
-                    combo = score_manager.get_combo_multiplier()
-                    score_display.update_score(current_score)
-                    score_display.update_combo(combo)
-                    log_score_added(
-                        current_score, combo
-                    )
-
-        score_display.render_surface(screen)
-        old_combo = score_manager.get_combo_multiplier()
-        score_manager.update(dt)
-        new_combo = score_manager.get_combo_multiplier()
-        if old_combo != new_combo:
-            score_display.update_combo(new_combo)
-
-        pygame.display.flip()
-        dt = clock.tick(60) / 1000  # Convert milliseconds to seconds
+            if event.type == pygame.WINDOWEXPOSED:
+                renderer.invalidate()
+        profiler.mark("events")
+
+        # advance in fixed steps; drop time we can't catch up on
+        accumulator += clock.tick(60) / 1000  # Convert milliseconds to seconds
+        profiler.mark("tick")
+        steps = 0
+        while accumulator >= step_dt and steps < MAX_SIMULATION_STEPS_PER_FRAME:
+            simulation.step(step_dt)
+            accumulator -= step_dt
+            steps += 1
+        if steps == MAX_SIMULATION_STEPS_PER_FRAME:
+            accumulator = 0.0
+
+        if simulation.game_over:
+            score_manager = simulation.score_manager
+            final_score = score_manager.get_current_score()
+            is_new_high_score = score_manager.check_and_save_high_score()
+            rank = score_manager.record_run(
+                survival_seconds=round(simulation.elapsed, 2), frames=simulation.frame, seed=seed
+            )
+            if is_new_high_score:
+                print(f'Game over! New high score: {final_score:,}')
+            else:
+                print(f'Game over! Final score: {final_score:,}')
+            # a failed write has already been reported as a warning
+            if rank.exception() is None:
+                print(f'Leaderboard rank: #{rank.result()}')
+            sys.exit()
+
+        renderer.render()
+        if profiler.enabled:
+            profiler.end_frame(**simulation.entity_counts())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,140 @@
+import time
+import pygame
+from score_display import ScoreDisplay
+from sprite_atlas import SpriteAtlas
+from util.constants import (
+	DIRTY_RECT_MAX_FRACTION,
+	PROFILER_OVERLAY_COLOR,
+	PROFILER_OVERLAY_POSITION,
+	PROFILER_OVERLAY_REFRESH_SECONDS,
+	RENDER_BATCHED,
+	RENDER_DIRTY_RECTS,
+)
+from util.logger import register_snapshot_provider
+from util.profiler import NULL_PROFILER
+
+
+def _area(rects):
+	# overlaps count twice, which only makes the full-flip fallback kick in sooner
+	return sum(rect.width * rect.height for rect in rects)
+
+
+# Draws a Simulation's current state. The simulation never calls into the
+# renderer, so headless runs simply don't create one.
+#
+# In dirty-rect mode only last frame's sprite and HUD rects are cleared and
+# only those plus this frame's are pushed to the display. Once that area
+# passes DIRTY_RECT_MAX_FRACTION of the screen a full fill and flip is cheaper,
+# so the renderer switches to that for the frame. Dirty rects need the
+# sprite atlas to report where each entity landed.
+class Renderer:
+	def __init__(
+		self,
+		screen,
+		simulation,
+		profiler=NULL_PROFILER,
+		batched=RENDER_BATCHED,
+		dirty_rects=RENDER_DIRTY_RECTS,
+	):
+		self._screen = screen
+		self._simulation = simulation
+		self._profiler = profiler
+		self._score_display = ScoreDisplay(simulation.config.display)
+		self._score_display.update_high_score(simulation.score_manager.get_high_score())
+		self._overlay = ProfilerOverlay(profiler) if profiler.enabled else None
+		self._atlas = SpriteAtlas() if batched else None
+		self._dirty_rects = dirty_rects and batched
+		self._max_dirty_area = DIRTY_RECT_MAX_FRACTION * screen.get_width() * screen.get_height()
+		# rects drawn last frame; None forces a full redraw
+		self._previous = None
+		self.full_updates = 0
+		self.partial_updates = 0
+		register_snapshot_provider("screen_size", lambda: list(screen.get_size()))
+
+	def render(self):
+		screen = self._screen
+		simulation = self._simulation
+		profiler = self._profiler
+		score_manager = simulation.score_manager
+		score_display = self._score_display
+		score_display.update_score(score_manager.get_current_score())
+		score_display.update_combo(score_manager.get_combo_multiplier())
+		score_display.update_lives(simulation.lives)
+
+		previous = self._previous
+		if previous is None or _area(previous) > self._max_dirty_area:
+			previous = None
+			screen.fill("black")
+		else:
+			for rect in previous:
+				screen.fill("black", rect)
+		drawn = [] if self._dirty_rects else None
+		if self._atlas is not None:
+			self._atlas.draw(screen, simulation.drawable, drawn, simulation.torus)
+		else:
+			for entity in simulation.drawable:
+				entity.draw(screen)
+		if simulation.particles is not None:
+			simulation.particles.draw(screen, drawn)
+		profiler.mark("draw")
+		hud_rects = score_display.render_surface(screen)
+		if self._overlay is not None:
+			hud_rects += self._overlay.render_surface(screen)
+		profiler.mark("hud")
+		if drawn is None:
+			pygame.display.flip()
+		else:
+			drawn += hud_rects
+			self._present(previous, drawn)
+			self._previous = drawn
+		profiler.mark("flip")
+
+	def _present(self, previous, drawn):
+		if previous is not None:
+			dirty = previous + drawn
+			if _area(dirty) <= self._max_dirty_area:
+				pygame.display.update(dirty)
+				self.partial_updates += 1
+				return
+		pygame.display.flip()
+		self.full_updates += 1
+
+	def invalidate(self):
+		# redraw everything next frame, e.g. after the window was exposed
+		self._previous = None
+
+
+# On-screen p50/p95/p99 per phase. The text is re-rasterized a few times a
+# second rather than every frame so the overlay barely shows up in its own stats.
+class ProfilerOverlay:
+	def __init__(self, profiler):
+		self._profiler = profiler
+		self._font = pygame.font.Font(None, 22)
+		self._surfaces = []
+		self._next_refresh = 0.0
+
+	def _refresh(self):
+		stats = self._profiler.stats()
+		lines = [f"{'phase':<11}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+		phases = dict(stats["phases_ms"])
+		if stats["frame_ms"]:
+			phases["frame"] = stats["frame_ms"]
+		for phase, values in phases.items():
+			lines.append(f"{phase:<11}{values['p50']:7.2f}{values['p95']:7.2f}{values['p99']:7.2f}")
+		for name, values in stats["counts"].items():
+			lines.append(f"{name:<11}{values['last']:7d} (peak {values['peak']})")
+		self._surfaces = [
+			self._font.render(line, True, PROFILER_OVERLAY_COLOR) for line in lines
+		]
+
+	def render_surface(self, screen):
+		now = time.perf_counter()
+		if now >= self._next_refresh:
+			self._next_refresh = now + PROFILER_OVERLAY_REFRESH_SECONDS
+			self._refresh()
+		x, y = PROFILER_OVERLAY_POSITION
+		rects = []
+		for surface in self._surfaces:
+			rects.append(screen.blit(surface, (x, y)))
+			y += surface.get_height()
+		return rects
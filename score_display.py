@@ -1,59 +1,93 @@
 import pygame
-from util.constants import (
-	SCORE_POSITION,
-	SCORE_FONT_SIZE,
-	SCORE_COLOR,
-	COMBO_COLOR,
-	COMBO_POSITION,
-	HIGH_SCORE_COLOR,
-	HIGH_SCORE_POSITION,
-	LIVES_COLOR,
-	LIVES_POSITION
-	)
+from util.config import DEFAULT_CONFIG
+
+_GLYPHS = "0123456789,"
 
 class ScoreDisplay:
-	def __init__(self):
+	def __init__(self, config=DEFAULT_CONFIG.display):
 		pygame.font.init()
-		self._text_color = SCORE_COLOR
-		self._font_size = SCORE_FONT_SIZE
-		self._position = SCORE_POSITION
-		self._combo_position = COMBO_POSITION
-		self._combo_color = COMBO_COLOR
-		self._high_score_position = HIGH_SCORE_POSITION
-		self._high_score_color = HIGH_SCORE_COLOR
-		self._lives_position = LIVES_POSITION
-		self._lives_color = LIVES_COLOR
+		self._text_color = config.score_color
+		self._font_size = config.font_size
+		self._position = config.score_position
+		self._combo_position = config.combo_position
+		self._combo_color = config.combo_color
+		self._high_score_position = config.high_score_position
+		self._high_score_color = config.high_score_color
+		self._lives_position = config.lives_position
+		self._lives_color = config.lives_color
 		self._content = {
 			'SCORE' : 0,
 			'COMBO' : 1,
 			'HIGH_SCORE' : 0,
 			'LIVES' : 0
 			}
+		# key -> (label, number format, color, position)
+		self._lines = {
+			'SCORE' : ("SCORE: ", "{:,}", self._text_color, self._position),
+			'COMBO' : ("COMBO: ", "{}", self._combo_color, self._combo_position),
+			'HIGH_SCORE' : ("HIGH SCORE: ", "{:,}", self._high_score_color, self._high_score_position),
+			'LIVES' : ("LIVES: ", "{}", self._lives_color, self._lives_position)
+			}
+		self._font = pygame.font.Font(None, self._font_size)
+		# finished line surfaces, dropped whenever their value changes
+		self._surfaces = {}
+		# (text, color) -> surface for labels and digit glyphs
+		self._atlas = {}
 
 	def update_score(self, value):
-		self._content['SCORE'] = value
+		self._set('SCORE', value)
 
 	def update_combo(self, value):
-		self._content['COMBO'] = value
+		self._set('COMBO', value)
 
 	def update_high_score(self, value):
-		self._content['HIGH_SCORE'] = value
+		self._set('HIGH_SCORE', value)
 	
 	def update_lives(self, value):
-		self._content['LIVES'] = value
+		self._set('LIVES', value)
+
+	def _set(self, key, value):
+		if self._content[key] != value:
+			self._content[key] = value
+			self._surfaces.pop(key, None)
+
+	def _glyph(self, text, color):
+		surface = self._atlas.get((text, color))
+		if surface is None:
+			surface = self._font.render(text, True, color)
+			self._atlas[(text, color)] = surface
+		return surface
+
+	def _compose(self, key):
+		"""Build a line from its cached label plus one cached glyph per character."""
+		label, number_format, color, _ = self._lines[key]
+		number = number_format.format(self._content[key])
+		if not all(char in _GLYPHS for char in number):
+			# e.g. negative values; rare enough to rasterize directly
+			return self._font.render(label + number, True, color)
+		parts = [self._glyph(label, color)]
+		parts.extend(self._glyph(char, color) for char in number)
+		width = sum(part.get_width() for part in parts)
+		height = max(part.get_height() for part in parts)
+		surface = pygame.Surface((width, height), pygame.SRCALPHA)
+		x = 0
+		for part in parts:
+			surface.blit(part, (x, 0))
+			x += part.get_width()
+		return surface
+
+	def _line(self, key):
+		surface = self._surfaces.get(key)
+		if surface is None:
+			surface = self._compose(key)
+			self._surfaces[key] = surface
+		return surface
 
+	# returns the rects drawn to, for dirty-rect updates
 	def render_surface(self, screen):
-		font = pygame.font.Font(None, self._font_size)
-		score_text = f"SCORE: {self._content['SCORE']:,}"
-		score_surface = font.render(score_text, True, self._text_color)
-		screen.blit(score_surface, self._position)
+		rects = [screen.blit(self._line('SCORE'), self._position)]
 		if self._content['COMBO'] >= 2:
-			combo_text = f"COMBO: {self._content['COMBO']}"
-			combo_surface = font.render(combo_text, True, self._combo_color)
-			screen.blit(combo_surface, self._combo_position)
-		high_score_text = f"HIGH SCORE: {self._content['HIGH_SCORE']:,}"
-		high_score_surface = font.render(high_score_text, True, self._high_score_color)
-		screen.blit(high_score_surface, self._high_score_position)
-		lives_text = f"LIVES: {self._content['LIVES']}"
-		lives_surface = font.render(lives_text, True, self._lives_color)
-		screen.blit(lives_surface, self._lives_position)
+			rects.append(screen.blit(self._line('COMBO'), self._combo_position))
+		rects.append(screen.blit(self._line('HIGH_SCORE'), self._high_score_position))
+		rects.append(screen.blit(self._line('LIVES'), self._lives_position))
+		return rects
@@ -0,0 +1,111 @@
+import math
+import pygame
+from classes.player import SHIP_REACH, ship_triangle
+from util.constants import (
+	ASTEROID_KINDS,
+	ASTEROID_LUMPY,
+	ASTEROID_MIN_RADIUS,
+	ASTEROID_OUTLINE_VARIANTS,
+	LINE_WIDTH,
+	PLAYER_RADIUS,
+	SHIP_ROTATION_STEPS,
+	SHOT_RADIUS,
+)
+from util.polygon import outline_variants, translate
+
+
+def _sprite_surface(size):
+	# colour-keyed and run-length encoded: blits skip the transparent runs,
+	# which per-pixel alpha blending cannot
+	surface = pygame.Surface((size, size))
+	surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+	return surface
+
+
+# Pre-rasterized entity sprites, drawn in a single Surface.blits call.
+# Circles are cached per (radius, colour), rock outlines per (radius, variant,
+# colour) and the ship per quantized rotation, so a frame costs one blit per
+# entity instead of one shape rasterization.
+class SpriteAtlas:
+	def __init__(self):
+		self._circles = {}
+		self._outlines = {}
+		self._ships = {}
+		for kind in range(1, ASTEROID_KINDS + 1):
+			radius = ASTEROID_MIN_RADIUS * kind
+			if ASTEROID_LUMPY:
+				for variant in range(ASTEROID_OUTLINE_VARIANTS):
+					self.outline(radius, variant, "white")
+			else:
+				self.circle(radius, "white")
+		self.circle(SHOT_RADIUS, "yellow")
+
+	def circle(self, radius, color):
+		key = (radius, color)
+		surface = self._circles.get(key)
+		if surface is None:
+			# same pixels as pygame.draw.circle at an integer centre
+			size = int(radius)
+			surface = _sprite_surface(size * 2)
+			pygame.draw.circle(surface, color, (size, size), size, LINE_WIDTH)
+			self._circles[key] = surface
+		return surface
+
+	def outline(self, radius, variant, color):
+		key = (radius, variant, color)
+		surface = self._outlines.get(key)
+		if surface is None:
+			half = math.ceil(radius) + LINE_WIDTH
+			surface = _sprite_surface(half * 2)
+			vertices = translate(outline_variants(radius)[variant], half, half)
+			pygame.draw.polygon(surface, color, vertices, LINE_WIDTH)
+			self._outlines[key] = surface
+		return surface
+
+	def ship(self, rotation, radius=PLAYER_RADIUS, color="white"):
+		step = round(rotation * SHIP_ROTATION_STEPS / 360) % SHIP_ROTATION_STEPS
+		key = (step, radius, color)
+		surface = self._ships.get(key)
+		if surface is None:
+			half = math.ceil(radius * SHIP_REACH) + LINE_WIDTH
+			surface = _sprite_surface(half * 2)
+			points = ship_triangle(
+				pygame.Vector2(half, half), step * 360 / SHIP_ROTATION_STEPS, radius
+			)
+			pygame.draw.polygon(surface, color, points, LINE_WIDTH)
+			self._ships[key] = surface
+		return surface
+
+	# Returns the number of sprites blitted. When `dirty` is a list, the rect
+	# of every blit is appended to it; an entity that draws itself can touch
+	# any pixel, so it marks the whole screen dirty. With a `torus`, sprites
+	# overlapping an edge are also blitted at the opposite edge(s).
+	def draw(self, screen, entities, dirty=None, torus=None):
+		blits = []
+		screen_width, screen_height = screen.get_size()
+		for entity in entities:
+			blit_sprite = getattr(entity, "blit_sprite", None)
+			if blit_sprite is None:
+				entity.draw(screen)
+				if dirty is not None:
+					dirty.append(screen.get_rect())
+				continue
+			blit = blit_sprite(self)
+			if blit is None:
+				continue
+			blits.append(blit)
+			if torus is not None:
+				surface, (x, y) = blit
+				width, height = surface.get_size()
+				if x < 0 or y < 0 or x + width > screen_width or y + height > screen_height:
+					half_width = width / 2
+					half_height = height / 2
+					for offset_x, offset_y in torus.images(
+						x + half_width, y + half_height, max(half_width, half_height)
+					)[1:]:
+						blits.append((surface, (x + offset_x, y + offset_y)))
+		if dirty is None:
+			screen.blits(blits, False)
+		else:
+			dirty.extend(screen.blits(blits))
+		return len(blits)
@@ -0,0 +1,31 @@
+import pytest
+from util import logger
+from util.constants import SNAPSHOT_INTERVAL_FRAMES, SNAPSHOT_MAX_SECONDS, SNAPSHOT_SPRITE_LIMIT
+from util.logger import configure_logging, configure_snapshots, flush_logs
+
+
+@pytest.fixture(autouse=True)
+def isolated_logs(tmp_path):
+    """Send every test's game logs to a temporary directory instead of the repo root."""
+    saved = [
+        (log, log.path, log.codec, log.flush_interval, log.flush_size)
+        for log in (logger._state_log, logger._event_log)
+    ]
+    configure_logging(
+        state_path=str(tmp_path / "game_state.jsonl"),
+        event_path=str(tmp_path / "game_events.jsonl"),
+    )
+    yield tmp_path
+    flush_logs()
+    for log, path, codec, flush_interval, flush_size in saved:
+        # reopen without writing, so the original files are left untouched
+        log.reopen(path, codec)
+        log.flush_interval = flush_interval
+        log.flush_size = flush_size
+    # headless runs switch snapshots off; later tests expect the defaults
+    configure_snapshots(
+        interval_frames=SNAPSHOT_INTERVAL_FRAMES,
+        max_seconds=SNAPSHOT_MAX_SECONDS or 0,
+        sprite_limit=SNAPSHOT_SPRITE_LIMIT or 0,
+        enabled=True,
+    )
@@ -0,0 +1,122 @@
+import json
+import os
+import tempfile
+import unittest
+from util.batch import (
+    _apply_overrides,
+    load_results,
+    plan_games,
+    run_sweep,
+    summarize,
+)
+from util.constants import PLAYER_LIVES
+
+
+def sweep(**changes):
+    spec = {
+        "configs": {
+            "baseline": {},
+            "one_life": {"player": {"lives": 1}},
+            "one_life_constant": {"PLAYER_LIVES": 1},
+        },
+        "games": 2,
+        "frames": 30,
+        "dt": 1 / 60,
+        "seed": 10,
+        "bot": "idle",
+    }
+    spec.update(changes)
+    return spec
+
+
+def result(config, seed, overrides, score=100, **changes):
+    record = {
+        "config": config,
+        "seed": seed,
+        "overrides": overrides,
+        "score": score,
+        "survival_seconds": 10.0,
+        "game_over": False,
+        "peak_asteroids": 5,
+        "peak_shots": 2,
+        "mean_step_ms": 0.1,
+        "p95_step_ms": 0.2,
+    }
+    record.update(changes)
+    return record
+
+
+class TestPlanning(unittest.TestCase):
+
+    def test_finished_games_are_skipped(self):
+        done = [result("baseline", 10, {}), result("one_life", 11, {"player": {"lives": 1}})]
+        self.assertEqual(
+            plan_games(sweep(), done),
+            {"baseline": [11], "one_life": [10], "one_life_constant": [10, 11]},
+        )
+
+    def test_games_are_replayed_when_overrides_change(self):
+        lives = {"player": {"lives": 2}}
+        done = [result("one_life", 10, lives), result("one_life", 11, lives)]
+        self.assertEqual(plan_games(sweep(), done)["one_life"], [10, 11])
+
+    def test_torn_last_line_is_ignored(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.jsonl")
+            with open(path, "w") as f:
+                f.write(json.dumps(result("baseline", 10, {})) + "\n")
+                f.write('{"config": "base')
+            self.assertEqual(len(load_results(path)), 1)
+
+    def test_unknown_constants_are_rejected(self):
+        with self.assertRaises(ValueError):
+            _apply_overrides({"PLAYER_LIVEZ": 1})
+
+    def test_lowercase_entries_are_config_sections(self):
+        self.assertEqual(_apply_overrides({"player": {"lives": 1}}), {"player": {"lives": 1}})
+
+    def test_summary_has_one_row_per_config(self):
+        rows = summarize([
+            result("baseline", 1, {}, score=100),
+            result("fast", 1, {}, score=300, game_over=True, peak_asteroids=9),
+            result("baseline", 2, {}, score=200),
+        ])
+        self.assertEqual([row["config"] for row in rows], ["baseline", "fast"])
+        self.assertEqual(rows[0]["games"], 2)
+        self.assertEqual(rows[0]["score_mean"], 150)
+        self.assertEqual(rows[1]["game_over_rate"], 1.0)
+        self.assertEqual(rows[1]["peak_asteroids"], 9)
+
+
+class TestRunSweep(unittest.TestCase):
+
+    def test_workers_apply_overrides_and_a_rerun_resumes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.jsonl")
+            self.assertEqual(run_sweep(sweep(), path, workers=2, chunk=1), 6)
+            lives = {(game["config"], game["seed"]): game["lives"] for game in load_results(path)}
+            # a section override and the constant behind its default must agree
+            self.assertEqual(lives, {
+                ("baseline", 10): PLAYER_LIVES,
+                ("baseline", 11): PLAYER_LIVES,
+                ("one_life", 10): 1,
+                ("one_life", 11): 1,
+                ("one_life_constant", 10): 1,
+                ("one_life_constant", 11): 1,
+            })
+            self.assertEqual(run_sweep(sweep(), path, workers=2), 0)
+            self.assertEqual(run_sweep(sweep(games=3), path, workers=2), 3)
+
+    def test_constant_overrides_reach_the_game(self):
+        spec = sweep(configs={"baseline": {}, "fast_spawn": {"ASTEROID_SPAWN_RATE_SECONDS": 0.1}}, games=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.jsonl")
+            run_sweep(spec, path, workers=2, chunk=1)
+            rocks = {game["config"]: game["peak_asteroids"] for game in load_results(path)}
+        # half a second of play: nothing at the default rate, one rock per 0.1s when overridden
+        self.assertEqual(rocks["baseline"], 0)
+        self.assertGreaterEqual(rocks["fast_spawn"], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
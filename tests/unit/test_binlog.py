@@ -0,0 +1,147 @@
+import json
+import os
+import tempfile
+import unittest
+from util.binlog import (
+    EVENT_TYPES,
+    EventCodec,
+    StateCodec,
+    binary_to_jsonl,
+    iter_records,
+    jsonl_to_binary,
+    read_header,
+    read_records,
+)
+from util.entity_store import numpy_available
+from util.logger import configure_logging, flush_logs, log_score_added
+
+EVENTS = [
+    {"timestamp": "18:05:43.001", "elapsed_s": 0, "frame": 12, "type": "asteroid_shot"},
+    {"timestamp": "18:05:43.001", "elapsed_s": 0, "frame": 12, "type": "score_added", "score": 450, "multiplier": 3},
+    {"timestamp": "18:05:44.250", "elapsed_s": 1, "frame": 87, "type": "combo_reset", "multiplier": 1},
+    {"timestamp": "18:05:45.999", "elapsed_s": 2, "frame": 130, "type": "player_hit"},
+]
+STATES = [
+    {
+        "timestamp": "18:05:43.001",
+        "elapsed_s": 0,
+        "frame": 60,
+        "asteroids": {
+            "count": 2,
+            "sprites": [
+                {"type": "Asteroid", "pos": [-46.5, 385.98], "vel": [73.61, -42.5], "rad": 40},
+                {"type": "Asteroid", "pos": [10.25, 20.5], "vel": [0.0, 1.5], "rad": 20},
+            ],
+        },
+        "player": {"type": "Player", "pos": [640.0, 360.0], "vel": [0.0, 0.0], "rad": 20, "rot": 12.5},
+    },
+    {
+        "timestamp": "18:05:44.001",
+        "elapsed_s": 1,
+        "frame": 120,
+        "shots": {"count": 1, "sprites": [{"type": "Shot", "pos": [1.0, 2.0], "vel": [0.0, 500.0], "rad": 5}]},
+        "player": {"type": "Player", "pos": [641.0, 360.0], "vel": [0.0, 0.0], "rad": 20, "rot": 0},
+    },
+]
+
+
+class BinlogTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def write_jsonl(self, name, entries):
+        path = self.path(name)
+        with open(path, "w") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+        return path
+
+    def read_jsonl(self, path):
+        with open(path) as f:
+            return [json.loads(line) for line in f]
+
+
+class TestBinaryWriter(BinlogTestCase):
+
+    def test_header_describes_the_records(self):
+        path = self.path("events.bin")
+        codec = EventCodec(start_time=0.0)
+        with open(path, "wb") as f:
+            f.write(codec.header())
+            f.write(codec.encode(3600.0, 5, ("score_added", {"score": 10, "multiplier": 2})))
+        schema, offset = read_header(path)
+        self.assertEqual(schema["kind"], "events")
+        self.assertEqual(schema["types"], list(EVENT_TYPES))
+        self.assertEqual(offset % 8, 0)
+        self.assertEqual(os.path.getsize(path) - offset, codec._struct.size)
+
+    def test_records_are_fixed_width(self):
+        codec = StateCodec(start_time=0.0)
+        one = codec.encode_at(0.0, 0.0, 1, {"shots": STATES[1]["shots"]})
+        both = codec.encode_at(0.0, 0.0, 1, {"asteroids": STATES[0]["asteroids"]})
+        self.assertEqual(len(both), 2 * len(one))
+
+    def test_non_sprite_providers_are_skipped(self):
+        codec = StateCodec(start_time=0.0)
+        self.assertEqual(codec.encode_at(0.0, 0.0, 1, {"screen_size": [1280, 720]}), b"")
+
+
+@unittest.skipUnless(numpy_available(), "numpy is not installed")
+class TestBinaryReader(BinlogTestCase):
+
+    def test_events_round_trip_through_jsonl(self):
+        source = self.write_jsonl("events.jsonl", EVENTS)
+        binary = self.path("events.bin")
+        back = self.path("events_back.jsonl")
+        jsonl_to_binary(source, binary, "events")
+        binary_to_jsonl(binary, back)
+        self.assertEqual(self.read_jsonl(back), EVENTS)
+
+    def test_state_round_trips_through_jsonl(self):
+        source = self.write_jsonl("state.jsonl", STATES)
+        binary = self.path("state.bin")
+        back = self.path("state_back.jsonl")
+        jsonl_to_binary(source, binary, "state")
+        binary_to_jsonl(binary, back)
+        self.assertEqual(self.read_jsonl(back), STATES)
+
+    def test_reader_yields_record_arrays(self):
+        source = self.write_jsonl("events.jsonl", EVENTS * 5)
+        binary = self.path("events.bin")
+        jsonl_to_binary(source, binary, "events")
+
+        schema, records = read_records(binary)
+
+        self.assertEqual(len(records), 20)
+        score_added = schema["types"].index("score_added")
+        self.assertEqual(records.score[records.type == score_added].tolist(), [450] * 5)
+        self.assertEqual([len(chunk) for chunk in iter_records(binary, chunk_size=8)], [8, 8, 4])
+
+    def test_logger_writes_binary_events(self):
+        path = self.path("live.bin")
+        # the conftest fixture switches logging back afterwards
+        configure_logging(event_path=path, log_format="binary")
+        log_score_added(150, 2)
+        flush_logs()
+        schema, records = read_records(path)
+        self.assertEqual(len(records), 1)
+        self.assertEqual(schema["types"][records.type[0]], "score_added")
+        self.assertEqual((records.score[0], records.multiplier[0]), (150, 2))
+
+    def test_empty_file_reads_as_no_records(self):
+        path = self.path("empty.bin")
+        with open(path, "wb") as f:
+            f.write(EventCodec(0.0).header())
+        _, records = read_records(path)
+        self.assertEqual(len(records), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
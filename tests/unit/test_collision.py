@@ -0,0 +1,184 @@
+import random
+import unittest
+import pygame
+from classes.asteroid import Asteroid
+from classes.shot import Shot
+from classes.simulation import Simulation, init_headless
+from util.collision import circle_hits, circle_pairs, shot_time_of_impact, swept_circle_hit
+from util.constants import (
+    ASTEROID_MIN_RADIUS,
+    PLAYER_SHOOT_SPEED,
+    SCORE_SMALL_ASTEROID,
+    SHOT_RADIUS,
+    SIMULATION_DT,
+)
+from util.entity_store import EntityStore, KIND_ASTEROID, KIND_SHOT, numpy_available
+
+
+class TestCollidesWith(unittest.TestCase):
+
+    def test_radius_sum_is_used_both_ways(self):
+        rock = Asteroid(100, 100, ASTEROID_MIN_RADIUS)
+        shot = Shot(100 + ASTEROID_MIN_RADIUS + 3, 100, SHOT_RADIUS)
+        self.assertTrue(rock.collides_with(shot))
+        self.assertTrue(shot.collides_with(rock))
+
+    def test_touching_circles_do_not_collide(self):
+        rock = Asteroid(0, 0, ASTEROID_MIN_RADIUS)
+        shot = Shot(ASTEROID_MIN_RADIUS + SHOT_RADIUS, 0, SHOT_RADIUS)
+        self.assertFalse(rock.collides_with(shot))
+
+
+@unittest.skipUnless(numpy_available(), "numpy is not installed")
+class TestBatchKernels(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(11)
+        self.rocks = [Asteroid(rng.uniform(0, 400), rng.uniform(0, 400), rng.choice((20, 40, 60))) for _ in range(30)]
+        self.shots = [Shot(rng.uniform(0, 400), rng.uniform(0, 400), SHOT_RADIUS) for _ in range(15)]
+
+    @staticmethod
+    def arrays(shapes):
+        import numpy as np
+        return (
+            np.array([tuple(shape.position) for shape in shapes]),
+            np.array([shape.radius for shape in shapes], dtype=float),
+        )
+
+    def test_one_against_many_matches_collides_with(self):
+        positions, radii = self.arrays(self.rocks)
+        shot = self.shots[0]
+        expected = [i for i, rock in enumerate(self.rocks) if shot.collides_with(rock)]
+        self.assertEqual(circle_hits(shot.position, shot.radius, positions, radii).tolist(), expected)
+
+    def test_set_against_set_matches_collides_with(self):
+        rows, columns = circle_pairs(*self.arrays(self.rocks), *self.arrays(self.shots))
+        expected = [
+            (i, j)
+            for i, rock in enumerate(self.rocks)
+            for j, shot in enumerate(self.shots)
+            if rock.collides_with(shot)
+        ]
+        self.assertTrue(expected)
+        self.assertEqual(list(zip(rows.tolist(), columns.tolist())), expected)
+
+
+class TestSweptCircleHit(unittest.TestCase):
+
+    def test_point_starting_inside_hits_at_zero(self):
+        self.assertEqual(swept_circle_hit(1, 1, 50, 0, 5), 0.0)
+
+    def test_segment_crossing_the_circle_reports_entry_time(self):
+        self.assertAlmostEqual(swept_circle_hit(-20, 0, 40, 0, 10), 0.25)
+
+    def test_misses(self):
+        self.assertIsNone(swept_circle_hit(-20, 11, 40, 0, 10))  # passes beside
+        self.assertIsNone(swept_circle_hit(-40, 0, 10, 0, 10))   # stops short
+        self.assertIsNone(swept_circle_hit(20, 0, 40, 0, 10))    # moving away
+        self.assertIsNone(swept_circle_hit(20, 0, 0, 0, 10))     # stationary
+
+
+class TestShotTimeOfImpact(unittest.TestCase):
+
+    def test_fast_shot_cannot_tunnel_through_a_small_rock(self):
+        dt = 0.2
+        rock = Asteroid(100, 100, ASTEROID_MIN_RADIUS)
+        # 100 px per step: fired from 50 px left of the rock, now 50 px right;
+        # the circles touch once the shot is 25 px from the centre
+        shot = Shot(150, 100, SHOT_RADIUS)
+        shot.velocity = pygame.Vector2(PLAYER_SHOOT_SPEED, 0)
+        shot.age = 1.0
+        self.assertFalse(rock.collides_with(shot))
+        self.assertAlmostEqual(shot_time_of_impact(rock, shot, dt), 0.05)
+
+    def test_rock_motion_is_taken_into_account(self):
+        rock = Asteroid(100, 100, ASTEROID_MIN_RADIUS)
+        rock.velocity = pygame.Vector2(0, 500)
+        shot = Shot(100, 40, SHOT_RADIUS)
+        shot.age = 1.0
+        # the rock swept up through the resting shot during the step
+        self.assertIsNotNone(shot_time_of_impact(rock, shot, 0.2))
+        self.assertFalse(rock.collides_with(shot))
+
+    def test_shot_fired_this_step_has_not_moved(self):
+        rock = Asteroid(100, 100, ASTEROID_MIN_RADIUS)
+        shot = Shot(150, 100, SHOT_RADIUS)
+        shot.velocity = pygame.Vector2(PLAYER_SHOOT_SPEED, 0)
+        self.assertIsNone(shot_time_of_impact(rock, shot, 0.2))
+
+
+class TestCoarseStepHits(unittest.TestCase):
+    use_entity_store = False
+
+    @classmethod
+    def setUpClass(cls):
+        init_headless()
+
+    def test_hit_registers_at_a_coarse_step(self):
+        random.seed(3)
+        simulation = Simulation(use_entity_store=self.use_entity_store)
+        simulation.player.position.update(-10000, -10000)
+        simulation.asteroid_pool.acquire(400, 400, ASTEROID_MIN_RADIUS)
+        shot = simulation.shot_pool.acquire(340, 400, SHOT_RADIUS)
+        shot.velocity = pygame.Vector2(PLAYER_SHOOT_SPEED, 0)
+        shot.age = 1.0
+        # one 0.25 s step moves the shot 125 px, clean past the rock
+        simulation.step(0.25)
+        self.assertEqual(simulation.score_manager.get_current_score(), SCORE_SMALL_ASTEROID)
+
+
+
+@unittest.skipUnless(numpy_available(), "numpy is not installed")
+class TestCollisionPaths(unittest.TestCase):
+
+    def test_batched_and_hashed_candidates_agree(self):
+        init_headless()
+        random.seed(9)
+        simulation = Simulation(use_entity_store=False)
+        rng = random.Random(9)
+        checked = 0
+        for _ in range(300):
+            for _ in range(3):
+                shot = simulation.shot_pool.acquire(rng.uniform(0, 1280), rng.uniform(0, 720), SHOT_RADIUS)
+                shot.velocity = pygame.Vector2(0, PLAYER_SHOOT_SPEED).rotate(rng.uniform(0, 360))
+                shot.age = rng.choice((0.0, 1.0))
+            simulation.player.position.update(rng.uniform(0, 1280), rng.uniform(0, 720))
+            rocks = simulation.asteroids.sprites()
+            batched = simulation._batched_hits(rocks, SIMULATION_DT)
+            hashed = simulation._hashed_hits(rocks, SIMULATION_DT)
+            self.assertEqual(set(batched[0]), set(hashed[0]))
+            for rock in rocks:
+                confirmed = [
+                    shot for shot in hashed[1].get(rock, ())
+                    if shot_time_of_impact(rock, shot, SIMULATION_DT) is not None
+                ]
+                self.assertEqual(set(batched[1].get(rock, [])), set(confirmed))
+                checked += len(confirmed)
+            simulation.step(SIMULATION_DT)
+        self.assertGreater(checked, 0)
+
+
+@unittest.skipUnless(numpy_available(), "numpy is not installed")
+class TestCoarseStepHitsWithStore(TestCoarseStepHits):
+    use_entity_store = True
+
+
+@unittest.skipUnless(numpy_available(), "numpy is not installed")
+class TestSweptCollisionMask(unittest.TestCase):
+
+    def test_swept_mask_catches_tunnelling(self):
+        store = EntityStore(capacity=4)
+        rock = store.allocate(KIND_ASTEROID)
+        store.position[rock] = (100, 100)
+        store.radius[rock] = ASTEROID_MIN_RADIUS
+        shot = store.allocate(KIND_SHOT)
+        store.position[shot] = (150, 100)
+        store.velocity[shot] = (PLAYER_SHOOT_SPEED, 0)
+        store.age[shot] = 1.0
+        self.assertFalse(store.collision_mask(KIND_ASTEROID, KIND_SHOT)[2].any())
+        self.assertTrue(store.collision_mask(KIND_ASTEROID, KIND_SHOT, dt=0.2)[2].all())
+        self.assertFalse(store.collision_mask(KIND_ASTEROID, KIND_SHOT, dt=0.05)[2].any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+import pygame
+from classes.asteroid import Asteroid
+from classes.asteroidfield import AsteroidField
+from classes.player import Player
+from classes.score_manager import ScoreManager
+from classes.simulation import Simulation, init_headless
+from score_display import ScoreDisplay
+from util.config import DEFAULT_CONFIG, GameConfig, load_config
+from util.constants import (
+    ASTEROID_MIN_RADIUS,
+    COMBO_WINDOW_SECONDS,
+    PLAYER_LIVES,
+    PLAYER_SPEED,
+    SCORE_COLOR,
+    SCORE_LARGE_ASTEROID,
+    SCORE_MEDIUM_ASTEROID,
+    SCORE_SMALL_ASTEROID,
+)
+from util.entity_store import numpy_available
+
+
+class TestLoadConfig(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def write(self, name, text):
+        path = os.path.join(self.directory.name, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+    def test_defaults_match_constants(self):
+        config = load_config(environ={})
+        self.assertEqual(config, GameConfig())
+        self.assertEqual(config.player.speed, PLAYER_SPEED)
+        self.assertEqual(config.player.lives, PLAYER_LIVES)
+        self.assertEqual(config.score.combo_window_seconds, COMBO_WINDOW_SECONDS)
+        self.assertEqual(config.display.score_color, SCORE_COLOR)
+
+    def test_toml_file(self):
+        path = self.write("game.toml", "[player]\nspeed = 250\n\n[display]\nscore_color = [1, 2, 3]\n")
+        config = load_config(path, environ={})
+        self.assertEqual(config.player.speed, 250.0)
+        self.assertEqual(config.display.score_color, (1, 2, 3))
+        self.assertEqual(config.score, DEFAULT_CONFIG.score)
+
+    def test_json_file(self):
+        path = self.write("game.json", json.dumps({"asteroids": {"spawn_budget": None}}))
+        self.assertIsNone(load_config(path, environ={}).asteroids.spawn_budget)
+
+    def test_environment_overrides_the_file(self):
+        path = self.write("game.toml", "[player]\nlives = 5\n")
+        environ = {
+            "SPACEROCKS_PLAYER_LIVES": "7",
+            "SPACEROCKS_DISPLAY_COMBO_COLOR": "255,200,0",
+            "SPACEROCKS_ASTEROIDS_SPAWN_BUDGET": "none",
+        }
+        config = load_config(path, environ=environ)
+        self.assertEqual(config.player.lives, 7)
+        self.assertEqual(config.display.combo_color, (255, 200, 0))
+        self.assertIsNone(config.asteroids.spawn_budget)
+
+    def test_bad_values_are_rejected(self):
+        with self.assertRaises(ValueError):
+            DEFAULT_CONFIG.with_overrides({"player": {"sped": 1}})
+        with self.assertRaises(ValueError):
+            DEFAULT_CONFIG.with_overrides({"audio": {}})
+        with self.assertRaises(ValueError):
+            DEFAULT_CONFIG.with_overrides({"player": {"lives": 2.5}})
+        with self.assertRaises(ValueError):
+            DEFAULT_CONFIG.with_overrides({"display": {"lives_position": [1, 2, 3]}})
+
+
+class TestInjection(unittest.TestCase):
+
+    def test_player_uses_its_config(self):
+        config = DEFAULT_CONFIG.with_overrides({"player": {"speed": 100, "shoot_cooldown_seconds": 1.0}})
+        player = Player(0, 0, config.player)
+        player.move(1.0)
+        self.assertEqual(player.position, pygame.Vector2(0, 100))
+        Player.containers = ()
+        try:
+            player.shoot()
+        finally:
+            del Player.containers
+        self.assertEqual(player.shot_cooldown, 1.0)
+
+    def test_score_manager_uses_its_config_and_keeps_it_on_reset(self):
+        config = DEFAULT_CONFIG.with_overrides({"score": {
+            "small_asteroid": 7,
+            "combo_window_seconds": 0.5,
+            "high_score_file": os.path.join(tempfile.gettempdir(), "no-such-highscore.json"),
+        }})
+        manager = ScoreManager(config.score)
+        manager.add_score(ASTEROID_MIN_RADIUS)
+        self.assertEqual(manager.get_current_score(), 7)
+        manager.update(0.6)
+        self.assertEqual(manager.get_combo_multiplier(), 1)
+        manager.reset()
+        manager.add_score(ASTEROID_MIN_RADIUS)
+        self.assertEqual(manager.get_current_score(), 7)
+        self.assertEqual(ScoreManager().get_combo_multiplier(), 1)
+
+    def test_score_tiers_follow_the_configured_radii(self):
+        config = DEFAULT_CONFIG.with_overrides({"score": {
+            "small_asteroid_radius": 10,
+            "large_asteroid_radius": 30,
+            "high_score_file": os.path.join(tempfile.gettempdir(), "no-such-highscore.json"),
+        }})
+        manager = ScoreManager(config.score)
+        tiers = [manager._calculate_base_points(radius) for radius in (10, 20, 30)]
+        self.assertEqual(tiers, [SCORE_SMALL_ASTEROID, SCORE_MEDIUM_ASTEROID, SCORE_LARGE_ASTEROID])
+
+    def test_score_display_uses_its_config(self):
+        config = DEFAULT_CONFIG.with_overrides({"display": {"score_color": [0, 255, 0]}})
+        display = ScoreDisplay(config.display)
+        display.update_score(5)
+        screen = pygame.Surface((300, 200))
+        display.render_surface(screen)
+        screen.set_colorkey((0, 0, 0))
+        colors = {tuple(screen.get_at((x, y)))[:3] for x in range(0, 150) for y in range(10, 40)}
+        self.assertIn((0, 255, 0), colors)
+        self.assertNotIn(SCORE_COLOR, colors)
+
+    def test_asteroid_field_spawns_at_the_configured_rate(self):
+        config = DEFAULT_CONFIG.with_overrides({"asteroids": {"spawn_rate_seconds": 0.25}})
+        rocks = pygame.sprite.Group()
+        Asteroid.containers = (rocks,)
+        AsteroidField.containers = ()
+        try:
+            field = AsteroidField(rocks, config=config.asteroids)
+            for _ in range(10):
+                field.update(0.1)
+        finally:
+            del Asteroid.containers
+            del AsteroidField.containers
+        self.assertEqual(len(rocks), 4)
+
+    def test_two_configs_in_one_interpreter(self):
+        init_headless()
+        fast = DEFAULT_CONFIG.with_overrides({"player": {"lives": 1}, "score": {"small_asteroid": 1}})
+        results = []
+        for config in (DEFAULT_CONFIG, fast):
+            random.seed(2)
+            simulation = Simulation(use_entity_store=False, config=config)
+            simulation.player.position.update(-10000, -10000)
+            simulation.run(10)
+            results.append((simulation.lives, simulation.score_manager._small_points))
+        self.assertEqual(results, [(PLAYER_LIVES, SCORE_SMALL_ASTEROID), (1, 1)])
+
+    def test_two_simulations_stepped_side_by_side_stay_independent(self):
+        init_headless()
+        busy = DEFAULT_CONFIG.with_overrides({"asteroids": {"spawn_rate_seconds": 0.1}})
+        random.seed(2)
+        first = Simulation(use_entity_store=numpy_available(), particles=False, config=busy)
+        second = Simulation(use_entity_store=False, config=DEFAULT_CONFIG)
+        for simulation in (first, second):
+            simulation.player.position.update(-10000, -10000)
+        for _ in range(120):
+            first.step()
+            second.step()
+        first.player.shot_cooldown = 0
+        first.player.shoot()
+        self.assertGreater(len(first.asteroids), len(second.asteroids))
+        self.assertTrue(second.asteroids)
+        self.assertEqual(len(first.shots), 1)
+        self.assertEqual(len(second.shots), 0)
+        for group in ("asteroids", "shots", "updatable", "drawable"):
+            self.assertTrue(set(getattr(first, group)).isdisjoint(getattr(second, group)), group)
+        self.assertTrue(all(rock.particles is None for rock in first.asteroids))
+        self.assertTrue(all(rock.particles is second.particles for rock in second.asteroids))
+        self.assertTrue(all(type(rock) is Asteroid for rock in second.asteroids))
+        self.assertEqual(len(second.snapshot()["asteroids"]), len(second.asteroids))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import random
+import unittest
+import pygame
+from classes.asteroid import Asteroid
+from classes.asteroidfield import AsteroidField
+from classes.shot import Shot
+from classes.stored_shapes import StoredAsteroid, StoredShot
+from util.constants import (
+    CULL_MARGIN,
+    PLAYER_SHOOT_COOLDOWN_SECONDS,
+    PLAYER_SHOOT_SPEED,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SHOT_LIFETIME_SECONDS,
+    SHOT_RADIUS,
+)
+from util.culling import Culler
+from util.entity_store import EntityStore, KIND_ASTEROID, KIND_SHOT, numpy_available
+
+
+class GroupsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.updatable = pygame.sprite.Group()
+        self.asteroids = pygame.sprite.Group()
+        self.shots = pygame.sprite.Group()
+        Asteroid.containers = (self.asteroids, self.updatable)
+        Shot.containers = (self.shots, self.updatable)
+        AsteroidField.containers = self.updatable
+
+    def tearDown(self):
+        del Asteroid.containers
+        del Shot.containers
+        del AsteroidField.containers
+
+
+class TestCuller(GroupsTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.culler = Culler()
+
+    def test_sprite_on_spawn_line_is_kept(self):
+        rock = Asteroid(-CULL_MARGIN, SCREEN_HEIGHT / 2, 60)
+        self.assertEqual(self.culler.cull(self.asteroids), 0)
+        self.assertTrue(rock.alive())
+
+    def test_sprite_past_margin_is_killed(self):
+        rock = Asteroid(SCREEN_WIDTH + CULL_MARGIN + 1, 100, 20)
+        self.assertEqual(self.culler.cull(self.asteroids), 1)
+        self.assertFalse(rock.alive())
+        self.assertEqual(len(self.updatable), 0)
+
+    def test_expired_shot_is_killed(self):
+        shot = Shot(100, 100, SHOT_RADIUS)
+        shot.update(SHOT_LIFETIME_SECONDS + 0.01)
+        self.culler.cull(self.shots)
+        self.assertFalse(shot.alive())
+
+    def test_asteroids_have_no_lifetime(self):
+        rock = Asteroid(100, 100, 20)
+        rock.age = 1e9
+        self.culler.cull(self.asteroids)
+        self.assertTrue(rock.alive())
+
+    def test_counters_are_kept_per_type(self):
+        Asteroid(-1000, 0, 20)
+        Asteroid(0, -1000, 20)
+        Shot(5000, 0, SHOT_RADIUS)
+        self.culler.cull(self.asteroids)
+        self.culler.cull(self.shots)
+        self.assertEqual(self.culler.culled, {"Asteroid": 2, "Shot": 1})
+        self.assertEqual(self.culler.total_culled, 3)
+        self.culler.reset_counters()
+        self.assertEqual(self.culler.total_culled, 0)
+
+
+@unittest.skipUnless(numpy_available(), "numpy is not installed")
+class TestStoreCuller(unittest.TestCase):
+
+    def setUp(self):
+        self.store = EntityStore(capacity=4)
+        self.asteroids = pygame.sprite.Group()
+        self.shots = pygame.sprite.Group()
+        self.culler = Culler()
+
+    def test_matches_the_sprite_checks(self):
+        kept = StoredAsteroid(-CULL_MARGIN, SCREEN_HEIGHT / 2, 60, (self.asteroids,), store=self.store)
+        old = StoredAsteroid(100, 100, 20, (self.asteroids,), store=self.store)
+        old.age = 1e9
+        gone = StoredAsteroid(SCREEN_WIDTH + CULL_MARGIN + 1, 100, 20, (self.asteroids,), store=self.store)
+        shot = StoredShot(100, 100, SHOT_RADIUS, (self.shots,), store=self.store)
+        fresh = StoredShot(200, 100, SHOT_RADIUS, (self.shots,), store=self.store)
+        shot.age = SHOT_LIFETIME_SECONDS + 0.01
+        self.assertEqual(self.culler.cull_store(self.store, KIND_ASTEROID), 1)
+        self.assertEqual(self.culler.cull_store(self.store, KIND_SHOT, StoredShot.lifetime), 1)
+        self.assertEqual([kept.alive(), old.alive(), gone.alive()], [True, True, False])
+        self.assertEqual([shot.alive(), fresh.alive()], [False, True])
+        self.assertEqual(self.culler.culled, {"StoredAsteroid": 1, "StoredShot": 1})
+
+
+class TestCullingSoak(GroupsTestCase):
+
+    def test_group_sizes_stay_bounded_over_simulated_hour(self):
+        random.seed(7)
+        culler = Culler()
+        AsteroidField()
+        dt = 1 / 20
+        frames = int(60 * 60 / dt)
+        shot_cooldown = 0.0
+        peak_updatable = 0
+
+        for frame in range(frames):
+            shot_cooldown -= dt
+            if shot_cooldown <= 0:
+                shot_cooldown = PLAYER_SHOOT_COOLDOWN_SECONDS
+                shot = Shot(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, SHOT_RADIUS)
+                shot.velocity = pygame.Vector2(0, 1).rotate(frame) * PLAYER_SHOOT_SPEED
+            for entity in self.updatable:
+                entity.update(dt)
+            culler.cull(self.asteroids)
+            culler.cull(self.shots)
+            peak_updatable = max(peak_updatable, len(self.updatable))
+
+        self.assertGreater(culler.culled["Asteroid"], 4000)
+        self.assertGreater(culler.culled["Shot"], 10000)
+        self.assertLess(peak_updatable, 100)
+        self.assertLess(len(self.asteroids), 50)
+        self.assertLess(len(self.shots), 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
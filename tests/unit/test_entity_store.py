@@ -0,0 +1,173 @@
+import random
+import unittest
+from unittest import mock
+import pygame
+from classes.asteroid import Asteroid
+from classes.circleshape import CircleShape
+from classes.score_manager import ScoreManager
+from classes.stored_shapes import StoredAsteroid, StoredShot
+from util.constants import ASTEROID_MAX_RADIUS, ASTEROID_MIN_RADIUS, SCORE_LARGE_ASTEROID
+from util.entity_store import EntityStore, KIND_ASTEROID, KIND_SHOT, numpy_available
+
+@unittest.skipUnless(numpy_available(), "numpy is not installed")
+class TestEntityStore(unittest.TestCase):
+
+    def setUp(self):
+        self.store = EntityStore(capacity=4)
+
+    def test_integrate_moves_every_entity(self):
+        first = self.store.allocate(KIND_ASTEROID)
+        second = self.store.allocate(KIND_SHOT)
+        self.store.velocity[first] = (10, 0)
+        self.store.velocity[second] = (0, -20)
+        self.store.integrate(0.5)
+        self.assertEqual(self.store.position[first].tolist(), [5.0, 0.0])
+        self.assertEqual(self.store.position[second].tolist(), [0.0, -10.0])
+        self.assertEqual(self.store.age[first], 0.5)
+
+    def test_entities_allocated_during_a_step_wait_for_the_next_one(self):
+        old = self.store.allocate(KIND_ASTEROID)
+        self.store.velocity[old] = (10, 0)
+        self.store.begin_step()
+        new = self.store.allocate(KIND_SHOT)
+        self.store.velocity[new] = (0, 10)
+        self.store.integrate(0.5)
+        self.assertEqual(self.store.position[old].tolist(), [5.0, 0.0])
+        self.assertEqual(self.store.position[new].tolist(), [0.0, 0.0])
+        self.assertEqual(self.store.age[new], 0.0)
+        self.store.begin_step()
+        self.store.integrate(0.5)
+        self.assertEqual(self.store.position[new].tolist(), [0.0, 5.0])
+
+    def test_store_grows_when_full(self):
+        slots = [self.store.allocate(KIND_SHOT) for _ in range(10)]
+        self.assertEqual(len(set(slots)), 10)
+        self.assertGreaterEqual(self.store.capacity, 10)
+        self.assertEqual(len(self.store), 10)
+
+    def test_released_slot_is_reused_only_after_reclaim(self):
+        slot = self.store.allocate(KIND_SHOT)
+        self.store.release(slot)
+        self.assertEqual(len(self.store), 0)
+        self.assertNotEqual(self.store.allocate(KIND_SHOT), slot)
+        self.store.reclaim()
+        self.assertEqual(self.store.allocate(KIND_SHOT), slot)
+
+    def test_overlaps_match_collides_with(self):
+        shapes = []
+        for x, y, r, kind in [
+            (0, 0, 60, KIND_ASTEROID),
+            (300, 0, 20, KIND_ASTEROID),
+            (50, 0, 5, KIND_SHOT),
+            (310, 10, 5, KIND_SHOT),
+            (600, 600, 5, KIND_SHOT),
+        ]:
+            shape = CircleShape(x, y, r)
+            slot = self.store.allocate(kind, shape)
+            self.store.position[slot] = (x, y)
+            self.store.radius[slot] = r
+            shapes.append(shape)
+        rocks, shots = shapes[:2], shapes[2:]
+
+        overlaps = self.store.overlaps(KIND_ASTEROID, KIND_SHOT)
+
+        expected = {
+            rock: [shot for shot in shots if rock.collides_with(shot)] for rock in rocks
+        }
+        self.assertEqual(overlaps, expected)
+
+    def test_overlaps_in_chunks_match_the_full_mask(self):
+        import numpy as np
+        rng = random.Random(1)
+        store = EntityStore(capacity=8)
+        for kind, count, radius in ((KIND_ASTEROID, 60, 30), (KIND_SHOT, 40, 3)):
+            for _ in range(count):
+                slot = store.allocate(kind, object())
+                store.position[slot] = (rng.uniform(0, 400), rng.uniform(0, 400))
+                store.velocity[slot] = (rng.uniform(-300, 300), rng.uniform(-300, 300))
+                store.age[slot] = 1.0
+                store.radius[slot] = radius
+        slots_a, slots_b, mask = store.collision_mask(KIND_ASTEROID, KIND_SHOT, dt=0.1)
+        expected = {}
+        for row, column in zip(*np.nonzero(mask)):
+            expected.setdefault(store.owners[slots_a[row]], []).append(store.owners[slots_b[column]])
+        self.assertTrue(expected)
+        # 40 shots per row leaves 2 rows per chunk
+        with mock.patch("util.entity_store.ENTITY_STORE_CHUNK_PAIRS", 100):
+            self.assertEqual(store.overlaps(KIND_ASTEROID, KIND_SHOT, dt=0.1), expected)
+
+    def test_touching_finds_the_entities_under_a_circle(self):
+        near = self.store.allocate(KIND_ASTEROID, "near")
+        far = self.store.allocate(KIND_ASTEROID, "far")
+        shot = self.store.allocate(KIND_SHOT, "shot")
+        for slot, x in ((near, 30), (far, 300), (shot, 0)):
+            self.store.position[slot] = (x, 0)
+            self.store.radius[slot] = 20
+        self.assertEqual(self.store.touching(KIND_ASTEROID, pygame.Vector2(0, 0), 15), ["near"])
+
+    def test_collision_mask_with_no_shots_is_empty(self):
+        self.store.allocate(KIND_ASTEROID)
+        _, _, mask = self.store.collision_mask(KIND_ASTEROID, KIND_SHOT)
+        self.assertEqual(mask.shape, (1, 0))
+
+
+@unittest.skipUnless(numpy_available(), "numpy is not installed")
+class TestStoredShapes(unittest.TestCase):
+
+    def setUp(self):
+        self.store = EntityStore(capacity=4)
+        self.asteroids = pygame.sprite.Group()
+        StoredAsteroid.store = self.store
+        StoredShot.store = self.store
+        StoredAsteroid.containers = (self.asteroids,)
+
+    def tearDown(self):
+        StoredAsteroid.store = None
+        StoredShot.store = None
+        del StoredAsteroid.containers
+
+    def test_sprite_state_lives_in_the_store(self):
+        rock = StoredAsteroid(10, 20, ASTEROID_MAX_RADIUS)
+        rock.velocity = pygame.Vector2(4, 0)
+        self.store.integrate(0.5)
+        self.assertEqual(rock.position, pygame.Vector2(12, 20))
+        self.assertEqual(rock.radius, ASTEROID_MAX_RADIUS)
+
+    def test_split_creates_stored_children(self):
+        rock = StoredAsteroid(100, 100, ASTEROID_MAX_RADIUS)
+        rock.velocity = pygame.Vector2(50, 0)
+        rock.split()
+        children = self.asteroids.sprites()
+        self.assertEqual(len(children), 2)
+        for child in children:
+            self.assertIsInstance(child, StoredAsteroid)
+            self.assertEqual(child.radius, ASTEROID_MAX_RADIUS - ASTEROID_MIN_RADIUS)
+            self.assertEqual(child.position, pygame.Vector2(100, 100))
+        self.assertEqual(len(self.store), 2)
+
+    def test_killed_sprite_is_readable_until_reclaim(self):
+        rock = StoredAsteroid(100, 100, ASTEROID_MAX_RADIUS)
+        rock.split()
+        manager = ScoreManager()
+        manager.add_score(rock.radius)
+        self.assertEqual(manager.get_current_score(), SCORE_LARGE_ASTEROID)
+
+    def test_killing_twice_releases_slot_once(self):
+        rock = StoredAsteroid(0, 0, ASTEROID_MIN_RADIUS)
+        rock.kill()
+        rock.kill()
+        self.store.reclaim()
+        self.assertEqual(len(self.store._free), self.store.capacity)
+
+    def test_plain_asteroid_split_is_unchanged(self):
+        group = pygame.sprite.Group()
+        Asteroid.containers = (group,)
+        try:
+            Asteroid(0, 0, ASTEROID_MAX_RADIUS).split()
+            self.assertTrue(all(type(child) is Asteroid for child in group))
+        finally:
+            del Asteroid.containers
+
+
+if __name__ == '__main__':
+    unittest.main()
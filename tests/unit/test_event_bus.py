@@ -0,0 +1,91 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+from classes.simulation import Simulation, init_headless
+from util.constants import ASTEROID_MIN_RADIUS, SCORE_MEDIUM_ASTEROID, SCORE_SMALL_ASTEROID, SHOT_RADIUS
+from util.event_bus import ASTEROID_HIT, EventBus
+from util.logger import configure_logging, flush_logs
+
+
+class TestEventBus(unittest.TestCase):
+
+    def test_records_are_delivered_in_one_batch_at_dispatch(self):
+        bus = EventBus()
+        calls = []
+        bus.subscribe("hit", lambda records: calls.append(("first", list(records))))
+        bus.subscribe("hit", lambda records: calls.append(("second", list(records))))
+        bus.publish("hit", 1)
+        bus.publish("hit", 2)
+        self.assertEqual(calls, [])
+        bus.dispatch()
+        self.assertEqual(calls, [("first", [1, 2]), ("second", [1, 2])])
+        bus.dispatch()
+        self.assertEqual(len(calls), 2)
+
+    def test_unsubscribed_topics_are_dropped(self):
+        bus = EventBus()
+        bus.publish("nobody", 1)
+        bus.dispatch()
+        self.assertEqual(bus._pending, {})
+
+
+class TestSimulationHits(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        init_headless()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.event_path = os.path.join(self.tmp.name, "events.jsonl")
+        configure_logging(event_path=self.event_path, flush_interval=60, flush_size=10_000)
+        random.seed(3)
+        self.simulation = Simulation(use_entity_store=False, particles=False)
+        self.simulation.player.position.update(-10000, -10000)
+
+    def tearDown(self):
+        flush_logs()
+        self.tmp.cleanup()
+
+    def test_multi_kill_step_is_scored_and_logged_once(self):
+        batches = []
+        self.simulation.events.subscribe(ASTEROID_HIT, batches.append)
+        for x in (200, 400):
+            self.simulation.asteroid_pool.acquire(x, 500, ASTEROID_MIN_RADIUS)
+            self.simulation.shot_pool.acquire(x + 2, 500, SHOT_RADIUS)
+        self.simulation.step(0.0)
+        self.assertEqual([hit[0] for hit in batches[0]], [ASTEROID_MIN_RADIUS] * 2)
+        # the second hit of the combo scores double
+        self.assertEqual(self.simulation.score_manager.get_current_score(), SCORE_SMALL_ASTEROID * 3)
+        flush_logs()
+        with open(self.event_path) as f:
+            events = [json.loads(line) for line in f]
+        types = [event["type"] for event in events]
+        self.assertEqual(types, ["asteroid_shot", "asteroid_shot", "score_added"])
+        self.assertEqual(events[-1]["score"], SCORE_SMALL_ASTEROID * 3)
+        self.assertEqual(events[-1]["multiplier"], 3)
+
+    def test_two_shots_on_one_rock_split_and_score_it_once(self):
+        self.simulation.asteroid_pool.acquire(200, 500, ASTEROID_MIN_RADIUS * 2)
+        first = self.simulation.shot_pool.acquire(202, 500, SHOT_RADIUS)
+        second = self.simulation.shot_pool.acquire(198, 500, SHOT_RADIUS)
+        self.simulation.step(0.0)
+        self.assertEqual(self.simulation.score_manager.get_current_score(), SCORE_MEDIUM_ASTEROID)
+        self.assertEqual(len(self.simulation.asteroids), 2)
+        self.assertEqual([first.alive(), second.alive()].count(True), 1)
+        flush_logs()
+        with open(self.event_path) as f:
+            types = [json.loads(line)["type"] for line in f]
+        # the split follows the shot that caused it, and the score comes last
+        self.assertEqual(types, ["asteroid_shot", "asteroid_split", "score_added"])
+
+    def test_quiet_step_logs_nothing(self):
+        self.simulation.step(0.0)
+        flush_logs()
+        self.assertFalse(os.path.exists(self.event_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from classes.score_manager import ScoreManager
+from util.config import DEFAULT_CONFIG
+from util.constants import ASTEROID_MIN_RADIUS, SCORE_SMALL_ASTEROID
+from util.high_scores import HighScoreStore, atomic_write_json
+
+
+class TestAtomicWrite(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "highscore.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_replaces_the_file_and_leaves_no_temporaries(self):
+        atomic_write_json(self.path, {"high_score": 1})
+        atomic_write_json(self.path, {"high_score": 2})
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"high_score": 2})
+        self.assertEqual(os.listdir(self.tmp.name), ["highscore.json"])
+
+    def test_failed_write_keeps_the_old_file(self):
+        atomic_write_json(self.path, {"high_score": 1})
+        with self.assertRaises(TypeError):
+            atomic_write_json(self.path, {"high_score": object()})
+        with open(self.path) as f:
+            self.assertEqual(json.load(f), {"high_score": 1})
+        self.assertEqual(os.listdir(self.tmp.name), ["highscore.json"])
+
+
+class TestHighScoreStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = self.make_store()
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def make_store(self, size=3):
+        return HighScoreStore(
+            os.path.join(self.tmp.name, "highscore.json"),
+            os.path.join(self.tmp.name, "leaderboard.sqlite3"),
+            size,
+        )
+
+    def test_best_score_round_trips_through_the_file(self):
+        self.assertEqual(self.store.best(), 0)
+        self.store.save_best(500)
+        self.assertEqual(self.store.best(), 500)
+        self.store.flush()
+        self.assertEqual(self.make_store().best(), 500)
+
+    def test_corrupt_file_warns_instead_of_failing_silently(self):
+        with open(self.store.path, "w") as f:
+            f.write('{"high_sc')
+        with self.assertWarns(RuntimeWarning):
+            self.assertEqual(self.store.best(), 0)
+
+    def test_writes_happen_off_the_calling_thread(self):
+        threads = []
+        with mock.patch("util.high_scores.atomic_write_json", lambda *args: threads.append(threading.current_thread())):
+            self.store.save_best(10).result()
+        self.assertNotEqual(threads, [threading.current_thread()])
+
+    def test_failed_write_is_reported(self):
+        store = HighScoreStore(os.path.join(self.tmp.name, "missing", "highscore.json"))
+        with self.assertWarns(RuntimeWarning):
+            future = store.save_best(10)
+            store.flush()
+        self.assertIsInstance(future.exception(), OSError)
+        store.close()
+
+    def test_leaderboard_keeps_the_best_runs_and_ranks_scores(self):
+        ranks = [self.store.record(score, seed=score).result() for score in (300, 100, 500, 200)]
+        self.assertEqual(ranks, [1, 2, 1, 3])
+        top = self.store.top().result()
+        self.assertEqual([run["score"] for run in top], [500, 300, 200])
+        self.assertEqual(top[0]["seed"], 500)
+        self.assertIn("played_at", top[0])
+        self.assertEqual(self.store.rank(400).result(), 2)
+        self.assertEqual(self.store.rank(50).result(), 4)
+
+    def test_leaderboard_survives_reopening(self):
+        self.store.record(700, frames=60).result()
+        self.store.close()
+        reopened = self.make_store()
+        try:
+            self.assertEqual(reopened.top().result(), [{"score": 700, "played_at": mock.ANY, "frames": 60}])
+        finally:
+            reopened.close()
+
+
+class TestScoreManagerPersistence(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = DEFAULT_CONFIG.with_overrides({"score": {
+            "high_score_file": os.path.join(self.tmp.name, "highscore.json"),
+            "leaderboard_file": os.path.join(self.tmp.name, "leaderboard.sqlite3"),
+        }})
+        self.manager = ScoreManager(self.config.score)
+
+    def tearDown(self):
+        self.manager._store.close()
+        self.tmp.cleanup()
+
+    def test_new_high_score_is_saved_and_survives_reset(self):
+        self.manager.add_score(ASTEROID_MIN_RADIUS)
+        self.assertTrue(self.manager.check_and_save_high_score())
+        self.manager.reset()
+        self.assertEqual(self.manager.get_high_score(), SCORE_SMALL_ASTEROID)
+        self.manager._store.flush()
+        self.assertEqual(ScoreManager(self.config.score).get_high_score(), SCORE_SMALL_ASTEROID)
+
+    def test_record_run_returns_its_rank(self):
+        self.manager.add_score(ASTEROID_MIN_RADIUS)
+        self.assertEqual(self.manager.record_run(seed=1).result(), 1)
+        self.manager.reset()
+        self.assertEqual(self.manager.record_run(seed=2).result(), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import random
+import unittest
+import pygame
+from classes.player import Player
+from classes.simulation import Simulation, init_headless
+from util.constants import ASTEROID_MIN_RADIUS, SCREEN_WIDTH
+from util.input_provider import (
+    BOTS,
+    AimingBot,
+    IdleBot,
+    KeyboardInput,
+    ReplayInput,
+    SpinnerBot,
+)
+from util.replay import encode_keys
+
+
+class _Keys(dict):
+    def __getitem__(self, key):
+        return self.get(key, False)
+
+
+class TestProviders(unittest.TestCase):
+
+    def test_player_defaults_to_the_keyboard(self):
+        self.assertIsInstance(Player.read_keys, KeyboardInput)
+
+    def test_replay_input_plays_back_one_mask_per_call(self):
+        provider = ReplayInput([encode_keys(_Keys({pygame.K_w: True})), encode_keys(_Keys({pygame.K_a: True}))])
+        self.assertTrue(provider()[pygame.K_w])
+        keys = provider()
+        self.assertTrue(keys[pygame.K_a])
+        self.assertFalse(keys[pygame.K_w])
+        self.assertFalse(provider()[pygame.K_a])
+
+    def test_scripted_bots(self):
+        self.assertFalse(any(IdleBot()()[key] for key in (pygame.K_a, pygame.K_d, pygame.K_SPACE)))
+        keys = SpinnerBot()()
+        self.assertTrue(keys[pygame.K_d] and keys[pygame.K_SPACE])
+        self.assertEqual(set(BOTS), {"idle", "spinner", "aimer"})
+
+
+class TestAimingBot(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        init_headless()
+
+    def simulation(self, wrap=False):
+        random.seed(1)
+        simulation = Simulation(use_entity_store=False, particles=False, wrap=wrap)
+        for rock in simulation.asteroids:
+            rock.kill()
+        return simulation
+
+    def test_turns_towards_the_nearest_rock_and_fires_when_lined_up(self):
+        simulation = self.simulation()
+        player = simulation.player
+        bot = AimingBot(simulation)
+        self.assertIsNone(bot.target())
+        # the ship faces +y; a rock straight ahead needs no turn
+        simulation.asteroid_pool.acquire(player.position.x, player.position.y + 200, ASTEROID_MIN_RADIUS)
+        simulation.asteroid_pool.acquire(player.position.x - 300, player.position.y, ASTEROID_MIN_RADIUS)
+        keys = bot()
+        self.assertTrue(keys[pygame.K_SPACE])
+        self.assertFalse(keys[pygame.K_a] or keys[pygame.K_d])
+        player.rotation = 90
+        keys = bot()
+        self.assertFalse(keys[pygame.K_SPACE])
+        self.assertTrue(keys[pygame.K_a])
+
+    def test_aims_across_the_edge_when_wrapping(self):
+        simulation = self.simulation(wrap=True)
+        player = simulation.player
+        player.position.update(10, 300)
+        simulation.asteroid_pool.acquire(SCREEN_WIDTH - 10, 300, ASTEROID_MIN_RADIUS)
+        self.assertEqual(AimingBot(simulation).target(), pygame.Vector2(-20, 0))
+
+    def test_bot_drives_a_reproducible_game(self):
+        scores = []
+        for _ in range(2):
+            random.seed(4)
+            simulation = Simulation(use_entity_store=False, particles=False)
+            simulation.player.set_input(AimingBot(simulation))
+            scores.append(simulation.run(300)["score"])
+        self.assertGreater(scores[0], 0)
+        self.assertEqual(scores[0], scores[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+import pygame
+from classes.asteroid import Asteroid
+from classes.player import Player
+from util import logger
+from util.constants import SNAPSHOT_SPRITE_LIMIT
+from util.logger import (
+    clear_snapshot_providers,
+    configure_logging,
+    configure_snapshots,
+    flush_logs,
+    log_event,
+    log_score_added,
+    log_state,
+    register_snapshot_entity,
+    register_snapshot_group,
+    register_snapshot_provider,
+)
+
+
+class LogFilesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.event_path = os.path.join(self.tmp.name, "events.jsonl")
+        self.state_path = os.path.join(self.tmp.name, "state.jsonl")
+        configure_logging(
+            state_path=self.state_path,
+            event_path=self.event_path,
+            flush_interval=60,
+            flush_size=10_000,
+        )
+
+    def tearDown(self):
+        # the conftest fixture restores the destinations and buffering
+        flush_logs()
+        self.tmp.cleanup()
+
+    def read_events(self):
+        if not os.path.exists(self.event_path):
+            return []
+        with open(self.event_path) as f:
+            return [json.loads(line) for line in f]
+
+
+class TestBufferedEventLog(LogFilesTestCase):
+
+    def test_events_are_buffered_until_flush(self):
+        log = logger._BufferedLog(self.event_path, logger._JsonlCodec(logger._format_event))
+        log.flush_interval = 60
+        log.append(("asteroid_shot", {}))
+        self.assertEqual(self.read_events(), [])
+        log.flush()
+        self.assertEqual([e["type"] for e in self.read_events()], ["asteroid_shot"])
+
+    def test_event_format_is_unchanged(self):
+        log_score_added(150, 2)
+        flush_logs()
+        (event,) = self.read_events()
+        self.assertEqual(
+            list(event), ["timestamp", "elapsed_s", "frame", "type", "score", "multiplier"]
+        )
+        self.assertEqual(event["type"], "score_added")
+        self.assertEqual((event["score"], event["multiplier"]), (150, 2))
+        self.assertRegex(event["timestamp"], r"^\d\d:\d\d:\d\d\.\d{3}$")
+
+    def test_flushes_append_in_order(self):
+        for i in range(5):
+            log_event("tick", index=i)
+            flush_logs()
+        self.assertEqual([e["index"] for e in self.read_events()], list(range(5)))
+
+    def test_full_buffer_wakes_the_writer(self):
+        configure_logging(flush_size=3)
+        for i in range(3):
+            log_event("tick", index=i)
+        deadline = time.time() + 2
+        while len(self.read_events()) < 3 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(len(self.read_events()), 3)
+
+
+
+class TestSnapshots(LogFilesTestCase):
+
+    def setUp(self):
+        super().setUp()
+        clear_snapshot_providers()
+        configure_snapshots(interval_frames=1, max_seconds=0, sprite_limit=0)
+
+    def tearDown(self):
+        clear_snapshot_providers()
+        super().tearDown()
+
+    def read_states(self):
+        flush_logs()
+        with open(self.state_path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_registered_group_is_serialized_in_full(self):
+        group = pygame.sprite.Group()
+        for i in range(25):
+            rock = Asteroid(i, 2 * i, 20)
+            rock.velocity.update(1.234, -5)
+            group.add(rock)
+        register_snapshot_group("asteroids", group)
+
+        log_state()
+
+        (state,) = self.read_states()
+        self.assertEqual(state["asteroids"]["count"], 25)
+        self.assertEqual(len(state["asteroids"]["sprites"]), 25)
+        self.assertEqual(
+            state["asteroids"]["sprites"][3],
+            {"type": "Asteroid", "pos": [3.0, 6.0], "vel": [1.23, -5.0], "rad": 20},
+        )
+
+    def test_sprite_limit_is_configurable(self):
+        group = pygame.sprite.Group(*[Asteroid(0, 0, 20) for _ in range(5)])
+        register_snapshot_group("asteroids", group)
+        configure_snapshots(sprite_limit=2)
+        log_state()
+        (state,) = self.read_states()
+        self.assertEqual(state["asteroids"]["count"], 5)
+        self.assertEqual(len(state["asteroids"]["sprites"]), 2)
+
+    def test_default_sprite_limit_keeps_snapshots_small(self):
+        group = pygame.sprite.Group(*[Asteroid(0, 0, 20) for _ in range(SNAPSHOT_SPRITE_LIMIT * 3)])
+        register_snapshot_group("asteroids", group)
+        configure_snapshots(sprite_limit=SNAPSHOT_SPRITE_LIMIT)
+        log_state()
+        (state,) = self.read_states()
+        self.assertEqual(len(state["asteroids"]["sprites"]), SNAPSHOT_SPRITE_LIMIT)
+
+    def test_disabled_snapshots_are_never_built(self):
+        calls = []
+        register_snapshot_provider("constant", lambda: calls.append(1))
+        configure_snapshots(enabled=False)
+        for _ in range(3):
+            log_state()
+        flush_logs()
+        self.assertEqual(calls, [])
+        self.assertFalse(os.path.exists(self.state_path))
+
+    def test_entities_and_providers(self):
+        player = Player(10, 20)
+        player.rotation = 45.678
+        register_snapshot_entity("player", player)
+        register_snapshot_provider("screen_size", lambda: [1280, 720])
+        log_state()
+        (state,) = self.read_states()
+        self.assertEqual(state["player"]["rot"], 45.68)
+        self.assertEqual(state["player"]["type"], "Player")
+        self.assertEqual(state["screen_size"], [1280, 720])
+
+    def test_interval_controls_cadence(self):
+        register_snapshot_provider("constant", lambda: 1)
+        configure_snapshots(interval_frames=3)
+        for _ in range(9):
+            log_state()
+        self.assertEqual(len(self.read_states()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
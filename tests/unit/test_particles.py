@@ -0,0 +1,97 @@
+import random
+import unittest
+import pygame
+from classes.simulation import Simulation, init_headless
+from util.constants import (
+    ASTEROID_MIN_RADIUS,
+    PARTICLES_PER_PLAYER_HIT,
+    PARTICLES_PER_SPLIT,
+    PARTICLE_SIZE,
+    SHOT_RADIUS,
+)
+from util.entity_store import numpy_available
+from util.particles import ParticleSystem
+
+
+@unittest.skipUnless(numpy_available(), "numpy is not installed")
+class TestParticleSystem(unittest.TestCase):
+
+    def setUp(self):
+        self.particles = ParticleSystem(capacity=10, seed=1)
+
+    def test_particles_move_and_expire(self):
+        self.particles.emit(100, 100, 4, velocity=(50, 0), speed=0, lifetime=1.0)
+        self.assertEqual(len(self.particles), 4)
+        self.particles.update(0.1)
+        self.assertAlmostEqual(float(self.particles.position[0, 0]), 105.0)
+        self.particles.update(1.0)
+        self.assertEqual(len(self.particles), 0)
+
+    def test_full_system_overwrites_the_oldest(self):
+        self.particles.emit(0, 0, 8, lifetime=10.0)
+        self.particles.update(0.5)
+        self.particles.emit(0, 0, 5, lifetime=10.0)
+        self.assertEqual(len(self.particles), 10)
+        self.assertEqual(self.particles.evicted, 3)
+        self.assertEqual(self.particles.emitted, 13)
+        # slots 0-2 held the first burst's oldest particles and are young again
+        self.assertEqual(self.particles.age[:3].tolist(), [0.0, 0.0, 0.0])
+        self.assertEqual(self.particles.age[3:8].tolist(), [0.5] * 5)
+
+    def test_idle_system_skips_the_update(self):
+        self.particles.emit(0, 0, 2, velocity=(10, 0), lifetime=0.1)
+        self.particles.update(1.0)
+        position = self.particles.position.copy()
+        self.particles.update(1.0)
+        self.assertEqual(self.particles.position.tolist(), position.tolist())
+
+    def test_game_random_stream_is_untouched(self):
+        state = random.getstate()
+        self.particles.emit(0, 0, 5)
+        self.assertEqual(random.getstate(), state)
+
+    def test_draw_fades_and_reports_a_dirty_rect(self):
+        screen = pygame.Surface((200, 200), depth=32)
+        self.particles.emit(50, 60, 1, speed=0, color=(200, 100, 0))
+        self.particles.emit(-50, 60, 1, speed=0)
+        self.particles.lifetime[0] = 1.0
+        self.particles.age[0] = 0.5
+        dirty = []
+        self.assertEqual(self.particles.draw(screen, dirty), 1)
+        self.assertEqual(tuple(screen.get_at((50, 60)))[:3], (100, 50, 0))
+        self.assertEqual(tuple(screen.get_at((49, 60)))[:3], (0, 0, 0))
+        self.assertEqual(dirty, [pygame.Rect(50, 60, PARTICLE_SIZE, PARTICLE_SIZE)])
+
+
+@unittest.skipUnless(numpy_available(), "numpy is not installed")
+class TestSimulationParticles(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        init_headless()
+
+    def setUp(self):
+        random.seed(3)
+        self.simulation = Simulation(use_entity_store=False)
+        self.simulation.player.position.update(-10000, -10000)
+
+    def test_split_bursts(self):
+        self.simulation.asteroid_pool.acquire(400, 400, ASTEROID_MIN_RADIUS * 2)
+        self.simulation.shot_pool.acquire(405, 400, SHOT_RADIUS)
+        self.simulation.step(0.0)
+        self.assertEqual(len(self.simulation.particles), PARTICLES_PER_SPLIT * 2)
+
+    def test_player_hit_bursts(self):
+        self.simulation.player.position.update(400, 400)
+        self.simulation.asteroid_pool.acquire(400, 400, ASTEROID_MIN_RADIUS)
+        self.simulation.step(0.0)
+        self.assertEqual(len(self.simulation.particles), PARTICLES_PER_PLAYER_HIT)
+
+    def test_particles_can_be_turned_off(self):
+        simulation = Simulation(use_entity_store=False, particles=False)
+        self.assertIsNone(simulation.particles)
+        self.assertIsNone(simulation.asteroid_pool.acquire(0, 0, ASTEROID_MIN_RADIUS).particles)
+
+
+if __name__ == '__main__':
+    unittest.main()
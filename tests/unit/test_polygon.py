@@ -0,0 +1,184 @@
+import math
+import random
+import unittest
+import pygame
+from classes.asteroid import Asteroid
+from classes.player import Player, SHIP_REACH
+from classes.simulation import Simulation, init_headless
+from util.constants import (
+    ASTEROID_LUMPINESS,
+    ASTEROID_MAX_RADIUS,
+    ASTEROID_MIN_RADIUS,
+    ASTEROID_OUTLINE_VARIANTS,
+    PLAYER_LIVES,
+    PLAYER_RADIUS,
+    PLAYER_SHOOT_SPEED,
+    SHOT_RADIUS,
+)
+from util.pool import ShapePool
+from util.polygon import (
+    capsule_overlaps_polygon,
+    circle_overlaps_polygon,
+    lumpy_outline,
+    outline_variants,
+    point_in_polygon,
+    polygons_overlap,
+    translate,
+)
+
+# a "C" opening to the right: the notch between y = -2 and y = 2 is outside
+NOTCHED = ((-4, -4), (4, -4), (4, -2), (-2, -2), (-2, 2), (4, 2), (4, 4), (-4, 4))
+SQUARE = ((-1, -1), (1, -1), (1, 1), (-1, 1))
+
+
+class TestPolygonTests(unittest.TestCase):
+
+    def test_point_in_concave_polygon(self):
+        self.assertTrue(point_in_polygon(-3, 0, NOTCHED))
+        self.assertTrue(point_in_polygon(3, 3, NOTCHED))
+        self.assertFalse(point_in_polygon(2, 0, NOTCHED))
+        self.assertFalse(point_in_polygon(5, 0, NOTCHED))
+
+    def test_circle_in_the_notch_misses(self):
+        self.assertFalse(circle_overlaps_polygon(2, 0, 1.5, NOTCHED))
+        self.assertTrue(circle_overlaps_polygon(2, 0, 2.5, NOTCHED))
+        self.assertTrue(circle_overlaps_polygon(0, 0, 0.1, SQUARE))
+
+    def test_capsule_catches_a_path_through_the_polygon(self):
+        self.assertTrue(capsule_overlaps_polygon(-10, 0, 10, 0, 0.5, SQUARE))
+        self.assertFalse(capsule_overlaps_polygon(-10, 3, 10, 3, 0.5, SQUARE))
+        # the notch of the C is open to the right
+        self.assertFalse(capsule_overlaps_polygon(10, 0, 1, 0, 0.5, NOTCHED))
+        self.assertTrue(capsule_overlaps_polygon(10, 0, -3, 0, 0.5, NOTCHED))
+
+    def test_polygons_overlap(self):
+        self.assertTrue(polygons_overlap(NOTCHED, translate(SQUARE, 4, 3)))
+        self.assertTrue(polygons_overlap(NOTCHED, translate(SQUARE, -3, 0)))
+        self.assertFalse(polygons_overlap(NOTCHED, translate(SQUARE, 1.5, 0)))
+        self.assertFalse(polygons_overlap(NOTCHED, translate(SQUARE, 10, 0)))
+
+
+class TestOutlines(unittest.TestCase):
+
+    def test_outline_stays_inside_the_bounding_circle(self):
+        rng = random.Random(4)
+        for _ in range(50):
+            for x, y in lumpy_outline(ASTEROID_MAX_RADIUS, rng):
+                distance = math.hypot(x, y)
+                self.assertLessEqual(distance, ASTEROID_MAX_RADIUS + 1e-9)
+                self.assertGreaterEqual(distance, ASTEROID_MAX_RADIUS * (1 - ASTEROID_LUMPINESS) - 1e-9)
+
+    def test_variants_are_stable_and_leave_the_random_stream_alone(self):
+        outline_variants.cache_clear()
+        random.seed(5)
+        first = outline_variants(ASTEROID_MIN_RADIUS)
+        after = random.random()
+        outline_variants.cache_clear()
+        random.seed(5)
+        self.assertEqual(outline_variants(ASTEROID_MIN_RADIUS), first)
+        self.assertEqual(random.random(), after)
+        self.assertEqual(len(first), ASTEROID_OUTLINE_VARIANTS)
+
+    def test_pooled_rock_picks_an_outline_for_its_new_radius(self):
+        group = pygame.sprite.Group()
+        Asteroid.containers = (group,)
+        Asteroid.pool = ShapePool(Asteroid, cap=2)
+        try:
+            rock = Asteroid.create(0, 0, ASTEROID_MAX_RADIUS)
+            rock.kill()
+            Asteroid.pool.reclaim()
+            reused = Asteroid.create(0, 0, ASTEROID_MIN_RADIUS)
+            self.assertIs(reused, rock)
+            self.assertIn(reused.outline, outline_variants(ASTEROID_MIN_RADIUS))
+        finally:
+            del Asteroid.containers
+            del Asteroid.pool
+
+
+class TestShipHitbox(unittest.TestCase):
+
+    def setUp(self):
+        self.lumpy = Asteroid.lumpy
+        Asteroid.lumpy = False
+        self.player = Player(0, 0)
+        # rear corners at (+-radius / 1.5, -radius), nose at (0, radius)
+        corner = pygame.Vector2(PLAYER_RADIUS / 1.5, -PLAYER_RADIUS)
+        self.past_corner = corner + corner.normalize() * (ASTEROID_MIN_RADIUS - 1)
+        self.beside_nose = pygame.Vector2(PLAYER_RADIUS + ASTEROID_MIN_RADIUS - 1, 0)
+
+    def tearDown(self):
+        Asteroid.lumpy = self.lumpy
+
+    def test_bounding_radius_encloses_the_triangle(self):
+        for x, y in self.player.hitbox_outline():
+            self.assertLessEqual(math.hypot(x, y), self.player.bounding_radius + 1e-9)
+        self.assertAlmostEqual(self.player.bounding_radius, PLAYER_RADIUS * SHIP_REACH)
+
+    def test_rock_touching_a_rear_corner_hits_outside_the_old_circle(self):
+        rock = Asteroid(*self.past_corner, ASTEROID_MIN_RADIUS)
+        self.assertFalse(rock.collides_with(self.player))
+        self.assertTrue(rock.exact_hit(self.player, -self.past_corner.x, -self.past_corner.y))
+
+    def test_rock_beside_the_nose_misses_inside_the_old_circle(self):
+        rock = Asteroid(*self.beside_nose, ASTEROID_MIN_RADIUS)
+        self.assertTrue(rock.collides_with(self.player))
+        self.assertFalse(rock.exact_hit(self.player, -self.beside_nose.x, -self.beside_nose.y))
+
+    def test_hitbox_follows_rotation(self):
+        self.player.rotation = 180
+        rock = Asteroid(*self.beside_nose, ASTEROID_MIN_RADIUS)
+        self.assertFalse(rock.exact_hit(self.player, -self.beside_nose.x, -self.beside_nose.y))
+        rock = Asteroid(-self.past_corner.x, -self.past_corner.y, ASTEROID_MIN_RADIUS)
+        self.assertTrue(rock.exact_hit(self.player, self.past_corner.x, self.past_corner.y))
+
+
+class TestSimulationUsesExactShapes(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        init_headless()
+
+    def setUp(self):
+        self.lumpy = Asteroid.lumpy
+        random.seed(3)
+        self.simulation = Simulation(use_entity_store=False)
+        self.player = self.simulation.player
+        self.player.position.update(400, 400)
+
+    def tearDown(self):
+        Asteroid.lumpy = self.lumpy
+
+    def test_player_is_hit_by_a_rock_at_its_corner(self):
+        Asteroid.lumpy = False
+        corner = pygame.Vector2(PLAYER_RADIUS / 1.5, -PLAYER_RADIUS)
+        position = self.player.position + corner + corner.normalize() * (ASTEROID_MIN_RADIUS - 1)
+        self.simulation.asteroid_pool.acquire(position.x, position.y, ASTEROID_MIN_RADIUS)
+        self.simulation.step(0.0)
+        self.assertEqual(self.simulation.lives, PLAYER_LIVES - 1)
+
+    def test_player_survives_a_rock_beside_its_nose(self):
+        Asteroid.lumpy = False
+        self.simulation.asteroid_pool.acquire(400 + PLAYER_RADIUS + ASTEROID_MIN_RADIUS - 1, 400, ASTEROID_MIN_RADIUS)
+        self.simulation.step(0.0)
+        self.assertEqual(self.simulation.lives, PLAYER_LIVES)
+
+    def test_shot_through_a_dent_misses(self):
+        Asteroid.lumpy = True
+        self.player.position.update(-10000, -10000)
+        rock = self.simulation.asteroid_pool.acquire(400, 400, ASTEROID_MAX_RADIUS)
+        # a square outline leaves the corners of the bounding circle empty
+        half = ASTEROID_MAX_RADIUS * 0.5
+        rock.outline = ((-half, -half), (half, -half), (half, half), (-half, half))
+        shot = self.simulation.shot_pool.acquire(400 + ASTEROID_MAX_RADIUS * 0.72, 400 - ASTEROID_MAX_RADIUS * 0.72, SHOT_RADIUS)
+        shot.velocity = pygame.Vector2(0, PLAYER_SHOOT_SPEED)
+        shot.age = 1.0
+        self.simulation.step(0.02)
+        self.assertEqual(self.simulation.score_manager.get_current_score(), 0)
+        self.assertTrue(shot.alive())
+        shot.position.update(400 + half, 400)
+        self.simulation.step(0.0)
+        self.assertFalse(shot.alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import pygame
+from classes.asteroid import Asteroid
+from classes.shot import Shot
+from util.constants import ASTEROID_MAX_RADIUS, ASTEROID_MIN_RADIUS, SHOT_RADIUS
+from util.pool import ShapePool
+
+
+class PoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.group = pygame.sprite.Group()
+        Asteroid.containers = (self.group,)
+        Shot.containers = (self.group,)
+        Asteroid.pool = ShapePool(Asteroid, cap=2)
+
+    def tearDown(self):
+        del Asteroid.containers
+        del Shot.containers
+        del Asteroid.pool
+
+
+class TestShapePool(PoolTestCase):
+
+    def test_first_acquire_is_a_miss(self):
+        rock = Asteroid.create(1, 2, ASTEROID_MIN_RADIUS)
+        self.assertIsInstance(rock, Asteroid)
+        self.assertEqual(Asteroid.pool.misses, 1)
+        self.assertEqual(Asteroid.pool.hits, 0)
+
+    def test_killed_instance_is_reused_after_reclaim(self):
+        rock = Asteroid.create(1, 2, ASTEROID_MIN_RADIUS)
+        position, velocity = rock.position, rock.velocity
+        rock.velocity.update(5, 5)
+        rock.age = 3.0
+        rock.kill()
+        self.assertIsNot(Asteroid.create(0, 0, ASTEROID_MIN_RADIUS), rock)
+        Asteroid.pool.reclaim()
+
+        reused = Asteroid.create(7, 8, ASTEROID_MAX_RADIUS)
+
+        self.assertIs(reused, rock)
+        self.assertIs(reused.position, position)
+        self.assertIs(reused.velocity, velocity)
+        self.assertEqual(reused.position, pygame.Vector2(7, 8))
+        self.assertEqual(reused.velocity, pygame.Vector2(0, 0))
+        self.assertEqual(reused.radius, ASTEROID_MAX_RADIUS)
+        self.assertEqual(reused.age, 0.0)
+        self.assertTrue(reused.alive())
+        self.assertEqual(Asteroid.pool.hits, 1)
+
+    def test_cap_limits_free_list(self):
+        rocks = [Asteroid.create(0, 0, ASTEROID_MIN_RADIUS) for _ in range(4)]
+        for rock in rocks:
+            rock.kill()
+        Asteroid.pool.reclaim()
+        stats = Asteroid.pool.stats()
+        self.assertEqual(stats["free"], 2)
+        self.assertEqual(stats["discarded"], 2)
+        self.assertEqual(stats["high_water"], 4)
+        self.assertEqual(stats["live"], 0)
+
+    def test_double_kill_releases_once(self):
+        rock = Asteroid.create(0, 0, ASTEROID_MIN_RADIUS)
+        rock.kill()
+        rock.kill()
+        Asteroid.pool.reclaim()
+        self.assertEqual(Asteroid.pool.stats()["free"], 1)
+
+    def test_directly_constructed_instances_are_not_taken_in(self):
+        rock = Asteroid(0, 0, ASTEROID_MIN_RADIUS)
+        rock.kill()
+        Asteroid.pool.reclaim()
+        stats = Asteroid.pool.stats()
+        self.assertEqual(stats["live"], 0)
+        self.assertEqual(stats["free"], 0)
+
+    def test_classes_without_a_pool_are_constructed_directly(self):
+        shot = Shot.create(0, 0, SHOT_RADIUS)
+        shot.kill()
+        self.assertIsNot(Shot.create(0, 0, SHOT_RADIUS), shot)
+
+
+class TestPooledSplit(PoolTestCase):
+
+    def test_split_children_come_from_the_pool(self):
+        parent = Asteroid.create(50, 60, ASTEROID_MAX_RADIUS)
+        parent.velocity.update(100, 0)
+        spare = [Asteroid.create(0, 0, ASTEROID_MIN_RADIUS) for _ in range(2)]
+        for rock in spare:
+            rock.kill()
+        Asteroid.pool.reclaim()
+
+        parent.split()
+
+        children = self.group.sprites()
+        self.assertEqual(sorted(map(id, children)), sorted(map(id, spare)))
+        for child in children:
+            self.assertEqual(child.position, pygame.Vector2(50, 60))
+            self.assertEqual(child.radius, ASTEROID_MAX_RADIUS - ASTEROID_MIN_RADIUS)
+        speeds = sorted(round(child.velocity.length()) for child in children)
+        self.assertEqual(speeds, [100, 120])
+
+    def test_split_parent_is_not_reused_within_the_frame(self):
+        parent = Asteroid.create(0, 0, ASTEROID_MAX_RADIUS)
+        parent.split()
+        self.assertNotIn(parent, self.group.sprites())
+        self.assertEqual(parent.radius, ASTEROID_MAX_RADIUS)
+
+
+if __name__ == '__main__':
+    unittest.main()
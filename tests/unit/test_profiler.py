@@ -0,0 +1,80 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from classes.simulation import Simulation, init_headless
+from util.profiler import NULL_PROFILER, FrameProfiler
+
+
+class TestFrameProfiler(unittest.TestCase):
+
+    def test_repeated_phases_add_up_within_a_frame(self):
+        profiler = FrameProfiler()
+        profiler.begin_frame()
+        time.sleep(0.002)
+        profiler.mark("step")
+        profiler.mark("draw")
+        time.sleep(0.002)
+        profiler.mark("step")
+        profiler.end_frame()
+        stats = profiler.stats()
+        self.assertGreaterEqual(stats["phases_ms"]["step"]["p50"], 4.0)
+        self.assertLess(stats["phases_ms"]["draw"]["p50"], 1.0)
+        self.assertGreaterEqual(stats["frame_ms"]["p50"], 4.0)
+
+    def test_rolling_window_drops_old_frames(self):
+        profiler = FrameProfiler(window=10)
+        for _ in range(25):
+            profiler.begin_frame()
+            profiler.mark("step")
+            profiler.end_frame(asteroids=3)
+        stats = profiler.stats()
+        self.assertEqual(stats["frames"], 25)
+        self.assertEqual(stats["window"], 10)
+        self.assertEqual(stats["counts"]["asteroids"]["last"], 3)
+
+    def test_counts_track_peak(self):
+        profiler = FrameProfiler()
+        for count in (0, 5, 2):
+            profiler.begin_frame()
+            profiler.end_frame(shots=count)
+        counts = profiler.stats()["counts"]["shots"]
+        self.assertEqual((counts["last"], counts["peak"], counts["p50"]), (2, 5, 2))
+
+    def test_dump_writes_json(self):
+        profiler = FrameProfiler()
+        profiler.begin_frame()
+        profiler.mark("step")
+        profiler.end_frame()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "profile.json")
+            profiler.dump(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f)["frames"], 1)
+
+    def test_null_profiler_records_nothing(self):
+        NULL_PROFILER.begin_frame()
+        NULL_PROFILER.mark("step")
+        NULL_PROFILER.end_frame(asteroids=1)
+        self.assertFalse(NULL_PROFILER.enabled)
+        self.assertEqual(NULL_PROFILER.stats(), {})
+
+
+class TestSimulationProfiling(unittest.TestCase):
+
+    def test_headless_run_reports_every_phase(self):
+        init_headless()
+        profiler = FrameProfiler()
+        simulation = Simulation(use_entity_store=False, profiler=profiler)
+        simulation.run(60)
+        stats = profiler.stats()
+        self.assertEqual(stats["frames"], 60)
+        self.assertEqual(
+            list(stats["phases_ms"]), ["log_state", "update", "particles", "cull", "collisions", "scoring"]
+        )
+        self.assertIn("asteroids", stats["counts"])
+
+
+if __name__ == '__main__':
+    unittest.main()
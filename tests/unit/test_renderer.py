@@ -0,0 +1,58 @@
+import random
+import unittest
+import pygame
+from classes.asteroid import Asteroid
+from classes.simulation import Simulation, init_headless
+from renderer import Renderer
+from util.constants import ASTEROID_MAX_RADIUS, SCREEN_HEIGHT, SCREEN_WIDTH, SIMULATION_DT
+
+
+class TestDirtyRectRendering(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        init_headless()
+        pygame.font.init()
+
+    def setUp(self):
+        random.seed(5)
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.simulation = Simulation(use_entity_store=False)
+        rock = Asteroid(300, 300, ASTEROID_MAX_RADIUS)
+        rock.velocity.update(240, 60)
+
+    def full_redraw(self):
+        reference = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        Renderer(reference, self.simulation, dirty_rects=False).render()
+        return reference
+
+    def test_frames_match_a_full_redraw(self):
+        renderer = Renderer(self.screen, self.simulation, dirty_rects=True)
+        for _ in range(30):
+            self.simulation.step(SIMULATION_DT)
+            renderer.render()
+        self.assertGreater(renderer.partial_updates, 0)
+        self.assertEqual(
+            pygame.image.tobytes(self.screen, "RGB"),
+            pygame.image.tobytes(self.full_redraw(), "RGB"),
+        )
+
+    def test_first_frame_and_invalidate_use_full_flip(self):
+        renderer = Renderer(self.screen, self.simulation, dirty_rects=True)
+        renderer.render()
+        renderer.render()
+        self.assertEqual((renderer.full_updates, renderer.partial_updates), (1, 1))
+        renderer.invalidate()
+        renderer.render()
+        self.assertEqual(renderer.full_updates, 2)
+
+    def test_large_dirty_area_falls_back_to_full_flip(self):
+        renderer = Renderer(self.screen, self.simulation, dirty_rects=True)
+        renderer._max_dirty_area = 1
+        for _ in range(5):
+            renderer.render()
+        self.assertEqual((renderer.full_updates, renderer.partial_updates), (5, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
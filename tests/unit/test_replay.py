@@ -0,0 +1,122 @@
+import os
+import random
+import tempfile
+import unittest
+import pygame
+from classes.simulation import Simulation, init_headless
+from main import run_headless
+from util.config import DEFAULT_CONFIG
+from util.spawn_profile import SpawnProfile, SpawnWave
+from util.replay import KeyState, Recorder, ReplayReader, encode_keys, frame_time_summary, replay
+
+
+def state_of(simulation):
+    return (
+        simulation.frame,
+        simulation.lives,
+        simulation.score_manager.get_current_score(),
+        round(simulation.player.rotation, 9),
+        sorted((round(r.position.x, 9), round(r.position.y, 9), r.radius) for r in simulation.asteroids),
+        sorted((round(s.position.x, 9), round(s.position.y, 9)) for s in simulation.shots),
+    )
+
+
+class _Keys:
+    def __init__(self, pressed):
+        self.pressed = pressed
+
+    def __getitem__(self, key):
+        return self.pressed.get(key, False)
+
+
+class TestKeyEncoding(unittest.TestCase):
+
+    def test_bits_round_trip(self):
+        pressed = {pygame.K_a: True, pygame.K_SPACE: True}
+        bits = encode_keys(_Keys(pressed))
+        keys = KeyState(bits)
+        self.assertTrue(keys[pygame.K_a])
+        self.assertTrue(keys[pygame.K_SPACE])
+        self.assertFalse(keys[pygame.K_w])
+        self.assertFalse(keys[pygame.K_z])
+
+
+class TestRecordAndReplay(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        init_headless()
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "session.replay")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def record_session(self, frames, seed=99, **settings):
+        random.seed(seed)
+        simulation = Simulation(use_entity_store=False, **settings)
+        script = random.Random(seed + 1)
+        keys = KeyState()
+        simulation.player.read_keys = lambda: keys
+        recorder = Recorder(self.path, seed)
+        recorder.attach(simulation)
+        for frame in range(frames):
+            # hold fire, turn and thrust in bursts, with an uneven frame time
+            keys.bits = encode_keys(_Keys({
+                pygame.K_SPACE: True,
+                pygame.K_a: (frame // 40) % 2 == 0,
+                pygame.K_w: (frame // 90) % 3 == 0,
+            }))
+            simulation.step(script.choice([1 / 60, 1 / 30, 1 / 120]))
+            if simulation.game_over:
+                break
+        recorder.close()
+        return simulation
+
+    def test_file_holds_seed_and_one_record_per_step(self):
+        simulation = self.record_session(300)
+        reader = ReplayReader(self.path)
+        self.assertEqual(reader.seed, 99)
+        self.assertEqual(len(reader), simulation.frame)
+
+    def test_replay_reproduces_the_session_exactly(self):
+        recorded = self.record_session(1200)
+        self.assertGreater(recorded.score_manager.get_current_score(), 0)
+
+        replayed, frame_times = replay(self.path, lambda **settings: Simulation(use_entity_store=False, **settings))
+
+        self.assertEqual(state_of(replayed), state_of(recorded))
+        self.assertEqual(len(frame_times), recorded.frame)
+
+    def test_replay_rebuilds_the_recorded_settings(self):
+        config = DEFAULT_CONFIG.with_overrides({"player": {"lives": 1}, "score": {"small_asteroid": 3}})
+        profile = SpawnProfile([SpawnWave(interval=0.2, speed=(150, 200)), SpawnWave(start=5, kinds=(3, 3))], 40)
+        recorded = self.record_session(600, config=config, spawn_profile=profile, wrap=True, particles=False)
+
+        replayed, _ = replay(self.path, lambda **settings: Simulation(use_entity_store=False, **settings))
+
+        self.assertEqual(replayed.config, config)
+        self.assertEqual(replayed.asteroid_field.profile.to_dict(), profile.to_dict())
+        self.assertIsNotNone(replayed.torus)
+        self.assertIsNone(replayed.particles)
+        self.assertEqual(state_of(replayed), state_of(recorded))
+
+    def test_headless_runs_can_be_recorded(self):
+        random.seed(7)
+        result = run_headless(300, 1 / 60, bot="aimer", record=self.path, seed=7)
+        self.assertEqual(len(ReplayReader(self.path)), result["frames"])
+        replayed, _ = replay(self.path)
+        self.assertEqual(replayed.score_manager.get_current_score(), result["score"])
+
+    def test_frame_time_summary(self):
+        summary = frame_time_summary([0.001] * 99 + [0.010])
+        self.assertEqual(summary["frames"], 100)
+        self.assertAlmostEqual(summary["p50_ms"], 1.0)
+        self.assertAlmostEqual(summary["p99_ms"], 10.0)
+        self.assertAlmostEqual(summary["max_ms"], 10.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
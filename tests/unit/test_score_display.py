@@ -0,0 +1,54 @@
+import unittest
+import pygame
+from score_display import ScoreDisplay
+from util.constants import SCORE_COLOR, SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+class TestScoreDisplayCache(unittest.TestCase):
+
+    def setUp(self):
+        self.display = ScoreDisplay()
+        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    def test_unchanged_values_reuse_line_surfaces(self):
+        self.display.render_surface(self.screen)
+        first = dict(self.display._surfaces)
+        self.display.update_score(0)
+        self.display.render_surface(self.screen)
+        for key, surface in first.items():
+            self.assertIs(self.display._surfaces[key], surface)
+
+    def test_changed_value_rebuilds_only_that_line(self):
+        self.display.render_surface(self.screen)
+        lives = self.display._surfaces['LIVES']
+        score = self.display._surfaces['SCORE']
+        self.display.update_score(1234)
+        self.display.render_surface(self.screen)
+        self.assertIs(self.display._surfaces['LIVES'], lives)
+        self.assertIsNot(self.display._surfaces['SCORE'], score)
+
+    def test_digits_are_rasterized_once(self):
+        self.display.update_score(1111)
+        self.display.render_surface(self.screen)
+        atlas_size = len(self.display._atlas)
+        self.display.update_score(1111111)
+        self.display.render_surface(self.screen)
+        self.assertEqual(len(self.display._atlas), atlas_size)
+
+    def test_combo_hidden_below_two(self):
+        self.display.render_surface(self.screen)
+        self.assertNotIn('COMBO', self.display._surfaces)
+        self.display.update_combo(2)
+        self.display.render_surface(self.screen)
+        self.assertIn('COMBO', self.display._surfaces)
+
+    def test_composed_line_matches_rendered_text_size(self):
+        self.display.update_score(987654)
+        composed = self.display._line('SCORE')
+        rendered = self.display._font.render("SCORE: 987,654", True, SCORE_COLOR)
+        self.assertEqual(composed.get_height(), rendered.get_height())
+        self.assertAlmostEqual(composed.get_width(), rendered.get_width(), delta=6)
+
+
+if __name__ == '__main__':
+    unittest.main()
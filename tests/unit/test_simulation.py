@@ -0,0 +1,106 @@
+import random
+import unittest
+import pygame
+from classes.simulation import Simulation, init_headless
+from util.constants import (
+    ASTEROID_MIN_RADIUS,
+    PLAYER_LIVES,
+    SCORE_SMALL_ASTEROID,
+    SHOT_RADIUS,
+    SIMULATION_DT,
+)
+from util.entity_store import numpy_available
+from util.input_provider import AimingBot
+
+
+class SimulationTestCase(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        init_headless()
+
+    def setUp(self):
+        random.seed(3)
+        self.simulation = Simulation(use_entity_store=False)
+        # keep the player well away from the test rocks
+        self.simulation.player.position.update(-10000, -10000)
+
+
+class TestSimulationStep(SimulationTestCase):
+
+    def test_run_advances_fixed_steps(self):
+        result = self.simulation.run(120)
+        self.assertEqual(result["frames"], 120)
+        self.assertAlmostEqual(result["simulated_seconds"], 120 * SIMULATION_DT)
+        self.assertFalse(result["game_over"])
+
+    def test_shot_hitting_rock_scores_and_splits(self):
+        self.simulation.asteroid_pool.acquire(400, 400, ASTEROID_MIN_RADIUS)
+        self.simulation.shot_pool.acquire(405, 400, SHOT_RADIUS)
+        self.simulation.step(0.0)
+        self.assertEqual(self.simulation.score_manager.get_current_score(), SCORE_SMALL_ASTEROID)
+        self.assertEqual(len(self.simulation.shots), 0)
+        self.assertEqual(len(self.simulation.asteroids), 0)
+
+    def test_player_hit_costs_a_life_and_respawns(self):
+        player = self.simulation.player
+        player.position.update(400, 400)
+        self.simulation.asteroid_pool.acquire(400, 400, ASTEROID_MIN_RADIUS)
+        self.simulation.step(0.0)
+        self.assertEqual(self.simulation.lives, PLAYER_LIVES - 1)
+        self.assertFalse(player.is_vulnerable())
+
+    def test_losing_last_life_ends_the_game(self):
+        self.simulation.lives = 1
+        self.simulation.player.position.update(400, 400)
+        self.simulation.asteroid_pool.acquire(400, 400, ASTEROID_MIN_RADIUS)
+        self.simulation.step(0.0)
+        self.assertTrue(self.simulation.game_over)
+        frame = self.simulation.frame
+        self.simulation.step()
+        self.assertEqual(self.simulation.frame, frame)
+
+    def test_same_seed_gives_same_state(self):
+        self.simulation.run(600)
+        first = sorted((round(r.position.x, 6), round(r.position.y, 6)) for r in self.simulation.asteroids)
+        random.seed(3)
+        again = Simulation(use_entity_store=False)
+        again.player.position.update(-10000, -10000)
+        again.run(600)
+        second = sorted((round(r.position.x, 6), round(r.position.y, 6)) for r in again.asteroids)
+        self.assertEqual(first, second)
+        self.assertTrue(first)
+
+
+@unittest.skipUnless(numpy_available(), "numpy is not installed")
+class TestEntityStoreEquivalence(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        init_headless()
+
+    def play(self, use_entity_store, wrap):
+        random.seed(5)
+        simulation = Simulation(use_entity_store=use_entity_store, particles=False, wrap=wrap)
+        simulation.player.set_input(AimingBot(simulation))
+        states = []
+        for _ in range(900):
+            simulation.step()
+            states.append((
+                simulation.lives,
+                simulation.score_manager.get_current_score(),
+                sorted((round(r.position.x, 6), round(r.position.y, 6), r.radius) for r in simulation.asteroids),
+                sorted((round(s.position.x, 6), round(s.position.y, 6)) for s in simulation.shots),
+            ))
+        return states
+
+    def test_store_and_sprites_play_the_same_game(self):
+        for wrap in (False, True):
+            with self.subTest(wrap=wrap):
+                sprites = self.play(False, wrap)
+                self.assertGreater(sprites[-1][1], 0)
+                self.assertEqual(self.play(True, wrap), sprites)
+
+
+if __name__ == '__main__':
+    unittest.main()
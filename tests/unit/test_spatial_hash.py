@@ -0,0 +1,69 @@
+import random
+import unittest
+import pygame
+from classes.circleshape import CircleShape
+from util.constants import ASTEROID_MAX_RADIUS, SCREEN_WIDTH, SCREEN_HEIGHT
+from util.spatial_hash import SpatialHash
+
+
+class TestSpatialHashQuery(unittest.TestCase):
+
+    def setUp(self):
+        self.hash = SpatialHash()
+
+    def test_default_cell_size_is_max_asteroid_radius(self):
+        self.assertEqual(self.hash.cell_size, ASTEROID_MAX_RADIUS)
+
+    def test_empty_hash_returns_no_candidates(self):
+        self.assertEqual(self.hash.query(pygame.Vector2(100, 100), 60), [])
+
+    def test_query_finds_sprite_in_neighbouring_cell(self):
+        shot = CircleShape(ASTEROID_MAX_RADIUS + 1, 10, 5)
+        self.hash.insert(shot)
+        found = self.hash.query(pygame.Vector2(ASTEROID_MAX_RADIUS - 1, 10), 20)
+        self.assertEqual(found, [shot])
+
+    def test_query_skips_distant_sprites(self):
+        self.hash.insert(CircleShape(1000, 600, 5))
+        self.assertEqual(self.hash.query(pygame.Vector2(50, 50), 60), [])
+
+    def test_query_handles_negative_coordinates(self):
+        shot = CircleShape(-30, -30, 5)
+        self.hash.insert(shot)
+        self.assertEqual(self.hash.query(pygame.Vector2(-10, -10), 20), [shot])
+
+    def test_rebuild_replaces_previous_contents(self):
+        self.hash.insert(CircleShape(10, 10, 5))
+        shot = CircleShape(500, 500, 5)
+        self.hash.rebuild([shot])
+        self.assertEqual(len(self.hash), 1)
+        self.assertEqual(self.hash.query(pygame.Vector2(10, 10), 20), [])
+
+
+class TestSpatialHashMatchesBruteForce(unittest.TestCase):
+
+    def test_candidates_include_every_colliding_pair(self):
+        rng = random.Random(42)
+        rocks = [
+            CircleShape(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), rng.choice([20, 40, 60]))
+            for _ in range(200)
+        ]
+        shots = [
+            CircleShape(rng.uniform(0, SCREEN_WIDTH), rng.uniform(0, SCREEN_HEIGHT), 5)
+            for _ in range(200)
+        ]
+        shot_hash = SpatialHash()
+        shot_hash.rebuild(shots)
+
+        expected = {
+            (id(rock), id(shot)) for rock in rocks for shot in shots if rock.collides_with(shot)
+        }
+        candidates = {(id(rock), id(shot)) for rock, shot in shot_hash.candidate_pairs(rocks)}
+
+        self.assertTrue(expected)
+        self.assertTrue(expected <= candidates)
+        self.assertLess(len(candidates), len(rocks) * len(shots) // 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
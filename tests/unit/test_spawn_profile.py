@@ -0,0 +1,138 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+import pygame
+from classes.asteroid import Asteroid
+from classes.asteroidfield import AsteroidField
+from util.constants import ASTEROID_MIN_RADIUS, ASTEROID_SPAWN_RATE_SECONDS
+from util.spawn_profile import DEFAULT_PROFILE, SpawnProfile, SpawnWave, load_spawn_profile
+
+
+class FieldTestCase(unittest.TestCase):
+
+    def setUp(self):
+        random.seed(4)
+        self.asteroids = pygame.sprite.Group()
+        Asteroid.containers = (self.asteroids,)
+        AsteroidField.containers = ()
+
+    def tearDown(self):
+        del Asteroid.containers
+        del AsteroidField.containers
+
+    def run_field(self, field, dt, seconds):
+        for _ in range(round(seconds / dt)):
+            field.update(dt)
+
+
+class TestSpawnTiming(FieldTestCase):
+
+    def test_leftover_time_is_kept(self):
+        field = AsteroidField(self.asteroids)
+        # 0.3 s steps: the old reset-to-zero timer spawned every 0.9 s
+        self.run_field(field, 0.3, 24.3)
+        self.assertEqual(field.spawned, int(24.3 / ASTEROID_SPAWN_RATE_SECONDS))
+
+    def test_spawn_count_does_not_depend_on_dt(self):
+        counts = []
+        for dt in (1 / 30, 1 / 60, 1 / 240, 0.5):
+            field = AsteroidField(self.asteroids)
+            self.run_field(field, dt, 12.5)
+            counts.append(field.spawned)
+        self.assertEqual(len(set(counts)), 1, counts)
+
+    def test_long_step_spawns_every_due_rock(self):
+        field = AsteroidField(self.asteroids)
+        field.update(ASTEROID_SPAWN_RATE_SECONDS * 5.5)
+        self.assertEqual(len(self.asteroids), 5)
+
+
+class TestSpawnBudget(FieldTestCase):
+
+    def test_spawning_pauses_at_the_budget(self):
+        profile = SpawnProfile([SpawnWave(interval=0.1)], budget=10)
+        field = AsteroidField(self.asteroids, profile=profile)
+        self.run_field(field, 0.05, 5.0)
+        self.assertEqual(len(self.asteroids), 10)
+        self.assertEqual(field.spawned + field.throttled, 50)
+
+    def test_throttled_spawns_are_not_saved_up(self):
+        profile = SpawnProfile([SpawnWave(interval=0.1)], budget=10)
+        field = AsteroidField(self.asteroids, profile=profile)
+        self.run_field(field, 0.05, 5.0)
+        for rock in self.asteroids.sprites()[:5]:
+            rock.kill()
+        field.update(0.1)
+        self.assertEqual(len(self.asteroids), 6)
+
+    def test_wrap_cap_and_profile_budget_take_the_lower(self):
+        profile = SpawnProfile([SpawnWave()], budget=10)
+        self.assertEqual(AsteroidField(self.asteroids, 40, profile).max_asteroids, 10)
+        self.assertEqual(AsteroidField(self.asteroids, 4, profile).max_asteroids, 4)
+
+
+class TestWaves(FieldTestCase):
+
+    def test_later_wave_takes_over(self):
+        profile = SpawnProfile([
+            SpawnWave(start=0, interval=1.0, kinds=(1, 1)),
+            SpawnWave(start=10, interval=0.5, kinds=(3, 3)),
+        ], budget=None)
+        field = AsteroidField(self.asteroids, profile=profile)
+        self.run_field(field, 0.25, 9.75)
+        self.assertEqual({rock.radius for rock in self.asteroids}, {ASTEROID_MIN_RADIUS})
+        self.assertEqual(field.spawned, 9)
+        # the leftover 0.75 of an interval carries over without a burst
+        self.run_field(field, 0.25, 5.25)
+        self.assertEqual(field.spawned, 20)
+        self.assertIn(ASTEROID_MIN_RADIUS * 3, {rock.radius for rock in self.asteroids})
+
+    def test_ramp_blends_towards_the_next_wave(self):
+        first = SpawnWave(start=0, interval=1.0, speed=(40, 100), ramp=True)
+        second = SpawnWave(start=10, interval=0.5, speed=(80, 200))
+        self.assertEqual(first.blend(second, 5.0), (0.75, 60, 150))
+        self.assertEqual(first.blend(second, 20.0), (0.5, 80, 200))
+        self.assertEqual(first.blend(None, 5.0), (1.0, 40, 100))
+
+    def test_invalid_waves_are_rejected(self):
+        with self.assertRaises(ValueError):
+            SpawnWave(interval=0)
+        with self.assertRaises(ValueError):
+            SpawnWave(kinds=(1, 9))
+        with self.assertRaises(ValueError):
+            SpawnWave.from_dict({"intervall": 1.0})
+        with self.assertRaises(ValueError):
+            SpawnProfile([])
+
+    def test_waves_sharing_a_start_are_rejected(self):
+        first = SpawnWave(start=10, interval=1.0, ramp=True)
+        second = SpawnWave(start=10, interval=0.5)
+        with self.assertRaises(ValueError):
+            SpawnProfile([SpawnWave(), second, first])
+        with self.assertRaises(ValueError):
+            SpawnProfile.from_dict({"waves": [{"start": 5}, {"start": 5.0, "ramp": True}]})
+
+
+class TestLoadSpawnProfile(unittest.TestCase):
+
+    def test_load_fills_in_defaults(self):
+        data = {"budget": 25, "waves": [{"start": 30, "interval": 0.2}, {"interval": 0.6}]}
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            with open(path, "w") as f:
+                json.dump(data, f)
+            profile = load_spawn_profile(path)
+        self.assertEqual(profile.budget, 25)
+        self.assertEqual([wave.start for wave in profile.waves], [0.0, 30.0])
+        self.assertEqual(profile.waves[1].speed, DEFAULT_PROFILE.waves[0].speed)
+
+    def test_shipped_profiles_load(self):
+        root = os.path.join(os.path.dirname(__file__), "..", "..", "profiles")
+        for name in os.listdir(root):
+            self.assertIsInstance(load_spawn_profile(os.path.join(root, name)), SpawnProfile)
+
+
+if __name__ == '__main__':
+    unittest.main()
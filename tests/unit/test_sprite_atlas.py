@@ -0,0 +1,87 @@
+import unittest
+import pygame
+from classes.asteroid import Asteroid
+from classes.player import Player
+from classes.shot import Shot
+from sprite_atlas import SpriteAtlas
+from util.constants import ASTEROID_MAX_RADIUS, SCREEN_HEIGHT, SCREEN_WIDTH, SHOT_RADIUS
+from util.polygon import outline_variants
+
+
+class TestSpriteAtlas(unittest.TestCase):
+
+    def setUp(self):
+        self.atlas = SpriteAtlas()
+        self.lumpy = Asteroid.lumpy
+
+    def tearDown(self):
+        Asteroid.lumpy = self.lumpy
+
+    def render_both(self, entity):
+        drawn = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        entity.draw(drawn)
+        blitted = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.atlas.draw(blitted, [entity])
+        return drawn, blitted
+
+    def assertSamePixels(self, first, second):
+        self.assertEqual(
+            pygame.image.tobytes(first, "RGB"), pygame.image.tobytes(second, "RGB")
+        )
+
+    def test_circle_sprites_match_pygame_draw(self):
+        Asteroid.lumpy = False
+        for entity in (Asteroid(300.7, 200.2, ASTEROID_MAX_RADIUS), Shot(40, 500.5, SHOT_RADIUS)):
+            self.assertSamePixels(*self.render_both(entity))
+
+    def test_circles_are_rasterized_once_per_radius_and_colour(self):
+        Asteroid.lumpy = False
+        first = Asteroid(100, 100, ASTEROID_MAX_RADIUS).blit_sprite(self.atlas)[0]
+        second = Asteroid(500, 300, ASTEROID_MAX_RADIUS).blit_sprite(self.atlas)[0]
+        self.assertIs(first, second)
+        self.assertIsNot(first, Shot(0, 0, ASTEROID_MAX_RADIUS).blit_sprite(self.atlas)[0])
+
+    def test_outline_sprites_match_pygame_draw(self):
+        Asteroid.lumpy = True
+        for variant in range(3):
+            rock = Asteroid(300, 200, ASTEROID_MAX_RADIUS)
+            rock.variant = variant
+            rock.outline = outline_variants(rock.radius)[variant]
+            self.assertSamePixels(*self.render_both(rock))
+
+    def test_outlines_are_rasterized_once_per_variant(self):
+        self.assertIs(
+            self.atlas.outline(ASTEROID_MAX_RADIUS, 2, "white"),
+            self.atlas.outline(ASTEROID_MAX_RADIUS, 2, "white"),
+        )
+        self.assertIsNot(
+            self.atlas.outline(ASTEROID_MAX_RADIUS, 2, "white"),
+            self.atlas.outline(ASTEROID_MAX_RADIUS, 3, "white"),
+        )
+
+    def test_ship_is_cached_by_quantized_rotation(self):
+        self.assertIs(self.atlas.ship(90.2), self.atlas.ship(89.9))
+        self.assertIs(self.atlas.ship(10), self.atlas.ship(370))
+        self.assertIsNot(self.atlas.ship(10), self.atlas.ship(11))
+
+    def test_ship_sprite_is_centred_on_the_player(self):
+        player = Player(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2)
+        player.rotation = 30
+        drawn, blitted = self.render_both(player)
+        drawn.set_colorkey((0, 0, 0))
+        blitted.set_colorkey((0, 0, 0))
+        drawn_rect = drawn.get_bounding_rect()
+        blitted_rect = blitted.get_bounding_rect()
+        self.assertLess(drawn_rect.width, 2 * player.radius * 1.25)
+        self.assertLessEqual(abs(drawn_rect.centerx - blitted_rect.centerx), 1)
+        self.assertLessEqual(abs(drawn_rect.centery - blitted_rect.centery), 1)
+
+    def test_blinking_player_is_skipped(self):
+        player = Player(100, 100)
+        player.invulnerable_timer = 0.15
+        self.assertFalse(player.is_visible())
+        self.assertEqual(self.atlas.draw(pygame.Surface((200, 200)), [player]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import random
+import unittest
+import pygame
+from classes.asteroid import Asteroid
+from classes.shot import Shot
+from classes.simulation import Simulation, init_headless
+from sprite_atlas import SpriteAtlas
+from util.constants import (
+    ASTEROID_MIN_RADIUS,
+    SCORE_SMALL_ASTEROID,
+    SCREEN_HEIGHT,
+    SCREEN_WIDTH,
+    SHOT_RADIUS,
+    SIMULATION_DT,
+    WRAP_MAX_ASTEROIDS,
+)
+from util.entity_store import numpy_available
+from util.spatial_hash import SpatialHash
+from util.torus import Torus
+
+
+class TestTorus(unittest.TestCase):
+
+    def setUp(self):
+        self.torus = Torus(100, 50)
+
+    def test_delta_takes_the_short_way_round(self):
+        self.assertEqual(self.torus.delta(pygame.Vector2(95, 2), pygame.Vector2(5, 48)), (10, -4))
+        self.assertEqual(self.torus.delta(pygame.Vector2(10, 10), pygame.Vector2(30, 20)), (20, 10))
+
+    def test_collision_across_the_edge(self):
+        rock = Asteroid(2, 25, 10)
+        self.assertTrue(self.torus.collides(rock, Shot(95, 25, 2)))
+        self.assertFalse(self.torus.collides(rock, Shot(85, 25, 2)))
+
+    def test_wrap_folds_positions_into_the_field(self):
+        shot = Shot(-5, 60, 2)
+        self.torus.wrap(shot)
+        self.assertEqual(tuple(shot.position), (95, 10))
+
+    def test_images_only_exist_near_edges(self):
+        self.assertEqual(self.torus.images(50, 25, 10), [(0, 0)])
+        self.assertEqual(len(self.torus.images(5, 45, 10)), 4)
+
+    def test_spatial_hash_finds_sprites_across_the_edge(self):
+        shot_hash = SpatialHash(cell_size=10, torus=self.torus)
+        shot = Shot(98, 49, 1)
+        shot_hash.insert(shot)
+        self.assertEqual(shot_hash.query(pygame.Vector2(1, 1), 5), [shot])
+
+
+class TestWrappingSimulation(unittest.TestCase):
+    use_entity_store = False
+
+    @classmethod
+    def setUpClass(cls):
+        init_headless()
+
+    def setUp(self):
+        random.seed(3)
+        self.simulation = Simulation(use_entity_store=self.use_entity_store, wrap=True)
+
+    def test_entities_reenter_at_the_opposite_edge(self):
+        rock = self.simulation.asteroid_pool.acquire(5, 300, ASTEROID_MIN_RADIUS)
+        rock.velocity = pygame.Vector2(-600, 0)
+        self.simulation.step(SIMULATION_DT)
+        self.assertTrue(rock.alive())
+        self.assertAlmostEqual(rock.position.x, SCREEN_WIDTH - 5)
+
+    def test_shot_hits_rock_across_the_edge(self):
+        self.simulation.asteroid_pool.acquire(SCREEN_WIDTH - 2, 300, ASTEROID_MIN_RADIUS)
+        self.simulation.shot_pool.acquire(10, 300, SHOT_RADIUS)
+        self.simulation.step(0.0)
+        self.assertEqual(self.simulation.score_manager.get_current_score(), SCORE_SMALL_ASTEROID)
+
+    def test_spawning_stops_at_the_cap(self):
+        self.simulation.player.invulnerable_timer = 1e9
+        self.simulation.run(60 * 120)
+        self.assertLessEqual(len(self.simulation.asteroids), WRAP_MAX_ASTEROIDS)
+
+    def test_rocks_spawn_on_the_seam_and_are_never_teleported(self):
+        simulation = self.simulation
+        simulation.player.invulnerable_timer = 1e9
+        reach = simulation.config.asteroids.spawn_speed_max * SIMULATION_DT + 1e-6
+        seen = {}
+        for _ in range(600):
+            simulation.step(SIMULATION_DT)
+            for rock in simulation.asteroids:
+                position = pygame.Vector2(rock.position)
+                previous = seen.get(id(rock))
+                if previous is None:
+                    seam = min(position.x, SCREEN_WIDTH - position.x, position.y, SCREEN_HEIGHT - position.y)
+                    self.assertLessEqual(seam, reach)
+                else:
+                    self.assertLessEqual(pygame.Vector2(simulation.torus.delta(previous, position)).length(), reach)
+                seen[id(rock)] = position
+        self.assertGreater(len(seen), 5)
+
+
+@unittest.skipUnless(numpy_available(), "numpy is not installed")
+class TestWrappingSimulationWithStore(TestWrappingSimulation):
+    use_entity_store = True
+
+
+class TestGhostSprites(unittest.TestCase):
+
+    def test_sprite_on_an_edge_is_drawn_on_both_sides(self):
+        screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        rock = Asteroid(5, SCREEN_HEIGHT / 2, ASTEROID_MIN_RADIUS)
+        SpriteAtlas().draw(screen, [rock], torus=Torus())
+        right_edge = pygame.Rect(SCREEN_WIDTH - ASTEROID_MIN_RADIUS, 0, ASTEROID_MIN_RADIUS, SCREEN_HEIGHT)
+        self.assertGreater(pygame.mask.from_threshold(screen.subsurface(right_edge), (255, 255, 255), (1, 1, 1, 255)).count(), 0)
+
+    def test_sprite_away_from_edges_has_no_ghost(self):
+        dirty = []
+        rock = Asteroid(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, ASTEROID_MIN_RADIUS)
+        SpriteAtlas().draw(pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)), [rock], dirty, Torus())
+        self.assertEqual(len(dirty), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
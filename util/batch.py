@@ -0,0 +1,286 @@
+"""Run many headless games across a process pool for balance sweeps.
+
+A sweep file names one or more configs and how many seeded games to play
+with each. A config holds `util.config.GameConfig` sections (lowercase keys)
+and/or `util.constants` overrides (UPPERCASE keys):
+
+    {
+        "games": 200,
+        "frames": 7200,
+        "bot": "aimer",
+        "configs": {
+            "baseline": {},
+            "fast_spawn": {"ASTEROID_SPAWN_RATE_SECONDS": 0.5},
+            "long_combo": {"score": {"combo_window_seconds": 4.0}}
+        }
+    }
+
+Game `i` of every config uses seed `seed + i`, so configs are compared on
+the same asteroid fields. Constants are read once at import time, so games
+run in fresh worker processes that apply constant overrides before importing
+any game module. Derived constants such as `ASTEROID_MAX_RADIUS` are not
+recomputed and must be overridden themselves.
+
+Each finished game is appended to the results file as one JSON line. A rerun
+skips games already recorded with the same overrides, so an interrupted
+sweep resumes where it stopped:
+
+    python -m util.batch sweep.json --results sweep.jsonl --workers 8
+    python -m util.batch sweep.json --results sweep.jsonl --table-only
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+__all__ = [
+    "load_sweep",
+    "plan_games",
+    "load_results",
+    "run_sweep",
+    "summarize",
+    "format_table",
+]
+
+DEFAULT_GAMES = 100
+DEFAULT_FRAMES = 60 * 60 * 2
+DEFAULT_SEED = 1
+DEFAULT_CHUNK = 10
+
+
+def load_sweep(path):
+    from util.input_provider import BOTS
+
+    with open(path, "r") as f:
+        sweep = json.load(f)
+    configs = sweep.get("configs") or {"baseline": {}}
+    bot = sweep.get("bot", "aimer")
+    if bot not in BOTS:
+        raise ValueError(f"unknown bot {bot!r}; choose from {', '.join(BOTS)}")
+    return {
+        "configs": configs,
+        "games": int(sweep.get("games", DEFAULT_GAMES)),
+        "frames": int(sweep.get("frames", DEFAULT_FRAMES)),
+        "dt": float(sweep.get("dt", 1 / 60)),
+        "seed": int(sweep.get("seed", DEFAULT_SEED)),
+        "bot": bot,
+    }
+
+
+def _game_key(config, seed, overrides):
+    return config, seed, json.dumps(overrides, sort_keys=True)
+
+
+def load_results(path):
+    """Read a results file, ignoring a torn last line from an interrupted run."""
+    results = []
+    if not os.path.exists(path):
+        return results
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return results
+
+
+def plan_games(sweep, done=()):
+    """Return the `(config, seed)` pairs still to play, grouped per config."""
+    finished = {_game_key(r["config"], r["seed"], r["overrides"]) for r in done}
+    plan = {}
+    for config, overrides in sweep["configs"].items():
+        seeds = [
+            sweep["seed"] + index
+            for index in range(sweep["games"])
+            if _game_key(config, sweep["seed"] + index, overrides) not in finished
+        ]
+        if seeds:
+            plan[config] = seeds
+    return plan
+
+
+def _apply_overrides(overrides):
+    """Patch the UPPERCASE entries into `util.constants`; return the rest as GameConfig sections."""
+    import util.constants as constants
+
+    sections = {}
+    for name, value in overrides.items():
+        if not name.isupper():
+            sections[name] = value
+            continue
+        if not hasattr(constants, name):
+            raise ValueError(f"unknown constant {name!r}")
+        if isinstance(value, list):
+            value = tuple(value)
+        setattr(constants, name, value)
+    return sections
+
+
+def _play(simulation, frames, dt):
+    from util.replay import frame_time_summary
+
+    peaks = {"asteroids": 0, "shots": 0, "updatable": 0}
+    step = simulation.step
+    perf_counter = time.perf_counter
+    frame_times = []
+    for _ in range(frames):
+        if simulation.game_over:
+            break
+        start = perf_counter()
+        step(dt)
+        frame_times.append(perf_counter() - start)
+        for name, count in simulation.entity_counts().items():
+            if count > peaks[name]:
+                peaks[name] = count
+    summary = frame_time_summary(frame_times)
+    return {
+        "score": simulation.score_manager.get_current_score(),
+        "survival_seconds": round(simulation.elapsed, 4),
+        "frames": simulation.frame,
+        "game_over": simulation.game_over,
+        "lives": simulation.lives,
+        "peak_asteroids": peaks["asteroids"],
+        "peak_shots": peaks["shots"],
+        "peak_updatable": peaks["updatable"],
+        "mean_step_ms": round(summary["mean_ms"], 5),
+        "p95_step_ms": round(summary["p95_ms"], 5),
+    }
+
+
+def _run_chunk(task):
+    """Play one chunk of games in a fresh worker process."""
+    config, overrides, bot, frames, dt, seeds = task
+    # every game module copies constants when imported (config dataclass
+    # defaults among them), so nothing may be imported before this
+    sections = _apply_overrides(overrides)
+    import random
+    from classes.simulation import Simulation, init_headless
+    from util.config import DEFAULT_CONFIG
+    from util.input_provider import BOTS
+    from util.logger import configure_logging, configure_snapshots, flush_logs
+
+    game_config = DEFAULT_CONFIG.with_overrides(sections)
+    init_headless()
+    results = []
+    with tempfile.TemporaryDirectory() as log_dir:
+        # workers would otherwise interleave into the game's own logs, and
+        # snapshots would only add their cost to the measured step times
+        configure_snapshots(enabled=False)
+        configure_logging(
+            state_path=os.path.join(log_dir, "game_state.jsonl"),
+            event_path=os.path.join(log_dir, "game_events.jsonl"),
+        )
+        for seed in seeds:
+            random.seed(seed)
+            # explosions are cosmetic and nothing is drawn
+            simulation = Simulation(particles=False, config=game_config)
+            simulation.player.set_input(BOTS[bot](simulation))
+            result = {"config": config, "seed": seed, "bot": bot, "overrides": overrides}
+            result.update(_play(simulation, frames, dt))
+            results.append(result)
+        flush_logs()
+    return results
+
+
+def _tasks(sweep, plan, chunk):
+    for config, seeds in plan.items():
+        overrides = sweep["configs"][config]
+        for start in range(0, len(seeds), chunk):
+            yield config, overrides, sweep["bot"], sweep["frames"], sweep["dt"], seeds[start : start + chunk]
+
+
+def run_sweep(sweep, results_path, workers=None, chunk=DEFAULT_CHUNK, progress=None):
+    """Play every game of `sweep` not yet in `results_path`, appending results as they finish.
+
+    Returns the number of games played. Every chunk runs in its own spawned
+    process, so overrides never leak between configs.
+    """
+    plan = plan_games(sweep, load_results(results_path))
+    total = sum(len(seeds) for seeds in plan.values())
+    if not total:
+        return 0
+    tasks = list(_tasks(sweep, plan, chunk))
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    context = multiprocessing.get_context("spawn")
+    played = 0
+    with open(results_path, "a") as out, context.Pool(workers, maxtasksperchild=1) as pool:
+        for results in pool.imap_unordered(_run_chunk, tasks):
+            for result in results:
+                out.write(json.dumps(result) + "\n")
+            # flushed per chunk so an interrupted sweep keeps what it finished
+            out.flush()
+            played += len(results)
+            if progress is not None:
+                progress(played, total)
+    return played
+
+
+def summarize(results):
+    """Aggregate per-game results into one row per config, in first-seen order."""
+    groups = {}
+    for result in results:
+        groups.setdefault(result["config"], []).append(result)
+    rows = []
+    for config, games in groups.items():
+        scores = [game["score"] for game in games]
+        rows.append({
+            "config": config,
+            "games": len(games),
+            "score_mean": statistics.fmean(scores),
+            "score_median": statistics.median(scores),
+            "survival_mean": statistics.fmean(game["survival_seconds"] for game in games),
+            "game_over_rate": sum(game["game_over"] for game in games) / len(games),
+            "peak_asteroids": max(game["peak_asteroids"] for game in games),
+            "peak_shots": max(game["peak_shots"] for game in games),
+            "mean_step_ms": statistics.fmean(game["mean_step_ms"] for game in games),
+            "p95_step_ms": statistics.fmean(game["p95_step_ms"] for game in games),
+        })
+    return rows
+
+
+def format_table(rows):
+    lines = [
+        f"{'config':<20} {'games':>6} {'score':>9} {'median':>9} {'survived s':>11}"
+        f" {'died':>6} {'rocks':>6} {'shots':>6} {'step ms':>8} {'p95 ms':>8}"
+    ]
+    for row in rows:
+        lines.append(
+            f"{row['config']:<20} {row['games']:>6} {row['score_mean']:9.1f} {row['score_median']:9.1f}"
+            f" {row['survival_mean']:11.1f} {row['game_over_rate']:6.0%} {row['peak_asteroids']:>6}"
+            f" {row['peak_shots']:>6} {row['mean_step_ms']:8.4f} {row['p95_step_ms']:8.4f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run SpaceRocks balance sweeps headless")
+    parser.add_argument("sweep", help="JSON file describing configs and games per config")
+    parser.add_argument("--results", required=True, help="JSONL file results are appended to")
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunk", type=int, default=DEFAULT_CHUNK, help="games per worker process")
+    parser.add_argument("--table-only", action="store_true", help="summarize existing results without playing")
+    args = parser.parse_args(argv)
+
+    sweep = load_sweep(args.sweep)
+    if not args.table_only:
+        start = time.perf_counter()
+
+        def progress(played, total):
+            print(f"\r{played}/{total} games", end="", file=sys.stderr, flush=True)
+
+        played = run_sweep(sweep, args.results, args.workers, args.chunk, progress)
+        elapsed = time.perf_counter() - start
+        if played:
+            print(f"\nplayed {played} games in {elapsed:.1f}s ({played / elapsed:.1f} games/s)", file=sys.stderr)
+    configs = set(sweep["configs"])
+    results = [result for result in load_results(args.results) if result["config"] in configs]
+    print(format_table(summarize(results)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,346 @@
+"""Compact binary form of the game_events / game_state logs.
+
+A file is an 8-byte magic, a little-endian uint32 header length, a JSON
+schema header padded to 8 bytes, then fixed-width little-endian records.
+The header names every record field and the integer codes used for event
+types, snapshot groups and sprite types, so readers never need this module's
+tables to decode a file.
+
+Writing only needs the standard library; reading into record arrays needs
+numpy.
+"""
+import argparse
+import json
+import math
+import struct
+from datetime import datetime
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None
+
+__all__ = [
+    "EVENT_TYPES",
+    "SNAPSHOT_GROUPS",
+    "SPRITE_TYPES",
+    "EventCodec",
+    "StateCodec",
+    "read_header",
+    "read_records",
+    "iter_records",
+    "jsonl_to_binary",
+    "binary_to_jsonl",
+]
+
+MAGIC = b"SRBIN01\n"
+
+# code 0 is reserved for names not in the table
+EVENT_TYPES = (
+    "other",
+    "asteroid_shot",
+    "asteroid_split",
+    "score_added",
+    "player_hit",
+    "combo_increased",
+    "combo_reset",
+)
+SNAPSHOT_GROUPS = ("other", "asteroids", "shots", "player")
+SPRITE_TYPES = ("other", "Asteroid", "Shot", "Player", "StoredAsteroid", "StoredShot")
+
+# absent integer details and absent floats are stored as these sentinels
+MISSING_INT = -1
+MISSING_FLOAT = float("nan")
+
+EVENT_FIELDS = (
+    ("time_of_day", "f8"),
+    ("elapsed", "f4"),
+    ("frame", "u4"),
+    ("type", "u2"),
+    ("score", "i4"),
+    ("multiplier", "i4"),
+    ("toi", "f4"),
+)
+STATE_FIELDS = (
+    ("time_of_day", "f8"),
+    ("elapsed", "f4"),
+    ("frame", "u4"),
+    ("group", "u1"),
+    ("type", "u1"),
+    ("count", "u4"),
+    ("x", "f4"),
+    ("y", "f4"),
+    ("vx", "f4"),
+    ("vy", "f4"),
+    ("radius", "f4"),
+    ("rotation", "f4"),
+)
+_STRUCT_CODES = {"f8": "d", "f4": "f", "u4": "I", "u2": "H", "u1": "B", "i4": "i"}
+
+
+def _struct_for(fields):
+    return struct.Struct("<" + "".join(_STRUCT_CODES[fmt] for _, fmt in fields))
+
+
+def _codes(names):
+    return {name: code for code, name in enumerate(names)}
+
+
+def _time_fields(timestamp, start_time):
+    moment = datetime.fromtimestamp(timestamp)
+    time_of_day = (
+        moment.hour * 3600 + moment.minute * 60 + moment.second + moment.microsecond / 1e6
+    )
+    return time_of_day, timestamp - start_time
+
+
+def _header(kind, fields, tables):
+    schema = {"kind": kind, "fields": [list(field) for field in fields], **tables}
+    body = json.dumps(schema).encode()
+    body += b" " * (-(len(MAGIC) + 4 + len(body)) % 8)
+    return MAGIC + struct.pack("<I", len(body)) + body
+
+
+class EventCodec:
+    """Encodes `(event_type, details)` payloads as fixed-width event records."""
+
+    binary = True
+
+    def __init__(self, start_time):
+        self.start_time = start_time
+        self._struct = _struct_for(EVENT_FIELDS)
+        self._types = _codes(EVENT_TYPES)
+
+    def header(self):
+        return _header("events", EVENT_FIELDS, {"types": list(EVENT_TYPES)})
+
+    def encode(self, timestamp, frame, payload):
+        return self.encode_at(*_time_fields(timestamp, self.start_time), frame, payload)
+
+    def encode_at(self, time_of_day, elapsed, frame, payload):
+        event_type, details = payload
+        return self._struct.pack(
+            time_of_day,
+            elapsed,
+            frame,
+            self._types.get(event_type, 0),
+            details.get("score", MISSING_INT),
+            details.get("multiplier", MISSING_INT),
+            details.get("toi", MISSING_FLOAT),
+        )
+
+
+class StateCodec:
+    """Encodes snapshots as one record per logged sprite.
+
+    Each record repeats its group's live count; single entities such as the
+    player are stored with a count of 0. Providers that are not sprite groups
+    or sprite snapshots (e.g. `screen_size`) are skipped.
+    """
+
+    binary = True
+
+    def __init__(self, start_time):
+        self.start_time = start_time
+        self._struct = _struct_for(STATE_FIELDS)
+        self._groups = _codes(SNAPSHOT_GROUPS)
+        self._types = _codes(SPRITE_TYPES)
+
+    def header(self):
+        return _header(
+            "state",
+            STATE_FIELDS,
+            {"groups": list(SNAPSHOT_GROUPS), "sprite_types": list(SPRITE_TYPES)},
+        )
+
+    def encode(self, timestamp, frame, payload):
+        return self.encode_at(*_time_fields(timestamp, self.start_time), frame, payload)
+
+    def encode_at(self, time_of_day, elapsed, frame, payload):
+        pack = self._struct.pack
+        records = []
+        for name, value in payload.items():
+            if not isinstance(value, dict):
+                continue
+            if "sprites" in value:
+                count = value["count"]
+                sprites = value["sprites"]
+            elif "pos" in value:
+                count = 0
+                sprites = (value,)
+            else:
+                continue
+            group = self._groups.get(name, 0)
+            for sprite in sprites:
+                x, y = sprite["pos"]
+                vx, vy = sprite.get("vel", (MISSING_FLOAT, MISSING_FLOAT))
+                records.append(
+                    pack(
+                        time_of_day,
+                        elapsed,
+                        frame,
+                        group,
+                        self._types.get(sprite["type"], 0),
+                        count,
+                        x,
+                        y,
+                        vx,
+                        vy,
+                        sprite.get("rad", MISSING_FLOAT),
+                        sprite.get("rot", MISSING_FLOAT),
+                    )
+                )
+        return b"".join(records)
+
+
+def read_header(path):
+    """Return `(schema, data_offset)` for a binary log file."""
+    with open(path, "rb") as f:
+        magic = f.read(len(MAGIC))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a SpaceRocks binary log")
+        (length,) = struct.unpack("<I", f.read(4))
+        schema = json.loads(f.read(length))
+    return schema, len(MAGIC) + 4 + length
+
+
+def _dtype(schema):
+    return np.dtype([(name, "<" + fmt) for name, fmt in schema["fields"]])
+
+
+def read_records(path):
+    """Memory-map a binary log and return `(schema, records)` as a NumPy record array."""
+    if np is None:
+        raise ImportError("reading binary logs requires numpy")
+    schema, offset = read_header(path)
+    dtype = _dtype(schema)
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        size = f.tell()
+    count = (size - offset) // dtype.itemsize
+    if count == 0:
+        return schema, np.zeros(0, dtype=dtype).view(np.recarray)
+    records = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+    return schema, records.view(np.recarray)
+
+
+def iter_records(path, chunk_size=65536):
+    """Yield successive record-array chunks of at most `chunk_size` records."""
+    _, records = read_records(path)
+    for start in range(0, len(records), chunk_size):
+        yield records[start : start + chunk_size]
+
+
+def _parse_time_of_day(text):
+    hours, minutes, seconds = text.split(":")
+    return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _format_time_of_day(time_of_day):
+    millis = int(round(time_of_day * 1000))
+    seconds, millis = divmod(millis, 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{millis:03d}"
+
+
+def _number(value):
+    value = round(float(value), 2)
+    return int(value) if value.is_integer() else value
+
+
+def jsonl_to_binary(source, destination, kind):
+    """Convert a `game_events.jsonl` (kind="events") or `game_state.jsonl` (kind="state")."""
+    codec = EventCodec(0.0) if kind == "events" else StateCodec(0.0)
+    with open(source) as src, open(destination, "wb") as dst:
+        dst.write(codec.header())
+        for line in src:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            time_of_day = _parse_time_of_day(entry.pop("timestamp"))
+            elapsed = float(entry.pop("elapsed_s"))
+            frame = entry.pop("frame")
+            if kind == "events":
+                payload = (entry.pop("type"), entry)
+            else:
+                payload = entry
+            dst.write(codec.encode_at(time_of_day, elapsed, frame, payload))
+
+
+def binary_to_jsonl(source, destination):
+    """Convert a binary log back to the JSONL layout written by `util.logger`."""
+    schema, records = read_records(source)
+    with open(destination, "w") as dst:
+        if schema["kind"] == "events":
+            types = schema["types"]
+            for record in records:
+                entry = {
+                    "timestamp": _format_time_of_day(float(record.time_of_day)),
+                    "elapsed_s": math.floor(record.elapsed),
+                    "frame": int(record.frame),
+                    "type": types[record.type],
+                }
+                if record.score != MISSING_INT:
+                    entry["score"] = int(record.score)
+                if record.multiplier != MISSING_INT:
+                    entry["multiplier"] = int(record.multiplier)
+                # files written before the field existed have no toi column
+                toi = getattr(record, "toi", MISSING_FLOAT)
+                if not math.isnan(toi):
+                    entry["toi"] = round(float(toi), 5)
+                dst.write(json.dumps(entry) + "\n")
+            return
+        groups = schema["groups"]
+        sprite_types = schema["sprite_types"]
+        entry = None
+        for record in records:
+            frame = int(record.frame)
+            if entry is None or entry["frame"] != frame:
+                if entry is not None:
+                    dst.write(json.dumps(entry) + "\n")
+                entry = {
+                    "timestamp": _format_time_of_day(float(record.time_of_day)),
+                    "elapsed_s": math.floor(record.elapsed),
+                    "frame": frame,
+                }
+            sprite = {
+                "type": sprite_types[record.type],
+                "pos": [round(float(record.x), 2), round(float(record.y), 2)],
+            }
+            if not math.isnan(record.vx):
+                sprite["vel"] = [round(float(record.vx), 2), round(float(record.vy), 2)]
+            if not math.isnan(record.radius):
+                sprite["rad"] = _number(record.radius)
+            if not math.isnan(record.rotation):
+                sprite["rot"] = _number(record.rotation)
+            if record.count == 0:
+                entry[groups[record.group]] = sprite
+                continue
+            group = entry.setdefault(
+                groups[record.group], {"count": int(record.count), "sprites": []}
+            )
+            group["sprites"].append(sprite)
+        if entry is not None:
+            dst.write(json.dumps(entry) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert SpaceRocks logs between JSONL and binary")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    to_binary = subcommands.add_parser("to-binary")
+    to_binary.add_argument("kind", choices=["events", "state"])
+    to_binary.add_argument("source")
+    to_binary.add_argument("destination")
+    to_jsonl = subcommands.add_parser("to-jsonl")
+    to_jsonl.add_argument("source")
+    to_jsonl.add_argument("destination")
+    args = parser.parse_args(argv)
+    if args.command == "to-binary":
+        jsonl_to_binary(args.source, args.destination, args.kind)
+    else:
+        binary_to_jsonl(args.source, args.destination)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Typed runtime configuration for gameplay tuning.
+
+`GameConfig` groups the tunable values of `util/constants.py` into one
+section per consumer, with defaults equal to those constants, so a run can
+change them without editing source and two configs can be compared in one
+interpreter. Classes take their section at construction time and copy the
+values they use onto the instance, so nothing is looked up per frame.
+
+`load_config` layers, lowest first: the defaults, a TOML or JSON file with
+one table per section, then environment variables named
+`SPACEROCKS_<SECTION>_<FIELD>`:
+
+    [player]
+    speed = 250
+
+    [score]
+    combo_window_seconds = 3.0
+
+    SPACEROCKS_PLAYER_SHOOT_COOLDOWN_SECONDS=0.15
+    SPACEROCKS_DISPLAY_SCORE_COLOR=255,200,0
+"""
+import dataclasses
+import json
+import os
+import tomllib
+from typing import Optional
+from util.constants import (
+    ASTEROID_MAX_RADIUS,
+    ASTEROID_MIN_RADIUS,
+    ASTEROID_SPAWN_BUDGET,
+    ASTEROID_SPAWN_RATE_SECONDS,
+    ASTEROID_SPAWN_SPEED_MAX,
+    ASTEROID_SPAWN_SPEED_MIN,
+    ASTEROID_SPAWN_SPREAD_DEGREES,
+    COMBO_COLOR,
+    COMBO_INITIAL_MULTIPLIER,
+    COMBO_POSITION,
+    COMBO_WINDOW_SECONDS,
+    HIGH_SCORE_COLOR,
+    HIGH_SCORE_FILE,
+    HIGH_SCORE_POSITION,
+    LEADERBOARD_FILE,
+    LEADERBOARD_SIZE,
+    LIVES_COLOR,
+    LIVES_POSITION,
+    PLAYER_LIVES,
+    PLAYER_RESPAWN_INVULN_SECONDS,
+    PLAYER_SHOOT_COOLDOWN_SECONDS,
+    PLAYER_SHOOT_SPEED,
+    PLAYER_SPEED,
+    PLAYER_TURN_SPEED,
+    SCORE_COLOR,
+    SCORE_FONT_SIZE,
+    SCORE_LARGE_ASTEROID,
+    SCORE_MAX,
+    SCORE_MEDIUM_ASTEROID,
+    SCORE_POSITION,
+    SCORE_SMALL_ASTEROID,
+    SHOT_RADIUS,
+)
+
+__all__ = [
+    "PlayerConfig",
+    "AsteroidConfig",
+    "ScoreConfig",
+    "DisplayConfig",
+    "GameConfig",
+    "DEFAULT_CONFIG",
+    "ENV_PREFIX",
+    "load_config",
+]
+
+ENV_PREFIX = "SPACEROCKS_"
+
+Color = tuple[int, int, int]
+Position = tuple[int, int]
+
+
+@dataclasses.dataclass(frozen=True)
+class PlayerConfig:
+    turn_speed: float = PLAYER_TURN_SPEED
+    speed: float = PLAYER_SPEED
+    shoot_speed: float = PLAYER_SHOOT_SPEED
+    shoot_cooldown_seconds: float = PLAYER_SHOOT_COOLDOWN_SECONDS
+    respawn_invuln_seconds: float = PLAYER_RESPAWN_INVULN_SECONDS
+    shot_radius: float = SHOT_RADIUS
+    lives: int = PLAYER_LIVES
+
+
+@dataclasses.dataclass(frozen=True)
+class AsteroidConfig:
+    """The spawn wave used when no spawn profile is given."""
+
+    spawn_rate_seconds: float = ASTEROID_SPAWN_RATE_SECONDS
+    spawn_speed_min: int = ASTEROID_SPAWN_SPEED_MIN
+    spawn_speed_max: int = ASTEROID_SPAWN_SPEED_MAX
+    spawn_spread_degrees: int = ASTEROID_SPAWN_SPREAD_DEGREES
+    spawn_budget: Optional[int] = ASTEROID_SPAWN_BUDGET
+
+
+@dataclasses.dataclass(frozen=True)
+class ScoreConfig:
+    small_asteroid: int = SCORE_SMALL_ASTEROID
+    medium_asteroid: int = SCORE_MEDIUM_ASTEROID
+    large_asteroid: int = SCORE_LARGE_ASTEROID
+    # rocks this small or smaller score as small, this large or larger as large
+    small_asteroid_radius: float = ASTEROID_MIN_RADIUS
+    large_asteroid_radius: float = ASTEROID_MAX_RADIUS
+    max_score: int = SCORE_MAX
+    combo_window_seconds: float = COMBO_WINDOW_SECONDS
+    combo_initial_multiplier: int = COMBO_INITIAL_MULTIPLIER
+    high_score_file: str = HIGH_SCORE_FILE
+    leaderboard_file: str = LEADERBOARD_FILE
+    leaderboard_size: int = LEADERBOARD_SIZE
+
+
+@dataclasses.dataclass(frozen=True)
+class DisplayConfig:
+    font_size: int = SCORE_FONT_SIZE
+    score_color: Color = SCORE_COLOR
+    score_position: Position = SCORE_POSITION
+    combo_color: Color = COMBO_COLOR
+    combo_position: Position = COMBO_POSITION
+    high_score_color: Color = HIGH_SCORE_COLOR
+    high_score_position: Position = HIGH_SCORE_POSITION
+    lives_color: Color = LIVES_COLOR
+    lives_position: Position = LIVES_POSITION
+
+
+@dataclasses.dataclass(frozen=True)
+class GameConfig:
+    player: PlayerConfig = PlayerConfig()
+    asteroids: AsteroidConfig = AsteroidConfig()
+    score: ScoreConfig = ScoreConfig()
+    display: DisplayConfig = DisplayConfig()
+
+    def with_overrides(self, overrides):
+        """Return a copy with `{section: {field: value}}` applied, converting values to the field types."""
+        sections = {}
+        for section, values in overrides.items():
+            current = _section(self, section)
+            if not isinstance(values, dict):
+                raise ValueError(f"config section {section!r} must be a table")
+            changes = {}
+            for name, value in values.items():
+                changes[name] = _convert(_field(current, section, name), value)
+            sections[section] = dataclasses.replace(current, **changes)
+        return dataclasses.replace(self, **sections)
+
+
+DEFAULT_CONFIG = GameConfig()
+
+
+def _section(config, section):
+    if section not in {field.name for field in dataclasses.fields(config)}:
+        raise ValueError(f"unknown config section {section!r}")
+    return getattr(config, section)
+
+
+def _field(section_config, section, name):
+    for field in dataclasses.fields(section_config):
+        if field.name == name:
+            return field
+    raise ValueError(f"unknown config field {section}.{name}")
+
+
+def _convert(field, value):
+    kind = field.type
+    if kind == Optional[int]:
+        if value is None or (isinstance(value, str) and value.lower() in ("", "none")):
+            return None
+        kind = int
+    if kind in (Color, Position):
+        if isinstance(value, str):
+            value = value.split(",")
+        value = tuple(int(part) for part in value)
+        expected = 3 if kind == Color else 2
+        if len(value) != expected:
+            raise ValueError(f"{field.name} needs {expected} values, got {len(value)}")
+        return value
+    if kind is int and isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"{field.name} must be an integer, got {value}")
+    return kind(value)
+
+
+def _env_overrides(config, environ):
+    overrides = {}
+    for field in dataclasses.fields(config):
+        for entry in dataclasses.fields(getattr(config, field.name)):
+            key = f"{ENV_PREFIX}{field.name}_{entry.name}".upper()
+            if key in environ:
+                overrides.setdefault(field.name, {})[entry.name] = environ[key]
+    return overrides
+
+
+def load_config(path=None, environ=None, base=DEFAULT_CONFIG):
+    """Build a GameConfig from `base`, an optional TOML/JSON file and `SPACEROCKS_*` variables."""
+    config = base
+    if path is not None:
+        if path.endswith(".toml"):
+            with open(path, "rb") as f:
+                data = tomllib.load(f)
+        else:
+            with open(path, "r") as f:
+                data = json.load(f)
+        config = config.with_overrides(data)
+    if environ is None:
+        environ = os.environ
+    return config.with_overrides(_env_overrides(config, environ))
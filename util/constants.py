@@ -7,12 +7,47 @@ PLAYER_SPEED = 200
 ASTEROID_MIN_RADIUS = 20
 ASTEROID_KINDS = 3
 ASTEROID_SPAWN_RATE_SECONDS = 0.8
+ASTEROID_SPAWN_SPEED_MIN = 40       # Default spawn wave speed range, px/s
+ASTEROID_SPAWN_SPEED_MAX = 100
+ASTEROID_SPAWN_SPREAD_DEGREES = 30  # Spawn heading varies this much either way
+ASTEROID_SPAWN_BUDGET = 150         # Spawning pauses at this many live rocks
 ASTEROID_MAX_RADIUS = ASTEROID_MIN_RADIUS * ASTEROID_KINDS
 SHOT_RADIUS = 5
+ASTEROID_LUMPY = True             # Polygon outlines and hit tests instead of circles
+ASTEROID_VERTICES = 11            # Outline vertices per rock
+ASTEROID_LUMPINESS = 0.3          # Vertices sit between (1 - this) and 1 radius out
+ASTEROID_OUTLINE_VARIANTS = 8     # Distinct outlines per rock size
+SHOT_LIFETIME_SECONDS = 3.0
 PLAYER_SHOOT_SPEED = 500
 PLAYER_SHOOT_COOLDOWN_SECONDS = 0.3
 PLAYER_LIVES = 3
 PLAYER_RESPAWN_INVULN_SECONDS = 2.0
+SIMULATION_DT = 1 / 60              # Fixed simulation timestep in seconds
+MAX_SIMULATION_STEPS_PER_FRAME = 5  # Catch-up limit before dropping time
+CULL_MARGIN = ASTEROID_MAX_RADIUS  # Matches the AsteroidField spawn offset
+COLLISION_BATCH_MIN_PAIRS = 400    # Rocks x shots below which per-sprite checks are faster
+COLLISION_BATCH_MAX_PAIRS = 50000  # Rocks x shots above which the spatial hash is faster
+SCREEN_WRAP = False                # Objects leaving one edge re-enter at the opposite one
+WRAP_MAX_ASTEROIDS = 40            # Spawning pauses at this many rocks while wrapping
+
+# Object pools (killed instances kept for reuse)
+ASTEROID_POOL_CAP = 256
+SHOT_POOL_CAP = 64
+
+# Array-backed entity store (requires numpy)
+ENTITY_STORE_ENABLED = False    # Integrate asteroids and shots in bulk
+ENTITY_STORE_CAPACITY = 1024    # Initial slots; doubles when full
+ENTITY_STORE_CHUNK_PAIRS = 16384  # Asteroid x shot pairs tested per collision batch
+
+# Explosion particles (requires numpy)
+PARTICLES_ENABLED = True        # Bursts when rocks split and the ship is hit
+PARTICLE_CAPACITY = 16384       # Live particles; the oldest are overwritten when full
+PARTICLE_SIZE = 2               # Square side in pixels
+PARTICLE_SPEED = 120            # Fastest burst speed, px/s
+PARTICLE_LIFETIME_SECONDS = 0.8 # Longest particle life
+PARTICLES_PER_SPLIT = 12        # Per asteroid kind, so large rocks burst more
+PARTICLES_PER_PLAYER_HIT = 120
+PLAYER_HIT_PARTICLE_COLOR = (255, 160, 40)
 
 # Scoring System
 SCORE_SMALL_ASTEROID = 50       # Points for smallest asteroid
@@ -37,3 +72,27 @@ LIVES_POSITION = (10, 130)      # Below high score
 
 # High Score Persistence
 HIGH_SCORE_FILE = "highscore.json"  # File to store high score
+LEADERBOARD_FILE = "leaderboard.sqlite3"  # SQLite file of the best finished runs
+LEADERBOARD_SIZE = 100              # Runs kept on the leaderboard
+
+# Logging
+LOG_FORMAT = "jsonl"              # "jsonl" or "binary" (see util/binlog.py)
+LOG_FLUSH_INTERVAL_SECONDS = 0.5  # Background writer flush period
+LOG_FLUSH_SIZE = 1024             # Queued records that trigger an early flush
+
+# State snapshots
+SNAPSHOT_INTERVAL_FRAMES = 60     # Frames between game_state.jsonl entries
+SNAPSHOT_MAX_SECONDS = None       # Stop after this much game time; None = never
+SNAPSHOT_SPRITE_LIMIT = 10        # Sprites logged per group; None = all
+
+# Profiling
+PROFILER_WINDOW_FRAMES = 600      # Frames kept for rolling percentiles
+PROFILER_OVERLAY_REFRESH_SECONDS = 0.25  # How often the on-screen stats redraw
+PROFILER_OVERLAY_POSITION = (10, 170)    # Below the HUD
+PROFILER_OVERLAY_COLOR = (0, 255, 0)
+
+# Rendering
+RENDER_BATCHED = True             # Blit cached sprites instead of pygame.draw per entity
+SHIP_ROTATION_STEPS = 360         # Cached ship orientations (1 degree each)
+RENDER_DIRTY_RECTS = True         # Update only changed areas instead of flipping
+DIRTY_RECT_MAX_FRACTION = 0.3     # Dirty share of the screen that forces a full flip
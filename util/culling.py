@@ -0,0 +1,57 @@
+from util.constants import CULL_MARGIN, SCREEN_HEIGHT, SCREEN_WIDTH
+
+__all__ = ["Culler"]
+
+
+class Culler:
+    """Kills sprites that have drifted past the playfield margin or outlived their lifetime.
+
+    The margin defaults to the offset `AsteroidField.edges` spawns at, so a
+    freshly spawned asteroid sitting on the spawn line is never culled.
+    """
+
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, margin=CULL_MARGIN):
+        self.min_x = -margin
+        self.min_y = -margin
+        self.max_x = width + margin
+        self.max_y = height + margin
+        self.culled = {}
+        self.total_culled = 0
+
+    def is_out_of_bounds(self, sprite):
+        x = sprite.position.x
+        y = sprite.position.y
+        return x < self.min_x or x > self.max_x or y < self.min_y or y > self.max_y
+
+    def is_expired(self, sprite):
+        lifetime = sprite.lifetime
+        return lifetime is not None and sprite.age > lifetime
+
+    def cull(self, sprites):
+        """Kill every out-of-bounds or expired sprite and return how many were removed."""
+        return self._kill([
+            sprite for sprite in sprites if self.is_out_of_bounds(sprite) or self.is_expired(sprite)
+        ])
+
+    def cull_store(self, store, kind, lifetime=None):
+        """`cull` for the entities of one kind in a `util.entity_store.EntityStore`.
+
+        The bounds and lifetime are tested on the store's arrays in one pass,
+        so only the sprites being removed are touched.
+        """
+        owners = store.owners
+        slots = store.outside(kind, self.min_x, self.min_y, self.max_x, self.max_y, lifetime)
+        return self._kill([owners[slot] for slot in slots.tolist()])
+
+    def _kill(self, sprites):
+        culled = self.culled
+        for sprite in sprites:
+            sprite.kill()
+            name = sprite.__class__.__name__
+            culled[name] = culled.get(name, 0) + 1
+        self.total_culled += len(sprites)
+        return len(sprites)
+
+    def reset_counters(self):
+        self.culled.clear()
+        self.total_culled = 0
@@ -0,0 +1,200 @@
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None
+
+from util.collision import circle_hits, circle_pair_mask
+from util.constants import ENTITY_STORE_CAPACITY, ENTITY_STORE_CHUNK_PAIRS
+
+__all__ = ["EntityStore", "KIND_ASTEROID", "KIND_SHOT", "numpy_available"]
+
+KIND_ASTEROID = 0
+KIND_SHOT = 1
+
+
+def numpy_available():
+    return np is not None
+
+
+class EntityStore:
+    """Structure-of-arrays storage for moving circles.
+
+    Positions, velocities, radii, ages and alive flags live in contiguous
+    NumPy arrays indexed by slot, so a whole frame of movement is a single
+    vectorized step. `owners` maps each slot back to the sprite using it.
+
+    Released slots keep their data until `reclaim()` is called, so a sprite
+    killed mid-frame can still be read until the frame ends.
+
+    After `begin_step()`, slots allocated during the step sit out that
+    step's `integrate`, as a sprite created while its group is updating is
+    not updated until the next frame.
+    """
+
+    def __init__(self, capacity=ENTITY_STORE_CAPACITY):
+        if np is None:
+            raise ImportError("EntityStore requires numpy")
+        self.position = np.zeros((capacity, 2))
+        self.velocity = np.zeros((capacity, 2))
+        self.radius = np.zeros(capacity)
+        self.age = np.zeros(capacity)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.owners = [None] * capacity
+        self._free = list(range(capacity - 1, -1, -1))
+        self._released = []
+        self._high_water = 0
+        # slots allocated since begin_step(); None until a step has begun
+        self._born = None
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive[: self._high_water]))
+
+    @property
+    def capacity(self):
+        return len(self.owners)
+
+    def allocate(self, kind, owner=None):
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self.position[slot] = 0.0
+        self.velocity[slot] = 0.0
+        self.radius[slot] = 0.0
+        self.age[slot] = 0.0
+        self.kind[slot] = kind
+        self.alive[slot] = True
+        self.owners[slot] = owner
+        if slot >= self._high_water:
+            self._high_water = slot + 1
+        if self._born is not None:
+            self._born.append(slot)
+        return slot
+
+    def release(self, slot):
+        self.alive[slot] = False
+        self._released.append(slot)
+
+    def reclaim(self):
+        """Make slots released since the last call available again."""
+        for slot in self._released:
+            self.velocity[slot] = 0.0
+            self.owners[slot] = None
+            self._free.append(slot)
+        self._released.clear()
+
+    def _grow(self):
+        old = self.capacity
+        new = old * 2
+        self.position = np.resize(self.position, (new, 2))
+        self.velocity = np.resize(self.velocity, (new, 2))
+        self.radius = np.resize(self.radius, new)
+        self.age = np.resize(self.age, new)
+        self.kind = np.resize(self.kind, new)
+        self.alive = np.resize(self.alive, new)
+        self.alive[old:] = False
+        self.velocity[old:] = 0.0
+        self.owners.extend([None] * (new - old))
+        self._free.extend(range(new - 1, old - 1, -1))
+
+    def begin_step(self):
+        """Mark the start of a step; see `integrate`."""
+        self._born = []
+
+    def integrate(self, dt):
+        """Advance every entity that existed at `begin_step` by `dt` seconds in one step."""
+        n = self._high_water
+        born = self._born
+        if born:
+            # restoring a handful of rows beats masking the whole range
+            born = np.array(born)
+            position = self.position[born]
+            age = self.age[born]
+        self.position[:n] += self.velocity[:n] * dt
+        self.age[:n] += dt
+        if born is not None and len(born):
+            self.position[born] = position
+            self.age[born] = age
+
+    def slots(self, kind):
+        n = self._high_water
+        return np.flatnonzero(self.alive[:n] & (self.kind[:n] == kind))
+
+    def outside(self, kind, min_x, min_y, max_x, max_y, lifetime=None):
+        """Slots of live `kind` entities outside the box or older than `lifetime`, in slot order."""
+        slots = self.slots(kind)
+        position = self.position[slots]
+        x = position[:, 0]
+        y = position[:, 1]
+        mask = (x < min_x) | (x > max_x) | (y < min_y) | (y > max_y)
+        if lifetime is not None:
+            mask |= self.age[slots] > lifetime
+        return slots[mask]
+
+    def wrap(self, torus):
+        """Fold every position back onto the `util.torus.Torus` playfield."""
+        n = self._high_water
+        np.mod(self.position[:n], (torus.width, torus.height), out=self.position[:n])
+
+    def collision_mask(self, kind_a, kind_b, torus=None, dt=None):
+        """Return (slots_a, slots_b, mask) where mask[i, j] is True if a[i] and b[j] overlap.
+
+        Uses `util.collision.circle_pair_mask`. With a `torus`, offsets use
+        the minimum image. With `dt`, the test is swept over the last step's
+        straight-line motion (see `util.collision.shot_time_of_impact`), so a
+        pair counts if it touched at any point during the step.
+        """
+        slots_a = self.slots(kind_a)
+        slots_b = self.slots(kind_b)
+        if len(slots_a) == 0 or len(slots_b) == 0:
+            return slots_a, slots_b, np.zeros((len(slots_a), len(slots_b)), dtype=bool)
+        return slots_a, slots_b, self._pair_mask(slots_a, self._side(slots_b, dt), torus, dt)
+
+    def _side(self, slots_b, dt):
+        """The b-side arrays of `_pair_mask`, gathered once for every chunk of a."""
+        motion_b = None
+        if dt is not None:
+            motion_b = self.velocity[slots_b] * np.minimum(self.age[slots_b], dt)[:, None]
+        return self.position[slots_b], self.radius[slots_b], motion_b
+
+    def _pair_mask(self, slots_a, side_b, torus, dt):
+        positions_b, radii_b, motion_b = side_b
+        motion_a = None if dt is None else self.velocity[slots_a] * dt
+        return circle_pair_mask(
+            self.position[slots_a],
+            self.radius[slots_a],
+            positions_b,
+            radii_b,
+            torus,
+            motion_a,
+            motion_b,
+        )
+
+    def overlaps(self, kind_a, kind_b, torus=None, dt=None):
+        """Return {owner_a: [owner_b, ...]} for every colliding pair.
+
+        Tests the same pairs as `collision_mask`, but a few rows of `kind_a`
+        at a time, so the temporaries never exceed ENTITY_STORE_CHUNK_PAIRS
+        entries however many entities are alive.
+        """
+        slots_a = self.slots(kind_a)
+        slots_b = self.slots(kind_b)
+        result = {}
+        if len(slots_a) == 0 or len(slots_b) == 0:
+            return result
+        side_b = self._side(slots_b, dt)
+        owners = self.owners
+        rows = max(1, ENTITY_STORE_CHUNK_PAIRS // len(slots_b))
+        for start in range(0, len(slots_a), rows):
+            chunk = slots_a[start : start + rows]
+            hit_a, hit_b = np.nonzero(self._pair_mask(chunk, side_b, torus, dt))
+            for a, b in zip(chunk[hit_a].tolist(), slots_b[hit_b].tolist()):
+                result.setdefault(owners[a], []).append(owners[b])
+        return result
+
+    def touching(self, kind, position, radius, torus=None):
+        """Owners of every live `kind` entity overlapping one circle, in one vectorized test."""
+        slots = self.slots(kind)
+        hits = circle_hits(position, radius, self.position[slots], self.radius[slots], torus)
+        owners = self.owners
+        return [owners[slot] for slot in slots[hits].tolist()]
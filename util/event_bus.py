@@ -0,0 +1,43 @@
+"""A per-step event bus.
+
+Producers publish small records under a topic while a step runs; nothing
+is delivered until `dispatch`, which hands each subscriber the whole batch
+of records for its topic in publish order. Subscribers are called in the
+order they subscribed, so one subscriber can rely on an earlier one having
+already seen the batch (the logger reads the score after scoring ran).
+
+The simulation publishes:
+
+    ASTEROID_HIT    (rock_radius, time_of_impact, split) for every rock a shot
+                    destroyed; `split` is True if it broke into smaller rocks
+"""
+
+__all__ = ["ASTEROID_HIT", "EventBus"]
+
+ASTEROID_HIT = "asteroid_hit"
+
+
+class EventBus:
+    def __init__(self):
+        self._subscribers = {}
+        self._pending = {}
+
+    def subscribe(self, topic, handler):
+        """Call `handler(records)` with each non-empty batch published under `topic`."""
+        self._subscribers.setdefault(topic, []).append(handler)
+        self._pending.setdefault(topic, [])
+
+    def publish(self, topic, record):
+        # records for topics nobody listens to are dropped
+        pending = self._pending.get(topic)
+        if pending is not None:
+            pending.append(record)
+
+    def dispatch(self):
+        """Deliver and clear everything published since the last dispatch."""
+        for topic, records in list(self._pending.items()):
+            if not records:
+                continue
+            self._pending[topic] = []
+            for handler in self._subscribers[topic]:
+                handler(records)
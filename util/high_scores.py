@@ -0,0 +1,159 @@
+"""High score and leaderboard persistence off the game thread.
+
+The best score lives in a small JSON file that is replaced atomically: the
+new contents go to a temporary file in the same directory, are fsynced and
+then renamed over the old file, so a crash leaves either the old or the new
+score, never a torn file. Finished runs go to a SQLite leaderboard holding
+the best `size` runs with their metadata; the rank of a score is a count
+over the score index rather than a rewrite of the whole board.
+
+All writes and leaderboard queries run in order on one background thread
+and return `concurrent.futures.Future`s. Failures are reported with a
+warning instead of being swallowed. Pending writes finish before the
+interpreter exits.
+"""
+import contextlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from util.constants import HIGH_SCORE_FILE, LEADERBOARD_FILE, LEADERBOARD_SIZE
+
+__all__ = ["atomic_write_json", "HighScoreStore"]
+
+
+def atomic_write_json(path, data):
+    """Write `data` as JSON to `path` so readers see the old or the new file, never a mix."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+
+
+def _warn_on_failure(future):
+    error = future.exception()
+    if error is not None:
+        warnings.warn(f"high score persistence failed: {error!r}", RuntimeWarning)
+
+
+class HighScoreStore:
+    """The best score plus a leaderboard of finished runs.
+
+    The worker thread, and the SQLite connection it owns, are only created
+    on the first write or query.
+    """
+
+    def __init__(self, path=HIGH_SCORE_FILE, leaderboard_path=LEADERBOARD_FILE, size=LEADERBOARD_SIZE):
+        self.path = path
+        self.leaderboard_path = leaderboard_path
+        self.size = size
+        self._best = None
+        self._executor = None
+        self._connection = None  # only used on the worker thread
+
+    def best(self):
+        """The best score, read from disk once and kept up to date by `save_best`."""
+        if self._best is None:
+            self._best = self._read_best()
+        return self._best
+
+    def _read_best(self):
+        try:
+            with open(self.path, "r") as f:
+                return int(json.load(f).get("high_score", 0))
+        except FileNotFoundError:
+            return 0
+        except (OSError, ValueError, TypeError, AttributeError) as error:
+            warnings.warn(f"ignoring unreadable high score file {self.path}: {error}", RuntimeWarning)
+            return 0
+
+    def save_best(self, score):
+        """Make `score` the best score and replace the file in the background."""
+        self._best = score
+        return self._submit(atomic_write_json, self.path, {"high_score": score})
+
+    def record(self, score, **metadata):
+        """Add a finished run to the leaderboard; the Future resolves to its rank."""
+        return self._submit(self._insert, score, time.time(), json.dumps(metadata, sort_keys=True))
+
+    def rank(self, score):
+        """Future of the 1-based rank `score` would take on the board."""
+        return self._submit(self._rank, score)
+
+    def top(self, count=None):
+        """Future of the best runs as dicts of `score`, `played_at` and their metadata."""
+        return self._submit(self._top, self.size if count is None else count)
+
+    def flush(self):
+        """Block until every queued write and query has finished."""
+        if self._executor is not None:
+            self._executor.submit(int).result()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.submit(self._close_connection)
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _submit(self, func, *args):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="high-scores")
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(_warn_on_failure)
+        return future
+
+    # everything below runs on the worker thread
+
+    def _db(self):
+        if self._connection is None:
+            connection = sqlite3.connect(self.leaderboard_path)
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS runs ("
+                    "id INTEGER PRIMARY KEY, score INTEGER NOT NULL, "
+                    "played_at REAL NOT NULL, metadata TEXT NOT NULL)"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS runs_by_score ON runs (score)")
+            self._connection = connection
+        return self._connection
+
+    def _insert(self, score, played_at, metadata):
+        db = self._db()
+        with db:
+            db.execute(
+                "INSERT INTO runs (score, played_at, metadata) VALUES (?, ?, ?)",
+                (score, played_at, metadata),
+            )
+            # keep the best `size` runs; on ties the earlier run stays
+            db.execute(
+                "DELETE FROM runs WHERE id NOT IN "
+                "(SELECT id FROM runs ORDER BY score DESC, id LIMIT ?)",
+                (self.size,),
+            )
+        return self._rank(score)
+
+    def _rank(self, score):
+        (better,) = self._db().execute("SELECT COUNT(*) FROM runs WHERE score > ?", (score,)).fetchone()
+        return better + 1
+
+    def _top(self, count):
+        rows = self._db().execute(
+            "SELECT score, played_at, metadata FROM runs ORDER BY score DESC, id LIMIT ?", (count,)
+        )
+        return [{"score": score, "played_at": played_at, **json.loads(metadata)} for score, played_at, metadata in rows]
+
+    def _close_connection(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
@@ -0,0 +1,122 @@
+"""Pluggable sources of player input.
+
+An input provider is any callable that returns the current key state, read
+like `pygame.key.get_pressed()`: `keys[pygame.K_SPACE]` is truthy while the
+key is held. `Player.update` calls its provider once per step, so a provider
+sees every simulation step exactly once:
+
+    simulation.player.set_input(AimingBot(simulation))
+
+`KeyboardInput` is the default. `ReplayInput` plays back recorded key
+bitmasks and the bots in `BOTS` drive the ship from the live entity
+positions, which makes headless runs play like a busy human would.
+"""
+import math
+import pygame
+from util.replay import RECORDED_KEYS, KeyState, encode_keys
+
+__all__ = [
+    "KeyboardInput",
+    "ReplayInput",
+    "IdleBot",
+    "SpinnerBot",
+    "AimingBot",
+    "BOTS",
+]
+
+
+class KeyboardInput:
+    """The real keyboard."""
+
+    def __call__(self):
+        return pygame.key.get_pressed()
+
+
+class ReplayInput:
+    """Plays back one recorded key bitmask per call; all keys are up once they run out."""
+
+    def __init__(self, key_bits):
+        self._bits = iter(key_bits)
+        self._keys = KeyState()
+
+    def __call__(self):
+        self._keys.bits = next(self._bits, 0)
+        return self._keys
+
+
+class IdleBot:
+    """Never touches the controls."""
+
+    def __init__(self, simulation=None):
+        self._keys = KeyState()
+
+    def __call__(self):
+        return self._keys
+
+
+class SpinnerBot:
+    """Turns and fires constantly."""
+
+    def __init__(self, simulation=None):
+        held = {pygame.K_d, pygame.K_SPACE}
+        self._keys = KeyState(encode_keys({key: key in held for _, key in RECORDED_KEYS}))
+
+    def __call__(self):
+        return self._keys
+
+
+class AimingBot:
+    """Turns towards the nearest rock and fires once it is within `tolerance` degrees.
+
+    Distances are taken across the screen edges when the simulation wraps.
+    """
+
+    _FORWARD = pygame.Vector2(0, 1)
+
+    def __init__(self, simulation, tolerance=8.0):
+        self.simulation = simulation
+        self.tolerance = tolerance
+        self._keys = KeyState()
+        self._pressed = {key: False for _, key in RECORDED_KEYS}
+
+    def target(self):
+        """Return the vector from the ship to the nearest rock, or None without rocks."""
+        simulation = self.simulation
+        position = simulation.player.position
+        torus = simulation.torus
+        nearest = None
+        nearest_distance = math.inf
+        for rock in simulation.asteroids:
+            if torus is not None:
+                dx, dy = torus.delta(position, rock.position)
+            else:
+                dx = rock.position.x - position.x
+                dy = rock.position.y - position.y
+            distance = dx * dx + dy * dy
+            if distance < nearest_distance:
+                nearest = (dx, dy)
+                nearest_distance = distance
+        return None if nearest is None else pygame.Vector2(nearest)
+
+    def __call__(self):
+        pressed = self._pressed
+        for key in pressed:
+            pressed[key] = False
+        target = self.target()
+        if target is not None:
+            heading = self._FORWARD.angle_to(target)
+            turn = (heading - self.simulation.player.rotation + 180) % 360 - 180
+            tolerance = self.tolerance
+            pressed[pygame.K_d] = turn > tolerance
+            pressed[pygame.K_a] = turn < -tolerance
+            pressed[pygame.K_SPACE] = abs(turn) <= tolerance
+        self._keys.bits = encode_keys(pressed)
+        return self._keys
+
+
+# name -> factory(simulation) returning an input provider
+BOTS = {
+    "idle": IdleBot,
+    "spinner": SpinnerBot,
+    "aimer": AimingBot,
+}
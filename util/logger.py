@@ -1,138 +1,290 @@
-import inspect
+import atexit
 import json
 import math
+import threading
+import time
+from collections import deque
 from datetime import datetime
+from util.binlog import EventCodec, StateCodec
+from util.constants import (
+    LOG_FORMAT,
+    LOG_FLUSH_INTERVAL_SECONDS,
+    LOG_FLUSH_SIZE,
+    SNAPSHOT_INTERVAL_FRAMES,
+    SNAPSHOT_MAX_SECONDS,
+    SNAPSHOT_SPRITE_LIMIT,
+    SIMULATION_DT,
+)
+
+__all__ = [
+    "log_state",
+    "log_event",
+    "log_events",
+    "log_score_added",
+    "log_combo_increased",
+    "log_combo_reset",
+    "configure_logging",
+    "flush_logs",
+    "register_snapshot_group",
+    "snapshot_group",
+    "register_snapshot_entity",
+    "register_snapshot_provider",
+    "unregister_snapshot",
+    "clear_snapshot_providers",
+    "configure_snapshots",
+]
+
+_snapshot_interval = SNAPSHOT_INTERVAL_FRAMES
+_snapshot_max_frames = (
+    None if SNAPSHOT_MAX_SECONDS is None else round(SNAPSHOT_MAX_SECONDS / SIMULATION_DT)
+)
+_sprite_limit = SNAPSHOT_SPRITE_LIMIT
+_snapshots_enabled = True
+_snapshot_providers = {}
 
-__all__ = ["log_state", "log_event", "log_score_added", "log_combo_increased", "log_combo_reset"]
+_frame_count = 0
+_start_time = time.time()
+
+
+class _JsonlCodec:
+    binary = False
+
+    def __init__(self, format_record):
+        self._format_record = format_record
+
+    def header(self):
+        return ""
+
+    def encode(self, timestamp, frame, payload):
+        return self._format_record(timestamp, frame, payload) + "\n"
+
+
+class _BufferedLog:
+    """Append-only log file fed from an in-memory queue by a writer thread.
+
+    The game thread only appends `(timestamp, frame, payload)` tuples; the
+    writer encodes them with `codec` (JSONL or `util.binlog`) and writes them
+    every `flush_interval` seconds, or sooner once `flush_size` records are
+    waiting. The file is truncated on the first write of each run.
+    """
+
+    def __init__(self, path, codec):
+        self.path = path
+        self.codec = codec
+        self.flush_interval = LOG_FLUSH_INTERVAL_SECONDS
+        self.flush_size = LOG_FLUSH_SIZE
+        self._queue = deque()
+        self._wake = threading.Event()
+        self._write_lock = threading.Lock()
+        self._thread = None
+        self._file = None
+
+    def append(self, payload):
+        self._queue.append((time.time(), _frame_count, payload))
+        if self._thread is None:
+            self._start()
+        elif len(self._queue) >= self.flush_size:
+            self._wake.set()
+
+    def extend(self, payloads):
+        timestamp = time.time()
+        self._queue.extend((timestamp, _frame_count, payload) for payload in payloads)
+        if self._thread is None:
+            self._start()
+        elif len(self._queue) >= self.flush_size:
+            self._wake.set()
+
+    def _start(self):
+        self._thread = threading.Thread(
+            target=self._run, name=f"log-writer:{self.path}", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write everything queued so far. Safe to call from any thread."""
+        with self._write_lock:
+            if not self._queue:
+                return
+            codec = self.codec
+            encode = codec.encode
+            chunks = []
+            popleft = self._queue.popleft
+            try:
+                while True:
+                    chunks.append(encode(*popleft()))
+            except IndexError:
+                pass
+            if self._file is None:
+                self._file = open(self.path, "wb" if codec.binary else "w")
+                self._file.write(codec.header())
+            self._file.writelines(chunks)
+            self._file.flush()
+
+    def reopen(self, path, codec=None):
+        with self._write_lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self.path = path
+            if codec is not None:
+                self.codec = codec
+
+
+def _timestamp_fields(timestamp):
+    now = datetime.fromtimestamp(timestamp)
+    return {
+        "timestamp": now.strftime("%H:%M:%S.%f")[:-3],
+        "elapsed_s": math.floor(timestamp - _start_time),
+    }
 
-_FPS = 60
-_MAX_SECONDS = 16
-_SPRITE_SAMPLE_LIMIT = 10  # Maximum number of sprites to log per group
 
-_frame_count = 0
-_state_log_initialized = False
-_event_log_initialized = False
-_start_time = datetime.now()
+def _format_state(timestamp, frame, state):
+    return json.dumps({**_timestamp_fields(timestamp), "frame": frame, **state})
 
 
-def log_state():
-    global _frame_count, _state_log_initialized
+def _format_event(timestamp, frame, event):
+    event_type, details = event
+    return json.dumps(
+        {**_timestamp_fields(timestamp), "frame": frame, "type": event_type, **details}
+    )
 
-    # Stop logging after `_MAX_SECONDS` seconds
-    if _frame_count > _FPS * _MAX_SECONDS:
-        return
 
-    # Take a snapshot approx. once per second
-    _frame_count += 1
-    if _frame_count % _FPS != 0:
-        return
+def _codecs(log_format):
+    if log_format == "binary":
+        return StateCodec(_start_time), EventCodec(_start_time), ".bin"
+    if log_format == "jsonl":
+        return _JsonlCodec(_format_state), _JsonlCodec(_format_event), ".jsonl"
+    raise ValueError(f"unknown log format: {log_format!r}")
 
-    now = datetime.now()
 
-    frame = inspect.currentframe()
-    if frame is None:
-        return
+_state_codec, _event_codec, _extension = _codecs(LOG_FORMAT)
+_state_log = _BufferedLog("game_state" + _extension, _state_codec)
+_event_log = _BufferedLog("game_events" + _extension, _event_codec)
 
-    frame_back = frame.f_back
-    if frame_back is None:
-        return
 
-    local_vars = frame_back.f_locals.copy()
+def configure_logging(
+    state_path=None,
+    event_path=None,
+    flush_interval=None,
+    flush_size=None,
+    log_format=None,
+):
+    """Change log destinations, format or buffering. Pending records are flushed first.
 
-    screen_size = []
-    game_state = {}
+    Switching `log_format` ("jsonl" or "binary") without a path moves that log
+    to `game_state` / `game_events` with the format's extension.
+    """
+    flush_logs()
+    state_codec = event_codec = None
+    if log_format is not None:
+        state_codec, event_codec, extension = _codecs(log_format)
+        state_path = state_path or "game_state" + extension
+        event_path = event_path or "game_events" + extension
+    for log, path, codec in (
+        (_state_log, state_path, state_codec),
+        (_event_log, event_path, event_codec),
+    ):
+        if path is not None:
+            log.reopen(path, codec)
+        if flush_interval is not None:
+            log.flush_interval = flush_interval
+        if flush_size is not None:
+            log.flush_size = flush_size
+        # let a sleeping writer pick up the new interval
+        log._wake.set()
 
-    for key, value in local_vars.items():
-        if "pygame" in str(type(value)) and hasattr(value, "get_size"):
-            screen_size = value.get_size()
 
-        if hasattr(value, "__class__") and "Group" in value.__class__.__name__:
-            sprites_data = []
+def flush_logs():
+    _state_log.flush()
+    _event_log.flush()
 
-            for i, sprite in enumerate(value):
-                if i >= _SPRITE_SAMPLE_LIMIT:
-                    break
 
-                sprite_info = {"type": sprite.__class__.__name__}
+atexit.register(flush_logs)
 
-                if hasattr(sprite, "position"):
-                    sprite_info["pos"] = [
-                        round(sprite.position.x, 2),
-                        round(sprite.position.y, 2),
-                    ]
 
-                if hasattr(sprite, "velocity"):
-                    sprite_info["vel"] = [
-                        round(sprite.velocity.x, 2),
-                        round(sprite.velocity.y, 2),
-                    ]
+def register_snapshot_group(name, group):
+    """Include every sprite of `group` in state snapshots under `name`."""
+    _snapshot_providers[name] = lambda: snapshot_group(group)
 
-                if hasattr(sprite, "radius"):
-                    sprite_info["rad"] = sprite.radius
 
-                if hasattr(sprite, "rotation"):
-                    sprite_info["rot"] = round(sprite.rotation, 2)
+def register_snapshot_entity(name, entity):
+    """Include a single entity's `snapshot()` in state snapshots under `name`."""
+    _snapshot_providers[name] = entity.snapshot
 
-                sprites_data.append(sprite_info)
 
-            game_state[key] = {"count": len(value), "sprites": sprites_data}
+def register_snapshot_provider(name, provider):
+    """Include the JSON-serializable result of `provider()` under `name`."""
+    _snapshot_providers[name] = provider
 
-        if len(game_state) == 0 and hasattr(value, "position"):
-            sprite_info = {"type": value.__class__.__name__}
 
-            sprite_info["pos"] = [
-                round(value.position.x, 2),
-                round(value.position.y, 2),
-            ]
+def unregister_snapshot(name):
+    _snapshot_providers.pop(name, None)
 
-            if hasattr(value, "velocity"):
-                sprite_info["vel"] = [
-                    round(value.velocity.x, 2),
-                    round(value.velocity.y, 2),
-                ]
 
-            if hasattr(value, "radius"):
-                sprite_info["rad"] = value.radius
+def clear_snapshot_providers():
+    _snapshot_providers.clear()
 
-            if hasattr(value, "rotation"):
-                sprite_info["rot"] = round(value.rotation, 2)
 
-            game_state[key] = sprite_info
+def configure_snapshots(interval_frames=None, max_seconds=None, sprite_limit=None, enabled=None):
+    """Change snapshot cadence. `max_seconds` and `sprite_limit` of 0 mean unlimited.
 
-    entry = {
-        "timestamp": now.strftime("%H:%M:%S.%f")[:-3],
-        "elapsed_s": math.floor((now - _start_time).total_seconds()),
-        "frame": _frame_count,
-        "screen_size": screen_size,
-        **game_state,
-    }
+    With `enabled=False`, `log_state` still counts frames (events carry the
+    frame number) but never builds a snapshot.
+    """
+    global _snapshot_interval, _snapshot_max_frames, _sprite_limit, _snapshots_enabled
+    if interval_frames is not None:
+        _snapshot_interval = interval_frames
+    if max_seconds is not None:
+        _snapshot_max_frames = round(max_seconds / SIMULATION_DT) if max_seconds else None
+    if sprite_limit is not None:
+        _sprite_limit = sprite_limit or None
+    if enabled is not None:
+        _snapshots_enabled = enabled
 
-    # New log file on each run
-    mode = "w" if not _state_log_initialized else "a"
-    with open("game_state.jsonl", mode) as f:
-        f.write(json.dumps(entry) + "\n")
 
-    _state_log_initialized = True
+def snapshot_group(group):
+    """Snapshot of a sprite group: its size and up to the sprite limit of its sprites."""
+    sprites = group.sprites()
+    if _sprite_limit is not None:
+        sprites = sprites[:_sprite_limit]
+    return {"count": len(group), "sprites": [sprite.snapshot() for sprite in sprites]}
 
 
-def log_event(event_type, **details):
-    global _event_log_initialized
+def log_state(snapshot=None):
+    """Count a frame and, every `_snapshot_interval` frames, log all registered providers.
 
-    now = datetime.now()
+    `snapshot`, if given, is called on those frames and its dict merged in,
+    so an owner such as a Simulation can log its own state without
+    registering it globally.
+    """
+    global _frame_count
 
-    event = {
-        "timestamp": now.strftime("%H:%M:%S.%f")[:-3],
-        "elapsed_s": math.floor((now - _start_time).total_seconds()),
-        "frame": _frame_count,
-        "type": event_type,
-        **details,
-    }
+    if _snapshot_max_frames is not None and _frame_count > _snapshot_max_frames:
+        return
+
+    _frame_count += 1
+    if _frame_count % _snapshot_interval != 0 or not _snapshots_enabled:
+        return
+
+    state = {name: provider() for name, provider in _snapshot_providers.items()}
+    if snapshot is not None:
+        state.update(snapshot())
+    _state_log.append(state)
+
+
+def log_event(event_type, **details):
+    _event_log.append((event_type, details))
 
-    mode = "w" if not _event_log_initialized else "a"
-    with open("game_events.jsonl", mode) as f:
-        f.write(json.dumps(event) + "\n")
 
-    _event_log_initialized = True
+def log_events(events):
+    """Log a batch of `(event_type, details)` pairs with one queue operation."""
+    _event_log.extend(events)
 
 
 def log_score_added(score, multiplier):
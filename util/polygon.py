@@ -0,0 +1,145 @@
+"""Polygon outlines and exact polygon collision tests.
+
+Outlines are tuples of `(x, y)` vertices relative to the shape's centre.
+Tests take both shapes in one coordinate frame, normally the frame of the
+rock being tested, so an outline never has to be moved into world space.
+The tests work for the star-shaped (concave) rock outlines as well as the
+ship triangle, and are meant to run only after a bounding-circle check has
+passed.
+"""
+import math
+import random
+from functools import lru_cache
+from util.constants import ASTEROID_LUMPINESS, ASTEROID_OUTLINE_VARIANTS, ASTEROID_VERTICES
+
+__all__ = [
+    "lumpy_outline",
+    "outline_variants",
+    "translate",
+    "point_in_polygon",
+    "circle_overlaps_polygon",
+    "capsule_overlaps_polygon",
+    "polygons_overlap",
+]
+
+
+def lumpy_outline(radius, rng, vertex_count=ASTEROID_VERTICES, lumpiness=ASTEROID_LUMPINESS):
+    """Return a star-shaped outline whose vertices lie within `radius` of the centre.
+
+    Every vertex is at least `radius * (1 - lumpiness)` out, so `radius`
+    stays a valid bounding circle.
+    """
+    step = 2 * math.pi / vertex_count
+    outline = []
+    for index in range(vertex_count):
+        angle = (index + rng.uniform(-0.3, 0.3)) * step
+        distance = radius * rng.uniform(1 - lumpiness, 1.0)
+        outline.append((math.cos(angle) * distance, math.sin(angle) * distance))
+    return tuple(outline)
+
+
+@lru_cache(maxsize=None)
+def outline_variants(radius):
+    """The fixed set of outlines rocks of `radius` pick from.
+
+    A dedicated seeded generator keeps the shapes identical across runs
+    without consuming the game's random stream.
+    """
+    rng = random.Random(round(radius * 1000))
+    return tuple(lumpy_outline(radius, rng) for _ in range(ASTEROID_OUTLINE_VARIANTS))
+
+
+def translate(vertices, dx, dy):
+    return [(x + dx, y + dy) for x, y in vertices]
+
+
+def point_in_polygon(x, y, vertices):
+    """Even-odd rule, so concave outlines are handled."""
+    inside = False
+    previous_x, previous_y = vertices[-1]
+    for vertex_x, vertex_y in vertices:
+        if (vertex_y > y) != (previous_y > y):
+            crossing = (previous_x - vertex_x) * (y - vertex_y) / (previous_y - vertex_y) + vertex_x
+            if x < crossing:
+                inside = not inside
+        previous_x, previous_y = vertex_x, vertex_y
+    return inside
+
+
+def _segment_distance_sq(px, py, ax, ay, bx, by):
+    edge_x = bx - ax
+    edge_y = by - ay
+    length = edge_x * edge_x + edge_y * edge_y
+    t = 0.0
+    if length > 0:
+        t = ((px - ax) * edge_x + (py - ay) * edge_y) / length
+        t = 0.0 if t < 0 else 1.0 if t > 1 else t
+    dx = ax + edge_x * t - px
+    dy = ay + edge_y * t - py
+    return dx * dx + dy * dy
+
+
+def _cross(ox, oy, ax, ay, bx, by):
+    return (ax - ox) * (by - oy) - (ay - oy) * (bx - ox)
+
+
+def _segments_intersect(ax, ay, bx, by, cx, cy, dx, dy):
+    d1 = _cross(cx, cy, dx, dy, ax, ay)
+    d2 = _cross(cx, cy, dx, dy, bx, by)
+    d3 = _cross(ax, ay, bx, by, cx, cy)
+    d4 = _cross(ax, ay, bx, by, dx, dy)
+    return ((d1 > 0) != (d2 > 0)) and ((d3 > 0) != (d4 > 0))
+
+
+def _segments_distance_sq(ax, ay, bx, by, cx, cy, dx, dy):
+    if _segments_intersect(ax, ay, bx, by, cx, cy, dx, dy):
+        return 0.0
+    return min(
+        _segment_distance_sq(ax, ay, cx, cy, dx, dy),
+        _segment_distance_sq(bx, by, cx, cy, dx, dy),
+        _segment_distance_sq(cx, cy, ax, ay, bx, by),
+        _segment_distance_sq(dx, dy, ax, ay, bx, by),
+    )
+
+
+def circle_overlaps_polygon(x, y, radius, vertices):
+    if point_in_polygon(x, y, vertices):
+        return True
+    radius_sq = radius * radius
+    previous_x, previous_y = vertices[-1]
+    for vertex_x, vertex_y in vertices:
+        if _segment_distance_sq(x, y, previous_x, previous_y, vertex_x, vertex_y) < radius_sq:
+            return True
+        previous_x, previous_y = vertex_x, vertex_y
+    return False
+
+
+def capsule_overlaps_polygon(start_x, start_y, end_x, end_y, radius, vertices):
+    """True if a circle of `radius` moving from start to end touches the polygon on the way."""
+    if point_in_polygon(start_x, start_y, vertices):
+        return True
+    radius_sq = radius * radius
+    previous_x, previous_y = vertices[-1]
+    for vertex_x, vertex_y in vertices:
+        distance_sq = _segments_distance_sq(
+            start_x, start_y, end_x, end_y, previous_x, previous_y, vertex_x, vertex_y
+        )
+        if distance_sq < radius_sq:
+            return True
+        previous_x, previous_y = vertex_x, vertex_y
+    return False
+
+
+def polygons_overlap(first, second):
+    """True if the polygons' edges cross or one lies inside the other."""
+    previous_x, previous_y = first[-1]
+    for vertex_x, vertex_y in first:
+        other_x, other_y = second[-1]
+        for next_x, next_y in second:
+            if _segments_intersect(
+                previous_x, previous_y, vertex_x, vertex_y, other_x, other_y, next_x, next_y
+            ):
+                return True
+            other_x, other_y = next_x, next_y
+        previous_x, previous_y = vertex_x, vertex_y
+    return point_in_polygon(*first[0], second) or point_in_polygon(*second[0], first)
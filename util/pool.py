@@ -0,0 +1,66 @@
+__all__ = ["ShapePool"]
+
+
+class ShapePool:
+    """Builds and recycles instances of one `CircleShape` subclass.
+
+    Every new instance is constructed with `containers` and the extra
+    keyword `options` (such as an entity `store` or `particles`), so each
+    Simulation owns its pools and nothing is shared through class
+    attributes. Standalone code can still install a pool on the class
+    (`Asteroid.pool = ShapePool(Asteroid, cap)`) and use `Asteroid.create`.
+
+    Killed instances are held back until `reclaim()` runs at the end of the
+    frame, so code still holding a sprite it just killed keeps seeing that
+    sprite's state. Instances built directly with the constructor are never
+    taken in. A `cap` of 0 builds without recycling.
+    """
+
+    def __init__(self, shape_type, cap, containers=None, **options):
+        self.shape_type = shape_type
+        self.cap = cap
+        self._options = dict(options, containers=containers)
+        self._free = []
+        self._released = []
+        self.hits = 0
+        self.misses = 0
+        self.discarded = 0
+        self.live = 0
+        self.high_water = 0
+
+    def acquire(self, x, y, radius):
+        if self._free:
+            shape = self._free.pop()
+            shape.reset(x, y, radius)
+            self.hits += 1
+        else:
+            shape = self.shape_type(x, y, radius, **self._options)
+            shape._pool = self
+            self.misses += 1
+        self.live += 1
+        if self.live > self.high_water:
+            self.high_water = self.live
+        return shape
+
+    def release(self, shape):
+        # called by CircleShape.kill for instances this pool handed out
+        self.live -= 1
+        self._released.append(shape)
+
+    def reclaim(self):
+        """Return instances killed since the last call to the free list, up to `cap`."""
+        room = self.cap - len(self._free)
+        if room > 0:
+            self._free.extend(self._released[:room])
+        self.discarded += max(0, len(self._released) - max(room, 0))
+        self._released.clear()
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "discarded": self.discarded,
+            "live": self.live,
+            "free": len(self._free),
+            "high_water": self.high_water,
+        }
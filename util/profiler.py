@@ -0,0 +1,126 @@
+import json
+import time
+from collections import deque
+from util.constants import PROFILER_WINDOW_FRAMES
+
+__all__ = ["FrameProfiler", "NullProfiler", "NULL_PROFILER"]
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+
+    def at(fraction):
+        return ordered[min(last, int(fraction * len(ordered)))]
+
+    return {
+        "mean": sum(ordered) / len(ordered),
+        "p50": at(0.50),
+        "p95": at(0.95),
+        "p99": at(0.99),
+        "max": ordered[-1],
+    }
+
+
+class FrameProfiler:
+    """Per-phase frame timer with rolling percentiles.
+
+    Call `begin_frame()`, then `mark(phase)` at the end of each phase; the
+    time since the previous mark is charged to that phase, so phases that run
+    several times in a frame (e.g. multiple simulation steps) add up.
+    `end_frame(**counts)` closes the frame and records entity counts.
+    """
+
+    enabled = True
+
+    def __init__(self, window=PROFILER_WINDOW_FRAMES):
+        self.window = window
+        self.frames = 0
+        self._phase_order = []
+        self._samples = {}
+        self._totals = {}
+        self._frame_samples = deque(maxlen=window)
+        self._counts = {}
+        self._peak_counts = {}
+        self._current = {}
+        self._frame_start = 0.0
+        self._last = 0.0
+
+    def begin_frame(self):
+        self._current.clear()
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        current = self._current
+        current[phase] = current.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def end_frame(self, **counts):
+        self.frames += 1
+        self._frame_samples.append(time.perf_counter() - self._frame_start)
+        for phase, seconds in self._current.items():
+            samples = self._samples.get(phase)
+            if samples is None:
+                samples = self._samples[phase] = deque(maxlen=self.window)
+                self._totals[phase] = 0.0
+                self._phase_order.append(phase)
+            samples.append(seconds)
+            self._totals[phase] += seconds
+        for name, count in counts.items():
+            history = self._counts.get(name)
+            if history is None:
+                history = self._counts[name] = deque(maxlen=self.window)
+            history.append(count)
+            if count > self._peak_counts.get(name, -1):
+                self._peak_counts[name] = count
+
+    def stats(self):
+        """Rolling-window statistics in milliseconds, plus entity counts."""
+        def to_ms(values):
+            return {key: value * 1000 for key, value in _percentiles(values).items()}
+
+        return {
+            "frames": self.frames,
+            "window": len(self._frame_samples),
+            "frame_ms": to_ms(self._frame_samples) if self._frame_samples else {},
+            "phases_ms": {
+                phase: to_ms(self._samples[phase]) for phase in self._phase_order
+            },
+            "total_ms": {
+                phase: self._totals[phase] * 1000 for phase in self._phase_order
+            },
+            "counts": {
+                name: {"last": history[-1], "peak": self._peak_counts[name], **_percentiles(history)}
+                for name, history in self._counts.items()
+            },
+        }
+
+    def dump(self, path):
+        with open(path, "w") as f:
+            json.dump(self.stats(), f, indent=2)
+
+
+class NullProfiler:
+    """Stand-in used when instrumentation is off; every call is a no-op."""
+
+    enabled = False
+    frames = 0
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase):
+        pass
+
+    def end_frame(self, **counts):
+        pass
+
+    def stats(self):
+        return {}
+
+    def dump(self, path):
+        pass
+
+
+NULL_PROFILER = NullProfiler()
@@ -0,0 +1,262 @@
+"""Record a session's input and timing, and replay it headless.
+
+A replay file is an 8-byte magic, a little-endian uint32 header length, a
+JSON header, then one 9-byte record per simulation step: the step's dt as a
+float64 and a bitmask of the keys held. The header holds the RNG seed, the
+key order and the settings the simulation was built with: the resolved
+config, the spawn profile and whether the screen wrapped and particles ran.
+Given the same settings, seed, dts and keys the simulation reproduces the
+session exactly, so a replay doubles as a performance regression run.
+"""
+import argparse
+import dataclasses
+import json
+import random
+import struct
+import time
+import pygame
+from util.config import DEFAULT_CONFIG
+from util.spawn_profile import SpawnProfile
+
+__all__ = [
+    "KeyState",
+    "encode_keys",
+    "ReplayWriter",
+    "ReplayReader",
+    "Recorder",
+    "new_seed",
+    "simulation_settings",
+    "replay",
+    "frame_time_summary",
+]
+
+MAGIC = b"SRREPLAY"
+VERSION = 2
+# version 1 files have no settings and replay with the defaults
+_READABLE_VERSIONS = (1, VERSION)
+_RECORD = struct.Struct("<dB")
+
+# the keys Player.update reads, in bit order
+RECORDED_KEYS = (
+    ("a", pygame.K_a),
+    ("d", pygame.K_d),
+    ("w", pygame.K_w),
+    ("s", pygame.K_s),
+    ("space", pygame.K_SPACE),
+)
+_KEY_BITS = {key: 1 << bit for bit, (_, key) in enumerate(RECORDED_KEYS)}
+
+
+def encode_keys(keys):
+    """Pack the recorded keys of a `pygame.key.get_pressed()` result into a bitmask."""
+    bits = 0
+    for key, bit in _KEY_BITS.items():
+        if keys[key]:
+            bits |= bit
+    return bits
+
+
+class KeyState:
+    """Read-only stand-in for `pygame.key.get_pressed()` built from a bitmask."""
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    def __getitem__(self, key):
+        return bool(self.bits & _KEY_BITS.get(key, 0))
+
+
+def new_seed():
+    return random.SystemRandom().randrange(2**32)
+
+
+def simulation_settings(simulation):
+    """The JSON-ready settings a replay needs to rebuild `simulation`."""
+    return {
+        "config": dataclasses.asdict(simulation.config),
+        "spawn_profile": simulation.asteroid_field.profile.to_dict(),
+        "wrap": simulation.torus is not None,
+        "particles": simulation.particles is not None,
+    }
+
+
+class ReplayWriter:
+    def __init__(self, path, seed, settings=None):
+        self.path = path
+        self.seed = seed
+        self.frames = 0
+        self._file = open(path, "wb")
+        header = {"version": VERSION, "seed": seed, "keys": [name for name, _ in RECORDED_KEYS]}
+        if settings is not None:
+            header["settings"] = settings
+        header = json.dumps(header).encode()
+        self._file.write(MAGIC + struct.pack("<I", len(header)) + header)
+
+    def record(self, dt, bits):
+        self._file.write(_RECORD.pack(dt, bits))
+        self.frames += 1
+
+    def close(self):
+        self._file.close()
+
+
+class ReplayReader:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a SpaceRocks replay")
+            (length,) = struct.unpack("<I", f.read(4))
+            self.header = json.loads(f.read(length))
+            self._data = f.read()
+        if self.header["version"] not in _READABLE_VERSIONS:
+            raise ValueError(f"unsupported replay version {self.header['version']}")
+        self.seed = self.header["seed"]
+
+    def simulation_kwargs(self):
+        """Keyword arguments for `Simulation` matching the recorded session."""
+        settings = self.header.get("settings")
+        if settings is None:
+            return {}
+        return {
+            "config": DEFAULT_CONFIG.with_overrides(settings["config"]),
+            "spawn_profile": SpawnProfile.from_dict(settings["spawn_profile"]),
+            "wrap": settings["wrap"],
+            "particles": settings["particles"],
+        }
+
+    def __len__(self):
+        return len(self._data) // _RECORD.size
+
+    def __iter__(self):
+        """Yield `(dt, key_bits)` for every recorded step."""
+        return _RECORD.iter_unpack(self._data)
+
+
+class Recorder:
+    """Captures the player's key state and dt for every step of a Simulation.
+
+    Seed the global RNG with `seed` before creating the simulation, then
+    `attach` the recorder to it; the file is written from then on.
+    """
+
+    def __init__(self, path, seed):
+        self.path = path
+        self.seed = seed
+        self.writer = None
+        self._bits = 0
+
+    def attach(self, simulation):
+        self.writer = ReplayWriter(self.path, self.seed, simulation_settings(simulation))
+        player = simulation.player
+        read_keys = player.read_keys
+
+        def recording_read_keys():
+            keys = read_keys()
+            self._bits = encode_keys(keys)
+            return keys
+
+        player.set_input(recording_read_keys)
+        simulation.add_observer(self._on_step)
+
+    def _on_step(self, simulation, dt):
+        self.writer.record(dt, self._bits)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def frame_time_summary(frame_times):
+    """Return mean and percentile step times in milliseconds."""
+    if not frame_times:
+        return {"frames": 0}
+    ordered = sorted(frame_times)
+
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+
+    return {
+        "frames": len(ordered),
+        "mean_ms": sum(ordered) / len(ordered) * 1000,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "max_ms": ordered[-1] * 1000,
+    }
+
+
+def replay(path, simulation_factory=None):
+    """Re-simulate a recording headless as fast as possible.
+
+    The simulation is built by `simulation_factory(**settings)` with the
+    recorded config, spawn profile, wrap and particles settings. Returns
+    `(simulation, frame_times)` where `frame_times` holds the wall time of
+    every step in seconds.
+    """
+    from classes.simulation import Simulation, init_headless
+    from util.input_provider import ReplayInput
+
+    reader = ReplayReader(path)
+    init_headless()
+    random.seed(reader.seed)
+    simulation = (simulation_factory or Simulation)(**reader.simulation_kwargs())
+    records = list(reader)
+    # the player reads its keys once per step, so the two streams stay in step
+    simulation.player.set_input(ReplayInput(bits for _, bits in records))
+    step = simulation.step
+    perf_counter = time.perf_counter
+    frame_times = []
+    for dt, _ in records:
+        start = perf_counter()
+        step(dt)
+        frame_times.append(perf_counter() - start)
+        if simulation.game_over:
+            break
+    return simulation, frame_times
+
+
+def _compare(baseline_path, candidate_path):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(candidate_path) as f:
+        candidate = json.load(f)
+    print(f"{'metric':>8} {'baseline':>10} {'candidate':>10} {'change':>8}")
+    for metric in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms"):
+        before = baseline["frame_times"][metric]
+        after = candidate["frame_times"][metric]
+        change = (after - before) / before * 100 if before else 0.0
+        print(f"{metric:>8} {before:10.4f} {after:10.4f} {change:7.1f}%")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay recorded SpaceRocks sessions")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    play = subcommands.add_parser("play", help="re-simulate a recording headless")
+    play.add_argument("replay")
+    play.add_argument("--profile", help="write the frame-time summary to this JSON file")
+    compare = subcommands.add_parser("compare", help="compare two --profile outputs")
+    compare.add_argument("baseline")
+    compare.add_argument("candidate")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        _compare(args.baseline, args.candidate)
+        return
+    simulation, frame_times = replay(args.replay)
+    result = {
+        "frames": simulation.frame,
+        "score": simulation.score_manager.get_current_score(),
+        "lives": simulation.lives,
+        "game_over": simulation.game_over,
+        "frame_times": frame_time_summary(frame_times),
+    }
+    print(json.dumps(result, indent=2))
+    if args.profile:
+        with open(args.profile, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+from util.constants import ASTEROID_MAX_RADIUS
+
+__all__ = ["SpatialHash"]
+
+
+class SpatialHash:
+    """Uniform grid broad phase for circle sprites.
+
+    Sprites are bucketed by the cell containing their centre. Queries widen
+    their cell range by the largest radius inserted so far, so every sprite
+    appears at most once per query and no de-duplication is needed.
+
+    With a `util.torus.Torus`, a query near an edge also searches the wrapped
+    copies of its circle on the opposite side.
+    """
+
+    def __init__(self, cell_size=ASTEROID_MAX_RADIUS, torus=None):
+        self.cell_size = cell_size
+        self.torus = torus
+        self._cells = {}
+        self._max_radius = 0
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._cells.values())
+
+    def clear(self):
+        self._cells.clear()
+        self._max_radius = 0
+
+    def insert(self, sprite):
+        cell_size = self.cell_size
+        key = (
+            int(sprite.position.x // cell_size),
+            int(sprite.position.y // cell_size),
+        )
+        bucket = self._cells.get(key)
+        if bucket is None:
+            self._cells[key] = [sprite]
+        else:
+            bucket.append(sprite)
+        if sprite.radius > self._max_radius:
+            self._max_radius = sprite.radius
+
+    def rebuild(self, sprites):
+        self.clear()
+        for sprite in sprites:
+            self.insert(sprite)
+
+    def query(self, position, radius):
+        """Return sprites whose cells overlap the circle's bounding box."""
+        cells = self._cells
+        if not cells:
+            return []
+        reach = radius + self._max_radius
+        x = position.x
+        y = position.y
+        found = []
+        if self.torus is None:
+            self._collect(x, y, reach, found)
+        else:
+            for offset_x, offset_y in self.torus.images(x, y, reach):
+                self._collect(x + offset_x, y + offset_y, reach, found)
+        return found
+
+    def _collect(self, x, y, reach, found):
+        cells = self._cells
+        cell_size = self.cell_size
+        min_x = int((x - reach) // cell_size)
+        max_x = int((x + reach) // cell_size)
+        min_y = int((y - reach) // cell_size)
+        max_y = int((y + reach) // cell_size)
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    found.extend(bucket)
+
+    def candidate_pairs(self, sprites):
+        """Yield (sprite, other) for every hashed sprite near each of `sprites`."""
+        for sprite in sprites:
+            for other in self.query(sprite.position, sprite.radius):
+                yield sprite, other
@@ -0,0 +1,66 @@
+from util.constants import SCREEN_HEIGHT, SCREEN_WIDTH
+
+__all__ = ["Torus"]
+
+
+class Torus:
+    """A playfield whose edges wrap around.
+
+    Positions are kept in `[0, width) x [0, height)`. Distances use the
+    minimum image: each axis offset is folded into `[-size / 2, size / 2)`
+    once, so a collision test costs the same as on a flat screen instead of
+    checking nine shifted copies.
+    """
+
+    def __init__(self, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+        self.width = width
+        self.height = height
+        self.half_width = width / 2
+        self.half_height = height / 2
+
+    def wrap(self, sprite):
+        position = sprite.position
+        x = position.x
+        y = position.y
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return
+        position.update(x % self.width, y % self.height)
+        # stored shapes hand out copies, so write the vector back
+        sprite.position = position
+
+    def wrap_all(self, sprites):
+        wrap = self.wrap
+        for sprite in sprites:
+            wrap(sprite)
+
+    def delta(self, a, b):
+        """Shortest (dx, dy) from position `a` to position `b`."""
+        half_width = self.half_width
+        half_height = self.half_height
+        dx = (b.x - a.x + half_width) % self.width - half_width
+        dy = (b.y - a.y + half_height) % self.height - half_height
+        return dx, dy
+
+    def collides(self, shape, other):
+        """`CircleShape.collides_with` measured across the wrapped edges."""
+        dx, dy = self.delta(shape.position, other.position)
+        reach = shape.radius + other.radius
+        return dx * dx + dy * dy < reach * reach
+
+    def images(self, x, y, reach):
+        """Offsets of every copy of a circle of `reach` at (x, y) that touches the field.
+
+        The first offset is always (0, 0); the others exist only while the
+        circle overlaps an edge.
+        """
+        offsets_x = [0]
+        if x - reach < 0:
+            offsets_x.append(self.width)
+        if x + reach > self.width:
+            offsets_x.append(-self.width)
+        offsets_y = [0]
+        if y - reach < 0:
+            offsets_y.append(self.height)
+        if y + reach > self.height:
+            offsets_y.append(-self.height)
+        return [(ox, oy) for ox in offsets_x for oy in offsets_y]